@@ -0,0 +1,182 @@
+import hashlib
+import sqlite3
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import profiling
+
+# Query parameters that vary per click/feed but not per article
+TRACKING_PARAMS = {'oc', 'guccounter', 'guce_referrer', 'guce_referrer_sig', 'ncid', '.tsrc', 'fbclid', 'gclid'}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of an article URL: lower-case host, no fragment or tracking params"""
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if k.lower() not in TRACKING_PARAMS and not k.lower().startswith('utm_')]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ''))
+
+
+def article_key(article: Dict) -> str:
+    """Stable key for an article: hash of its normalized URL, or of its title if it has none"""
+    link = article.get('link')
+    if link:
+        basis = 'url:' + normalize_url(link)
+    else:
+        basis = 'title:' + ' '.join(article.get('title', '').lower().split())
+    return hashlib.sha1(basis.encode('utf-8')).hexdigest()
+
+
+def article_text(article: Dict) -> str:
+    """Text that sentiment is scored on"""
+    return article['title'] + ' ' + article.get('summary', '')
+
+
+class ArticleStore:
+    """Local store of scraped articles with their sentiment, scored once per article"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS articles (
+            key TEXT PRIMARY KEY,
+            url TEXT,
+            title TEXT NOT NULL,
+            summary TEXT,
+            source TEXT,
+            first_seen TEXT NOT NULL,
+            polarity REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS article_mentions (
+            key TEXT NOT NULL,
+            subject_type TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            seen_date TEXT NOT NULL,
+            PRIMARY KEY (key, subject_type, subject, seen_date)
+        );
+        CREATE INDEX IF NOT EXISTS idx_mentions_subject ON article_mentions(subject_type, subject, seen_date);
+    """
+
+    def __init__(self, db_path: str = 'articles.db'):
+        self.db_path = db_path
+        conn = self._connect()
+        with conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(self.SCHEMA)
+        conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _known_polarities(self, conn, keys: List[str]) -> Dict[str, float]:
+        known = {}
+        for i in range(0, len(keys), 500):  # Stay under SQLite's bound-parameter limit
+            chunk = keys[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            known.update(conn.execute(
+                f"SELECT key, polarity FROM articles WHERE key IN ({placeholders})", chunk).fetchall())
+        return known
+
+    def _score_new(self, conn, articles: List[Dict], keys: List[str],
+                   scorer: Callable[[List[str]], List[float]]) -> Dict[str, float]:
+        """Polarity by key for the given articles, scoring and inserting only those not stored yet"""
+        known = self._known_polarities(conn, list(dict.fromkeys(keys)))
+
+        new = {}
+        for key, article in zip(keys, articles):
+            if key not in known and key not in new:
+                new[key] = article
+        profiling.record_cache('articles', 'hit', len(known))
+        profiling.record_cache('articles', 'miss', len(new))
+        if new:
+            scores = scorer([article_text(a) for a in new.values()])
+            now = datetime.now().isoformat()
+            conn.executemany(
+                "INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(key, a.get('link'), a['title'], a.get('summary', ''), a.get('source'), now, score)
+                 for (key, a), score in zip(new.items(), scores)])
+            known.update(zip(new.keys(), scores))
+        return known
+
+    def add_articles(self, articles: List[Dict], subject_type: str, subject: str,
+                     scorer: Callable[[List[str]], List[float]]) -> List[Dict]:
+        """Insert new articles, score only those, record the mention, and annotate each with 'polarity'"""
+        if not articles:
+            return articles
+
+        keys = [article_key(a) for a in articles]
+        today = date.today().isoformat()
+        conn = self._connect()
+        with conn:
+            known = self._score_new(conn, articles, keys, scorer)
+            conn.executemany(
+                "INSERT OR IGNORE INTO article_mentions VALUES (?, ?, ?, ?)",
+                [(key, subject_type, subject, today) for key in set(keys)])
+        conn.close()
+
+        for key, article in zip(keys, articles):
+            article['polarity'] = known[key]
+        return articles
+
+    def polarity_for(self, article: Dict, scorer: Callable[[List[str]], List[float]]) -> float:
+        """Polarity of a single article, scoring and storing it if it is new (no mention is recorded)"""
+        key = article_key(article)
+        conn = self._connect()
+        with conn:
+            polarity = self._score_new(conn, [article], [key], scorer)[key]
+        conn.close()
+        return polarity
+
+    def sentiment_history(self, subject: str, subject_type: str = 'ticker',
+                          start: Optional[str] = None, end: Optional[str] = None) -> List[Dict]:
+        """Daily average polarity and article count for a ticker/industry/sector"""
+        conn = self._connect()
+        rows = conn.execute(
+            """SELECT m.seen_date, AVG(a.polarity), COUNT(*)
+               FROM article_mentions m JOIN articles a ON a.key = m.key
+               WHERE m.subject_type = ? AND m.subject = ?
+                 AND m.seen_date >= COALESCE(?, m.seen_date) AND m.seen_date <= COALESCE(?, m.seen_date)
+               GROUP BY m.seen_date ORDER BY m.seen_date""",
+            (subject_type, subject, start, end)).fetchall()
+        conn.close()
+        return [{'date': d, 'polarity': round(p, 4), 'articles': n} for d, p, n in rows]
+
+    def articles_for(self, subject: str, day: str, subject_type: str = 'ticker') -> List[Dict]:
+        """Articles mentioned for a subject on a given day"""
+        conn = self._connect()
+        rows = conn.execute(
+            """SELECT a.title, a.url, a.source, a.summary, a.first_seen, a.polarity
+               FROM article_mentions m JOIN articles a ON a.key = m.key
+               WHERE m.subject_type = ? AND m.subject = ? AND m.seen_date = ?""",
+            (subject_type, subject, day)).fetchall()
+        conn.close()
+        return [dict(zip(('title', 'link', 'source', 'summary', 'first_seen', 'polarity'), r)) for r in rows]
+
+
+def main():
+    """Print stored sentiment history without re-scraping"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Query historical article sentiment')
+    parser.add_argument('subject', help='Ticker, industry or sector name')
+    parser.add_argument('--type', default='ticker', choices=['ticker', 'industry', 'sector'],
+                        help='What the subject is (default: ticker)')
+    parser.add_argument('--start', help='First date (YYYY-MM-DD)')
+    parser.add_argument('--end', help='Last date (YYYY-MM-DD)')
+    parser.add_argument('--day', help='List the individual articles for this date instead')
+    args = parser.parse_args()
+
+    store = ArticleStore()
+    if args.day:
+        for article in store.articles_for(args.subject, args.day, args.type):
+            print(f"{article['polarity']:+.2f}  {article['title']} ({article['source']})")
+        return
+
+    history = store.sentiment_history(args.subject, args.type, args.start, args.end)
+    if not history:
+        print(f"❌ No stored articles for {args.subject}")
+    for row in history:
+        print(f"{row['date']}  {row['polarity']:+.3f}  ({row['articles']} articles)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Portfolio correlation from local prices: holdings vs peers vs sector ETFs, full-period and rolling,
+kept as running sums so each new bar is an O(N²) update instead of an O(N²·T) recomputation
+"""
+
+import argparse
+import copy
+import json
+import os
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+import indicators as ind
+from market_mapping import SECTOR_ETF_MAP
+from price_store import PriceStore
+from stock_info_store import make_cache_backend
+
+BENCHMARKS = ['SPY', 'QQQ']
+
+
+class CorrelationWindow:
+    """Pairwise-complete correlation sums over a set of bars; add and remove bars as matrix products
+
+    For each pair (i, j) it keeps, over bars where both returns exist: the count, sum of x_i,
+    sum of x_i squared and sum of x_i * x_j, so a symbol with missing days only loses those days.
+    """
+
+    def __init__(self, symbols: List[str]):
+        n = len(symbols)
+        self.symbols = list(symbols)
+        self.count = np.zeros((n, n))
+        self.sum_x = np.zeros((n, n))  # [i, j]: sum of x_i where x_j also exists
+        self.sum_xx = np.zeros((n, n))
+        self.sum_xy = np.zeros((n, n))
+        self.bars = 0
+
+    def _accumulate(self, rows: np.ndarray, sign: float):
+        rows = np.atleast_2d(np.asarray(rows, dtype=float))
+        if not len(rows):
+            return
+        valid = ~np.isnan(rows)
+        x = np.where(valid, rows, 0.0)
+        m = valid.astype(float)
+        self.count += sign * (m.T @ m)
+        self.sum_x += sign * (x.T @ m)
+        self.sum_xx += sign * ((x * x).T @ m)
+        self.sum_xy += sign * (x.T @ x)
+        self.bars += int(sign) * len(rows)
+
+    def add(self, rows: np.ndarray):
+        self._accumulate(rows, 1.0)
+
+    def remove(self, rows: np.ndarray):
+        self._accumulate(rows, -1.0)
+
+    def matrix(self, min_periods: int = 10) -> pd.DataFrame:
+        """Correlation matrix (NaN for pairs with fewer than min_periods common bars)"""
+        n = self.count
+        covariance = n * self.sum_xy - self.sum_x * self.sum_x.T
+        variance = n * self.sum_xx - self.sum_x ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = covariance / np.sqrt(variance * variance.T)
+        corr = np.where((n >= min_periods) & (variance > 0) & (variance.T > 0), np.clip(corr, -1, 1), np.nan)
+        return pd.DataFrame(corr, index=self.symbols, columns=self.symbols)
+
+    def save(self, path: Path, first_date: str, last_date: str, updates: int):
+        """Write the state atomically, so an interrupted save never leaves a truncated file behind"""
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, symbols=np.array(self.symbols), count=self.count, sum_x=self.sum_x, sum_xx=self.sum_xx,
+                     sum_xy=self.sum_xy, bars=self.bars, first_date=first_date, last_date=last_date, updates=updates)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path):
+        """(window, first_date, last_date, updates), or None if there is no usable state"""
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as state:
+                window = cls(list(state['symbols']))
+                for name in ('count', 'sum_x', 'sum_xx', 'sum_xy'):
+                    setattr(window, name, state[name])
+                window.bars = int(state['bars'])
+                return window, str(state['first_date']), str(state['last_date']), int(state['updates'])
+        except Exception as e:
+            # A truncated or corrupt file (BadZipFile, EOFError, missing keys) just means a rebuild
+            print(f"⚠️  Ignoring unreadable correlation state {path}: {e}")
+            return None
+
+
+def rolling_correlation(returns: pd.DataFrame, benchmark: pd.Series, window: int = 63,
+                        min_periods: int = 20) -> pd.DataFrame:
+    """Correlation of every column with one benchmark over each trailing window"""
+    valid = returns.notna() & benchmark.notna().to_numpy()[:, None]
+    m = valid.astype(float)
+    x = returns.where(valid, 0.0)
+    y = m.mul(benchmark.fillna(0.0), axis=0)
+    sums = {name: ind.rolling_sums(frame, [window])[window]
+            for name, frame in (('n', m), ('x', x), ('y', y), ('xx', x * x), ('yy', y * y), ('xy', x * y))}
+    n = sums['n']
+    covariance = n * sums['xy'] - sums['x'] * sums['y']
+    variance = (n * sums['xx'] - sums['x'] ** 2) * (n * sums['yy'] - sums['y'] ** 2)
+    corr = covariance / np.sqrt(variance.where(variance > 0))
+    return corr.where(n >= min_periods).clip(-1, 1)
+
+
+class CorrelationEngine:
+    """Full-period and rolling correlation matrices over local closes, persisted between runs"""
+
+    def __init__(self, price_store=None, state_dir: str = 'correlation_state', window: int = 63,
+                 years: int = 3, rebuild_after: int = 250):
+        self.price_store = price_store or PriceStore()
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(exist_ok=True)
+        self.window = window  # Sessions in the rolling matrix (63 ~ one quarter)
+        self.history_days = int(years * 365)
+        self.rebuild_after = rebuild_after  # Incremental updates before a from-scratch rebuild resets rounding drift
+        self.slack_days = 31  # Extra history loaded so bars leaving the full period can be subtracted
+
+    def returns(self, symbols: Iterable[str], extra_days: int = 0) -> pd.DataFrame:
+        """Daily log returns (sessions x symbols) from the price store"""
+        closes = self.price_store.load_panel(symbols, self.history_days + extra_days)['close']
+        closes = closes.dropna(how='all')
+        return np.log(closes).diff().iloc[1:]
+
+    def _state_path(self, name: str) -> Path:
+        return self.state_dir / f"{name}.npz"
+
+    def _settled(self, name: str, returns: pd.DataFrame, window: Optional[int]) -> CorrelationWindow:
+        """Sums over every session but the latest (whose bars may still be filling in), advanced from saved state
+
+        The rolling matrix covers the last `window` sessions, the full one the sessions since
+        history_days ago; bars that have left either are subtracted.
+        """
+        values = returns.to_numpy()
+        dates = returns.index.strftime('%Y-%m-%d')
+        end = len(values) - 1
+        if window:
+            target_start = max(0, end - window)
+        else:
+            required_start = (date.today() - timedelta(days=self.history_days)).isoformat()
+            target_start = min(end, int(np.searchsorted(dates, required_start, side='left')))
+
+        loaded = CorrelationWindow.load(self._state_path(name))
+        acc = None
+        if loaded is not None:
+            acc, first_date, last_date, updates = loaded
+            hi = int(np.searchsorted(dates, last_date, side='right'))
+            lo = hi - acc.bars
+            # Sums can only be advanced while the bars that leave the period are still loaded
+            usable = (acc.symbols == list(returns.columns) and 0 < hi <= end and dates[hi - 1] == last_date and
+                      updates < self.rebuild_after and 0 <= lo <= target_start and dates[lo] == first_date)
+            if usable:
+                acc.add(values[hi:end])
+                acc.remove(values[lo:target_start])
+                first_date = dates[target_start]
+                updates += end - hi
+            else:
+                acc = None
+
+        if acc is None:
+            acc = CorrelationWindow(list(returns.columns))
+            acc.add(values[target_start:end])
+            first_date, updates = dates[target_start], 0
+        if end > 0:
+            acc.save(self._state_path(name), first_date, dates[end - 1], updates)
+        return acc
+
+    def matrices(self, symbols: Iterable[str], min_periods: int = 20) -> Dict[str, pd.DataFrame]:
+        """{'full': ..., 'rolling': ...} correlation matrices including the latest session"""
+        symbols = list(dict.fromkeys(symbols))
+        returns = self.returns(symbols, extra_days=self.slack_days)
+        if len(returns) < 2:
+            return {}
+        values = returns.to_numpy()
+        result = {}
+        for name, window in (('full', None), (f'rolling_{self.window}', self.window)):
+            live = copy.deepcopy(self._settled(name, returns, window))
+            live.add(values[-1:])
+            if window and live.bars > window:
+                live.remove(values[-window - 1:-window])
+            result['full' if window is None else 'rolling'] = live.matrix(min_periods)
+        return result
+
+
+def correlation_groups(config_file: str = 'config.json', info_cache: str = 'stock_info_cache.db') -> Dict[str, List]:
+    """Holdings from config.json, their cached peers, and the sector ETFs plus broad benchmarks"""
+    with open(config_file, 'r') as f:
+        holdings = list(dict.fromkeys(json.load(f)['portfolio']['stocks']))
+    info = make_cache_backend(info_cache).load_all()
+    peers = [p for t in holdings for p in info.get(t, {}).get('peers', []) if p not in holdings]
+    etfs = BENCHMARKS + sorted(set(SECTOR_ETF_MAP.values()) - set(BENCHMARKS))
+    return {'holdings': holdings, 'peers': list(dict.fromkeys(peers)), 'etfs': etfs,
+            'sector_etf': {t: info.get(t, {}).get('sector_etf') for t in holdings}}
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Correlation of portfolio holdings with peers and sector ETFs')
+    parser.add_argument('--config', default='config.json', help='Portfolio config (default: config.json)')
+    parser.add_argument('--years', type=float, default=3, help='Years of history (default: 3)')
+    parser.add_argument('--window', type=int, default=63, help='Sessions in the rolling window (default: 63)')
+    parser.add_argument('--output-dir', default='correlation_reports', help='Where CSVs are written')
+    args = parser.parse_args()
+
+    groups = correlation_groups(args.config)
+    holdings = groups['holdings']
+    if not holdings:
+        print("❌ No stocks found in portfolio")
+        return
+    symbols = holdings + groups['peers'] + groups['etfs']
+    print(f"🔗 Correlating {len(holdings)} holdings with {len(groups['peers'])} peers and "
+          f"{len(groups['etfs'])} ETFs...")
+
+    engine = CorrelationEngine(window=args.window, years=args.years)
+    matrices = engine.matrices(symbols)
+    if not matrices:
+        print("❌ Not enough price history")
+        return
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(exist_ok=True)
+    for name, matrix in matrices.items():
+        matrix.loc[holdings].round(4).to_csv(output_dir / f"correlation_{name}.csv", index_label='ticker')
+    returns = engine.returns(symbols)
+    rolling_spy = rolling_correlation(returns[holdings], returns['SPY'], args.window)
+    rolling_spy.round(4).to_csv(output_dir / 'rolling_vs_spy.csv', index_label='date')
+
+    full, rolling = matrices['full'], matrices['rolling']
+    print(f"\n{'Ticker':<8}{'SPY':>7}{'SPY ' + str(args.window) + 'd':>9}{'Sector':>8}{'Holdings':>10}  Closest holding")
+    print("-" * 60)
+    for ticker in holdings:
+        if ticker not in full.index or full.loc[ticker].isna().all():
+            print(f"{ticker:<8}{'no data':>7}")
+            continue
+        etf = groups['sector_etf'].get(ticker)
+        others = full.loc[ticker, [h for h in holdings if h != ticker]].dropna()
+        closest = f"{others.idxmax()} ({others.max():+.2f})" if not others.empty else '-'
+        sector = full.loc[ticker, etf] if etf in full.columns else np.nan
+        print(f"{ticker:<8}{full.loc[ticker, 'SPY']:>+7.2f}{rolling.loc[ticker, 'SPY']:>+9.2f}{sector:>+8.2f}"
+              f"{others.mean() if not others.empty else np.nan:>+10.2f}  {closest}")
+    print(f"\n✅ Saved matrices and rolling SPY correlation to {output_dir}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Fast-path parsing for scraped news pages and feeds, with the BeautifulSoup parsers kept as fallback
+"""
+
+import html
+import re
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Yahoo's headline class; pages without it have nothing for us, so they are never tree-parsed
+YAHOO_HEADLINE_CLASS = 'Mb(5px)'
+
+# Elements that never have an end tag, so they don't open a nesting level
+VOID_TAGS = frozenset(('area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+                       'meta', 'param', 'source', 'track', 'wbr'))
+
+TAG_RE = re.compile(r'<[^>]*>')
+
+
+def _decode(content) -> str:
+    return content.decode('utf-8', errors='replace') if isinstance(content, bytes) else content
+
+
+class _YahooHeadlineParser(HTMLParser):
+    """Streams through a page collecting headline <h3>s, their first link, and the next sibling <div>
+
+    Open elements are tracked by name and closed the way BeautifulSoup's html.parser tree does it:
+    an end tag closes everything opened after its matching start tag, and one with no open match
+    (a stray </div>) is ignored. Void elements never open a level.
+    """
+
+    def __init__(self, limit: int):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.matched = 0  # Headline <h3>s seen, with or without a link
+        self.items = []
+        self.stack = []  # Names of the open elements; the depth of an element is its stack height
+        self.h3_depth = None  # Depth of the headline being read
+        self.link_depth = None  # Depth of its first <a>
+        self.current = None
+        self.awaiting = {}  # depth -> headlines still looking for a following sibling <div>
+        self.collecting = []  # (depth, headline) for sibling <div>s whose text is being read
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        self.stack.append(tag)
+        depth = len(self.stack)
+        if tag == 'div' and depth in self.awaiting:
+            for item in self.awaiting.pop(depth):
+                item['timestamp'] = ''
+                self.collecting.append((depth, item))
+        if self.h3_depth is None:
+            if tag == 'h3' and self.matched < self.limit \
+                    and YAHOO_HEADLINE_CLASS in (dict(attrs).get('class') or '').split():
+                self.matched += 1
+                self.h3_depth = depth
+                self.current = {'title': None, 'link': None, 'timestamp': 'Recent'}
+        elif tag == 'a' and self.current['title'] is None:
+            self.link_depth = depth
+            self.current['title'] = ''
+            self.current['link'] = dict(attrs).get('href') or ''
+
+    def handle_endtag(self, tag):
+        if tag not in self.stack:
+            return
+        opened = len(self.stack) - self.stack[::-1].index(tag)
+        while len(self.stack) >= opened:
+            self._close_innermost()
+
+    def _close_innermost(self):
+        depth = len(self.stack)
+        if depth == self.link_depth:
+            self.link_depth = None
+        if depth == self.h3_depth:
+            self.h3_depth = None
+            if self.current['title'] is not None:
+                self.items.append(self.current)
+                self.awaiting.setdefault(depth, []).append(self.current)
+        if self.collecting and self.collecting[-1][0] == depth:
+            self.collecting = [(d, item) for d, item in self.collecting if d != depth]
+        # Once the parent closes, headlines at this level have no later siblings
+        self.awaiting.pop(depth + 1, None)
+        self.stack.pop()
+
+    def close(self):
+        super().close()
+        # A truncated page ends with elements still open; close them as a tree builder would
+        while self.stack:
+            self._close_innermost()
+
+    def handle_data(self, data):
+        if self.link_depth is not None:
+            self.current['title'] += data
+        for _, item in self.collecting:
+            item['timestamp'] += data
+
+
+def parse_yahoo_headlines(content, limit: int = 10) -> List[Dict]:
+    """Headline title/link/timestamp dicts from a Yahoo quote page, without building a tree"""
+    text = _decode(content)
+    if YAHOO_HEADLINE_CLASS not in text:
+        return []
+    parser = _YahooHeadlineParser(limit)
+    parser.feed(text)
+    parser.close()
+    return [{'title': item['title'].strip(), 'link': item['link'], 'timestamp': item['timestamp']}
+            for item in parser.items]
+
+
+def parse_yahoo_headlines_soup(content, limit: int = 10) -> List[Dict]:
+    """Original BeautifulSoup implementation, used as the fallback and the reference"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    headlines = []
+    for item in soup.find_all('h3', class_=YAHOO_HEADLINE_CLASS)[:limit]:
+        link_tag = item.find('a')
+        if link_tag:
+            time_element = item.find_next_sibling('div')
+            headlines.append({
+                'title': link_tag.text.strip(),
+                'link': link_tag.get('href', ''),
+                'timestamp': time_element.text if time_element else 'Recent',
+            })
+    return headlines
+
+
+def strip_tags(fragment: str) -> str:
+    """Plain text of a small HTML fragment such as an RSS summary"""
+    if '<' not in fragment and '&' not in fragment:
+        return fragment
+    lowered = fragment.lower()
+    if '<script' in lowered or '<style' in lowered or '<!--' in lowered:
+        return strip_tags_soup(fragment)
+    return html.unescape(TAG_RE.sub('', fragment))
+
+
+def strip_tags_soup(fragment: str) -> str:
+    """Original BeautifulSoup tag stripping"""
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(fragment, 'html.parser').text
+
+
+def yahoo_headlines(content, limit: int = 10, fast: bool = True) -> List[Dict]:
+    """Parse Yahoo headlines with the fast path, falling back to BeautifulSoup on any parser error"""
+    if fast:
+        try:
+            return parse_yahoo_headlines(content, limit)
+        except Exception:
+            pass
+    return parse_yahoo_headlines_soup(content, limit)
+
+
+def summary_text(fragment: str, fast: bool = True) -> str:
+    """Tag-stripped RSS summary"""
+    return strip_tags(fragment) if fast else strip_tags_soup(fragment)
+
+
+def export_fixtures(directory: str = 'fixtures', db_path: str = 'http_cache.db') -> int:
+    """Save cached Yahoo pages and Google News feeds as benchmark fixtures"""
+    import hashlib
+    import sqlite3
+
+    Path(directory).mkdir(exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    count = 0
+    for url, body in conn.execute("SELECT url, body FROM responses"):
+        suffix = '.xml' if '/rss' in url else '.html'
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()[:12] + suffix
+        (Path(directory) / name).write_bytes(body)
+        count += 1
+    conn.close()
+    return count
+
+
+def _time(func, *args, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(directory: str = 'fixtures') -> Optional[bool]:
+    """Time fast vs. BeautifulSoup parsing on saved fixtures and check the outputs are identical"""
+    import feedparser
+
+    pages = sorted(Path(directory).glob('*.html'))
+    feeds = sorted(Path(directory).glob('*.xml'))
+    if not pages and not feeds:
+        print(f"❌ No .html/.xml fixtures in {directory} (create them with --export-fixtures)")
+        return None
+
+    identical = True
+    fast_total = soup_total = 0.0
+    for path in pages:
+        content = path.read_bytes()
+        fast, soup = parse_yahoo_headlines(content), parse_yahoo_headlines_soup(content)
+        if fast != soup:
+            identical = False
+            print(f"  ⚠️  {path.name}: headlines differ ({len(fast)} fast vs {len(soup)} soup)")
+        fast_total += _time(parse_yahoo_headlines, content)
+        soup_total += _time(parse_yahoo_headlines_soup, content)
+    if pages:
+        print(f"  Yahoo pages ({len(pages)}): fast {fast_total * 1000:.1f} ms, soup {soup_total * 1000:.1f} ms "
+              f"({soup_total / max(fast_total, 1e-9):.1f}x)")
+
+    summaries = []
+    for path in feeds:
+        summaries += [entry.get('summary', '') for entry in feedparser.parse(path.read_bytes()).entries]
+    if summaries:
+        for summary in summaries:
+            if strip_tags(summary) != strip_tags_soup(summary):
+                identical = False
+                print(f"  ⚠️  Summary differs: {summary[:80]!r}")
+        fast_time = _time(lambda: [strip_tags(s) for s in summaries])
+        soup_time = _time(lambda: [strip_tags_soup(s) for s in summaries])
+        print(f"  RSS summaries ({len(summaries)}): fast {fast_time * 1000:.1f} ms, soup {soup_time * 1000:.1f} ms "
+              f"({soup_time / max(fast_time, 1e-9):.1f}x)")
+
+    print("  ✅ Outputs identical" if identical else "  ❌ Outputs differ")
+    return identical
+
+
+def main():
+    """Command line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark fast-path news parsing against BeautifulSoup')
+    parser.add_argument('fixtures', nargs='?', default='fixtures',
+                        help='Fixture directory (default: fixtures; parse_fixtures holds hand-written malformed pages)')
+    parser.add_argument('--export-fixtures', action='store_true',
+                        help='First save the pages in http_cache.db into the fixture directory')
+    args = parser.parse_args()
+
+    if args.export_fixtures:
+        print(f"💾 Exported {export_fixtures(args.fixtures)} cached responses to {args.fixtures}/")
+    print(f"⏱️  Benchmarking parsers on {args.fixtures}/...")
+    benchmark(args.fixtures)
+
+
+if __name__ == "__main__":
+    main()
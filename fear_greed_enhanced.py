@@ -13,6 +13,7 @@ warnings.filterwarnings('ignore')
 from scipy.signal import find_peaks
 from collections import Counter
 
+import profiling
 from fear_greed_timeseries import FearGreedTimeSeries
 from market_mapping import SECTOR_ETF_MAP, INDUSTRY_PEERS
 
@@ -20,8 +21,8 @@ from market_mapping import SECTOR_ETF_MAP, INDUSTRY_PEERS
 class FearGreedEnhanced(FearGreedTimeSeries):
     """Enhanced visualization focusing on trends and inflection points"""
     
-    def __init__(self, period_days=180):
-        super().__init__(period_days)
+    def __init__(self, period_days=180, sentiment_weight=0.0):
+        super().__init__(period_days, sentiment_weight=sentiment_weight)
         self.smoothing_window = 10  # 10-day smoothing
         self.support_resistance_tolerance = 2  # ±2 points for level detection
         self.min_touches = 3  # Minimum touches for support/resistance
@@ -142,6 +143,7 @@ class FearGreedEnhanced(FearGreedTimeSeries):
         
         return zones
     
+    @profiling.timed('chart.render')
     def create_enhanced_chart(self, title, fear_greed_series, filename):
         """Create enhanced chart with trend focus"""
         # Create figure with dark background
@@ -335,12 +337,13 @@ class FearGreedEnhanced(FearGreedTimeSeries):
         print(f"  ✅ Saved: {filename}")
         return filename
     
+    @profiling.timed('chart.sector')
     def create_sector_chart(self, sector, etf):
         """Create enhanced sector chart"""
         print(f"📊 Generating enhanced chart for {sector} sector...")
         
         # Get historical data
-        fear_greed_series = self.get_historical_fear_greed(etf)
+        fear_greed_series = self.get_historical_fear_greed(etf, sentiment_subject=('sector', sector))
         
         # Create title
         title = f'{sector} Sector - Enhanced Fear & Greed Analysis ({self.period_days} Days)'
@@ -350,6 +353,7 @@ class FearGreedEnhanced(FearGreedTimeSeries):
         
         return self.create_enhanced_chart(title, fear_greed_series, filename)
     
+    @profiling.timed('chart.industry')
     def create_industry_chart(self, industry, stocks):
         """Create enhanced industry chart"""
         print(f"📊 Generating enhanced chart for {industry} industry...")
@@ -357,7 +361,7 @@ class FearGreedEnhanced(FearGreedTimeSeries):
         # Calculate average fear/greed across industry stocks
         all_series = []
         for stock in stocks[:3]:
-            series = self.get_historical_fear_greed(stock)
+            series = self.get_historical_fear_greed(stock, sentiment_subject=('industry', industry))
             all_series.append(series)
         
         # Average the scores
@@ -372,6 +376,18 @@ class FearGreedEnhanced(FearGreedTimeSeries):
         return self.create_enhanced_chart(title, fear_greed_series, filename)
 
 
+def chart_from_service(kind, name, args):
+    """Use a chart already rendered by a running market_service.py with the same settings"""
+    from service_client import service_request
+    
+    chart = service_request(f'/chart/{kind}/{name}', {'format': 'json'},
+                            require={'period_days': args.days, 'sentiment_weight': args.sentiment_weight})
+    if chart is None:
+        return False
+    print(f"📊 {name}: {chart['path']} (from market service)")
+    return True
+
+
 def main():
     """Main function"""
     parser = argparse.ArgumentParser(description='Enhanced Fear & Greed Analysis')
@@ -385,11 +401,15 @@ def main():
                        help='Specific sectors to analyze')
     parser.add_argument('--industries', nargs='+',
                        help='Specific industries to analyze')
+    parser.add_argument('--sentiment-weight', type=float, default=0.0,
+                       help='Weight of stored news sentiment in the score, 0-1 (default: 0, price only)')
+    profiling.add_arguments(parser)
     
     args = parser.parse_args()
+    profiling.start_from_args(args, 'fear_greed_enhanced')
     
     # Initialize analyzer
-    analyzer = FearGreedEnhanced(period_days=args.days)
+    analyzer = FearGreedEnhanced(period_days=args.days, sentiment_weight=args.sentiment_weight)
     
     if args.show_portfolio:
         # Just show portfolio composition
@@ -513,14 +533,16 @@ def main():
         # Analyze specific sectors
         for sector in args.sectors:
             if sector in analyzer.sector_etfs:
-                analyzer.create_sector_chart(sector, analyzer.sector_etfs[sector])
+                if not chart_from_service('sector', sector, args):
+                    analyzer.create_sector_chart(sector, analyzer.sector_etfs[sector])
     
     elif args.industries:
         # Analyze specific industries
         for industry in args.industries:
             for ind, stocks in analyzer.industry_stocks.items():
                 if industry.lower() in ind.lower():
-                    analyzer.create_industry_chart(ind, stocks)
+                    if not chart_from_service('industry', ind, args):
+                        analyzer.create_industry_chart(ind, stocks)
                     break
     
     else:
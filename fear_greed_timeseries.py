@@ -6,100 +6,155 @@ import argparse
 import json
 from pathlib import Path
 import warnings
+import indicators as ind
+import profiling
 from market_mapping import SECTOR_ETF_MAP, INDUSTRY_PEERS
 warnings.filterwarnings('ignore')
 
 class FearGreedTimeSeries:
-    def __init__(self, period_days=180):
+    def __init__(self, period_days=180, sentiment_weight=0.0, sentiment_window=5):
         self.period_days = period_days
         self.end_date = datetime.now()
         self.start_date = self.end_date - timedelta(days=period_days)
         self.sector_etfs = SECTOR_ETF_MAP
         self.industry_stocks = INDUSTRY_PEERS
         
+        # Optional news-sentiment component (0 disables it); the price components share the rest
+        self.sentiment_weight = sentiment_weight
+        self.sentiment_window = sentiment_window  # Trailing sessions of articles to average
+        self.lookback_days = 30  # Calendar days of sessions behind each date's score
+        self.min_sessions = 20  # Sessions the lookback must hold, otherwise the score is neutral
+        self.sentiment_panels = {}  # subject_type -> sessions x subjects polarity, built once per sweep
+        
+        # Each ticker's history is downloaded once and sliced per date, shared by every chart
+        self.histories = {}
+        self.session_scores = {}  # ticker -> price-only score after each session's close
+        
         # Create output directory
         self.output_dir = Path('fear_greed_charts')
         self.output_dir.mkdir(exist_ok=True)
     
-    def calculate_daily_fear_greed(self, ticker, date):
-        """Calculate fear/greed score for a specific date"""
-        try:
-            stock = yf.Ticker(ticker)
-            
-            # Get 30 days of data before the target date for calculations
-            hist_start = date - timedelta(days=30)
-            hist = stock.history(start=hist_start, end=date)
-            
-            if len(hist) < 20:
-                return 50  # Neutral if not enough data
-            
-            # Get the last 20 days for calculations
-            hist = hist.tail(20)
+    def calculate_daily_fear_greed(self, ticker, date, sentiment=None):
+        """Calculate fear/greed score for a specific date (sentiment: news polarity known on that date)"""
+        return self.fear_greed_scores(ticker, [date], None if sentiment is None else [sentiment]).iloc[0]
+    
+    @profiling.timed('fear_greed.session_scores')
+    def session_fear_greed(self, ticker):
+        """Price-only score computed from the 20 sessions ending at each session, for the whole history"""
+        if ticker not in self.session_scores:
+            hist = self.get_price_history(ticker)
+            if hist is None or hist.empty:
+                self.session_scores[ticker] = None
+                return None
+            close, volume = hist['Close'], hist['Volume']
             
-            # Price momentum (40% weight)
-            returns = hist['Close'].pct_change()
-            avg_return = returns.mean()
-            price_score = self._normalize_score(avg_return * 20, -1, 1) * 100
+            # Price momentum (40% weight): mean of the window's 19 daily returns
+            returns = close.pct_change()
+            avg_return = ind.rolling_means(returns, [19])[19]
+            price_score = ind.normalize(avg_return * 20, -1, 1) * 100
             
-            # RSI (30% weight)
-            rsi = self._calculate_rsi(hist['Close'])
+            # RSI (30% weight), simple 14-session averages; neutral while undefined
+            moves = ind.sma(close.diff().abs(), 14)
+            rsi = ind.rsi(close, 14, wilder=False).where(moves > 0, 50.0).fillna(50.0)
             
-            # Volume analysis (20% weight)
-            avg_volume = hist['Volume'].mean()
-            recent_volume = hist['Volume'].iloc[-5:].mean()
-            volume_ratio = recent_volume / avg_volume if avg_volume > 0 else 1
-            volume_score = self._normalize_score(volume_ratio - 1, -0.5, 0.5) * 100
+            # Volume analysis (20% weight): last 5 sessions vs the 20-session average
+            volume_means = ind.rolling_means(volume, [5, 20])
+            volume_ratio = (volume_means[5] / volume_means[20]).where(volume_means[20] > 0, 1.0)
+            volume_score = ind.normalize(volume_ratio - 1, -0.5, 0.5) * 100
             
             # Volatility (10% weight) - inverse
-            volatility = returns.std()
-            volatility_score = 100 - self._normalize_score(volatility, 0.01, 0.05) * 100
+            volatility = ind.rolling_stds(returns, [19])[19]
+            volatility_score = 100 - ind.normalize(volatility, 0.01, 0.05) * 100
             
-            # Weighted score
-            fear_greed = (
+            self.session_scores[ticker] = (
                 price_score * 0.40 +
                 rsi * 0.30 +
                 volume_score * 0.20 +
                 volatility_score * 0.10
             )
-            
-            return max(0, min(100, fear_greed))
-            
-        except Exception as e:
-            return 50  # Return neutral on error
+        return self.session_scores[ticker]
     
-    def _calculate_rsi(self, prices, period=14):
-        """Calculate RSI"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    def fear_greed_scores(self, ticker, dates, sentiment=None):
+        """Scores for many dates at once; each date uses the sessions of the lookback_days before it"""
+        dates = pd.DatetimeIndex(dates)
+        scores = pd.Series(50.0, index=dates)  # Neutral if not enough data
+        session_scores = self.session_fear_greed(ticker)
+        if session_scores is None:
+            return scores
         
-        if loss.iloc[-1] == 0:
-            return 100 if gain.iloc[-1] > 0 else 50
-            
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi.iloc[-1] if not pd.isna(rsi.iloc[-1]) else 50
+        # The last session before each date, and how many sessions its lookback holds
+        sessions = session_scores.index.values
+        last = np.searchsorted(sessions, dates.values, side='left') - 1
+        first = np.searchsorted(sessions, (dates - timedelta(days=self.lookback_days)).values, side='left')
+        enough = (last - first + 1 >= self.min_sessions) & (last >= 0)
+        values = session_scores.to_numpy()[np.where(enough, last, 0)]
+        scores[enough] = values[enough]
+        
+        # News sentiment (optional 5th component), skipped on days without articles
+        if self.sentiment_weight > 0 and sentiment is not None:
+            sentiment = pd.Series(np.asarray(sentiment, dtype=float), index=dates)
+            blend = enough & sentiment.notna().to_numpy()
+            sentiment_score = ind.normalize(sentiment, -0.5, 0.5) * 100
+            scores[blend] = (scores * (1 - self.sentiment_weight) + sentiment_score * self.sentiment_weight)[blend]
+        
+        return scores.fillna(50.0).clip(0, 100)
     
-    def _normalize_score(self, value, min_val, max_val):
-        """Normalize value to 0-1 scale"""
-        if value <= min_val:
-            return 0
-        elif value >= max_val:
-            return 1
+    def get_price_history(self, ticker):
+        """Daily history covering the whole period plus the lookback, fetched once per ticker"""
+        if ticker not in self.histories:
+            profiling.record_cache('price_history', 'miss')
+            try:
+                with profiling.span('yfinance.history', ticker=ticker):
+                    hist = yf.Ticker(ticker).history(start=self.start_date - timedelta(days=self.lookback_days),
+                                                     end=self.end_date)
+                profiling.record_request(profiling.YFINANCE_HOST, None)
+                if hist.index.tz is not None:
+                    hist.index = hist.index.tz_localize(None)
+            except Exception:
+                profiling.record_request(profiling.YFINANCE_HOST, None, failed=True)
+                hist = None
+            self.histories[ticker] = hist
         else:
-            return (value - min_val) / (max_val - min_val)
+            profiling.record_cache('price_history', 'hit')
+        return self.histories[ticker]
+    
+    def get_sentiment(self, subject, subject_type='ticker'):
+        """Daily news polarity for a ticker/industry/sector over the analysis period"""
+        dates = pd.date_range(start=self.start_date, end=self.end_date, freq='D')
+        if subject_type not in self.sentiment_panels:
+            from sentiment_series import SentimentSeries
+            
+            # One aggregation for every subject of this type, shared by all charts in the sweep
+            sessions = pd.bdate_range(self.start_date - timedelta(days=self.sentiment_window * 2), self.end_date)
+            try:
+                with profiling.span('sentiment.panel', subject_type=subject_type):
+                    self.sentiment_panels[subject_type] = SentimentSeries().panel(
+                        subject_type, sessions=sessions, window=self.sentiment_window)
+            except Exception as e:
+                print(f"⚠️  News sentiment unavailable: {e}")
+                self.sentiment_panels[subject_type] = pd.DataFrame(index=sessions)
+        
+        panel = self.sentiment_panels[subject_type]
+        if subject not in panel.columns:
+            return pd.Series(np.nan, index=dates)
+        # Each calendar day uses the latest session on or before it
+        return panel[subject].reindex(dates.normalize(), method='ffill').set_axis(dates)
     
-    def get_historical_fear_greed(self, ticker):
-        """Get historical fear/greed scores for a ticker"""
+    @profiling.timed('fear_greed.history')
+    def get_historical_fear_greed(self, ticker, sentiment_subject=None):
+        """Get historical fear/greed scores for a ticker
+        
+        sentiment_subject: (subject_type, subject) whose news feeds the sentiment component,
+        defaulting to the ticker's own news
+        """
         dates = pd.date_range(start=self.start_date, end=self.end_date, freq='D')
-        scores = []
         
-        # Calculate scores for each day
-        for date in dates:
-            score = self.calculate_daily_fear_greed(ticker, date)
-            scores.append(score)
+        sentiment = None
+        if self.sentiment_weight > 0:
+            subject_type, subject = sentiment_subject or ('ticker', ticker)
+            sentiment = self.get_sentiment(subject, subject_type)
         
-        return pd.Series(scores, index=dates)
+        return self.fear_greed_scores(ticker, dates, sentiment)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,174 @@
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+import profiling
+
+
+class CacheStats:
+    """Hit/miss and bandwidth counters for the response cache"""
+
+    def __init__(self):
+        self.hits = 0  # Served from disk within the TTL, no request made
+        self.revalidated = 0  # 304 Not Modified, body reused
+        self.misses = 0  # Full download
+        self.bytes_saved = 0
+        self.bytes_downloaded = 0
+        self.seconds_saved = 0.0  # Estimated from average full-download latency
+        self.download_seconds = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, kind: str, size: int, elapsed: float = 0.0):
+        profiling.record_cache('http', 'hit' if kind == 'hits' else kind)
+        with self.lock:
+            if kind == 'miss':
+                self.misses += 1
+                self.bytes_downloaded += size
+                self.download_seconds += elapsed
+            else:
+                setattr(self, kind, getattr(self, kind) + 1)
+                self.bytes_saved += size
+                if self.misses:
+                    self.seconds_saved += max(0.0, self.download_seconds / self.misses - elapsed)
+
+    def as_dict(self) -> Dict:
+        return {
+            'hits': self.hits,
+            'revalidated': self.revalidated,
+            'misses': self.misses,
+            'bytes_saved': self.bytes_saved,
+            'bytes_downloaded': self.bytes_downloaded,
+            'seconds_saved': round(self.seconds_saved, 2),
+        }
+
+    def summary(self) -> str:
+        total = self.hits + self.revalidated + self.misses
+        rate = (self.hits + self.revalidated) / total * 100 if total else 0
+        return (f"{self.hits} hits, {self.revalidated} revalidated, {self.misses} misses ({rate:.0f}% reused) | "
+                f"{self.bytes_saved / 1024:.0f} KB saved, {self.bytes_downloaded / 1024:.0f} KB downloaded, "
+                f"~{self.seconds_saved:.1f}s saved")
+
+
+class ResponseCache:
+    """On-disk HTTP response cache honouring ETag/Last-Modified with a freshness TTL"""
+
+    def __init__(self, db_path: str = 'http_cache.db', ttl_minutes: float = 15):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_minutes * 60
+        self.stats = CacheStats()
+
+        conn = self._connect()
+        with conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL
+                )""")
+        conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get(self, url: str) -> Optional[Dict]:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT body, etag, last_modified, fetched_at FROM responses WHERE url = ?", (url,)).fetchone()
+        conn.close()
+        if not row:
+            return None
+        return {'body': row[0], 'etag': row[1], 'last_modified': row[2], 'fetched_at': row[3]}
+
+    def get_many(self, urls: List[str]) -> Dict[str, Dict]:
+        """Cached entries for many URLs in one connection (URLs without an entry are left out)"""
+        entries = {}
+        conn = self._connect()
+        for i in range(0, len(urls), 500):  # Stay under SQLite's bound-parameter limit
+            chunk = urls[i:i + 500]
+            rows = conn.execute(
+                f"SELECT url, body, etag, last_modified, fetched_at FROM responses "
+                f"WHERE url IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+            for url, body, etag, last_modified, fetched_at in rows:
+                entries[url] = {'body': body, 'etag': etag, 'last_modified': last_modified, 'fetched_at': fetched_at}
+        conn.close()
+        return entries
+
+    def is_fresh(self, entry: Optional[Dict]) -> bool:
+        """True if a cached entry is young enough to reuse without asking the server"""
+        return bool(entry) and time.time() - entry['fetched_at'] < self.ttl_seconds
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict:
+        """If-None-Match / If-Modified-Since headers for revalidating a cached entry"""
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str]):
+        conn = self._connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                         (url, body, etag, last_modified, time.time()))
+        conn.close()
+
+    def store_many(self, responses: List[tuple], revalidated: List[str]):
+        """Write (url, body, etag, last_modified) responses and restart revalidated URLs' TTL in one transaction"""
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                             [(url, body, etag, last_modified, now) for url, body, etag, last_modified in responses])
+            conn.executemany("UPDATE responses SET fetched_at = ? WHERE url = ?", [(now, url) for url in revalidated])
+        conn.close()
+
+    def touch(self, url: str):
+        """Restart the TTL after a 304 confirmed the cached body is current"""
+        conn = self._connect()
+        with conn:
+            conn.execute("UPDATE responses SET fetched_at = ? WHERE url = ?", (time.time(), url))
+        conn.close()
+
+
+class CachedHTTPClient:
+    """Blocking HTTP client with pooled keep-alive connections and a shared response cache"""
+
+    def __init__(self, cache: Optional[ResponseCache] = None, headers: Optional[Dict] = None,
+                 pool_size: int = 10, timeout: float = 15):
+        self.cache = cache or ResponseCache()
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Return the body for a URL, from cache when fresh or unchanged"""
+        start = time.monotonic()
+        entry = self.cache.get(url)
+        if self.cache.is_fresh(entry):
+            self.cache.stats.record('hits', len(entry['body']), time.monotonic() - start)
+            return entry['body']
+
+        response = self.session.get(url, headers=self.cache.conditional_headers(entry), timeout=self.timeout)
+        profiling.record_request(url, len(response.content), failed=response.status_code not in (200, 304))
+        if response.status_code == 304 and entry:
+            self.cache.touch(url)
+            self.cache.stats.record('revalidated', len(entry['body']), time.monotonic() - start)
+            return entry['body']
+        if response.status_code != 200:
+            return None
+
+        body = response.content
+        self.cache.put(url, body, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        self.cache.stats.record('miss', len(body), time.monotonic() - start)
+        return body
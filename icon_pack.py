@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Ticker icons packed into one memory-mapped file: a symbol index, the original image bytes,
+and an optional pre-rendered RGBA sprite atlas for charts
+
+Layout: MAGIC | version (u32) | index offset (u64) | index length (u64) | image blobs | atlas | JSON index
+"""
+
+import argparse
+import io
+import json
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+
+MAGIC = b'TICKICON'
+VERSION = 1
+HEADER = struct.Struct('<8sIQQ')
+DEFAULT_SOURCE = Path('Stock_corr') / 'ticker_icons'
+DEFAULT_PACK = Path('Stock_corr') / 'ticker_icons.iconpack'
+
+# Leading bytes of the image formats found in ticker_icons; anything else is skipped when packing
+SIGNATURES = [(b'\x89PNG\r\n\x1a\n', 'png'), (b'\xff\xd8\xff', 'jpeg'), (b'GIF8', 'gif')]
+
+
+def image_format(data: bytes) -> Optional[str]:
+    for signature, name in SIGNATURES:
+        if data.startswith(signature):
+            return name
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+
+def image_size(data: bytes, kind: str):
+    """(width, height) read from the PNG header, or None for other formats"""
+    if kind == 'png' and len(data) >= 24:
+        return struct.unpack('>II', data[16:24])
+    return None
+
+
+def _align(f, boundary: int = 8):
+    padding = -f.tell() % boundary
+    f.write(b'\0' * padding)
+
+
+def render_sprite(data: bytes, size: int) -> np.ndarray:
+    """Decode an icon and fit it, aspect preserved, onto a transparent size x size RGBA tile"""
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data)).convert('RGBA')
+    image.thumbnail((size, size), Image.LANCZOS)
+    tile = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    tile.paste(image, ((size - image.width) // 2, (size - image.height) // 2))
+    return np.asarray(tile, dtype=np.uint8)
+
+
+def build_pack(source=DEFAULT_SOURCE, output=DEFAULT_PACK, atlas_size: Optional[int] = None) -> Dict:
+    """Pack every icon in `source` into one file (atlas_size adds sprites, and needs Pillow)"""
+    source, output = Path(source), Path(output)
+    icons = {}
+    sprites = []
+    skipped = []
+    tmp_path = output.with_suffix(output.suffix + '.tmp')
+
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+        for entry in sorted(os.scandir(source), key=lambda e: e.name):
+            if not entry.is_file():
+                continue
+            with open(entry.path, 'rb') as icon:
+                data = icon.read()
+            symbol = os.path.splitext(entry.name)[0].upper()
+            kind = image_format(data)
+            if kind is None or symbol in icons:
+                skipped.append(entry.name)
+                continue
+            if atlas_size:
+                try:
+                    sprites.append(render_sprite(data, atlas_size))
+                except OSError:
+                    skipped.append(entry.name)
+                    continue
+
+            icons[symbol] = [f.tell(), len(data), kind, image_size(data, kind)]
+            f.write(data)
+
+        index = {'icons': icons, 'built': time.time()}
+        if atlas_size:
+            # Sprites are stored raw so readers get numpy views straight from the map
+            _align(f)
+            index['atlas'] = {'offset': f.tell(), 'size': atlas_size, 'count': len(sprites)}
+            for sprite in sprites:
+                f.write(sprite.tobytes())
+
+        _align(f)
+        index_offset = f.tell()
+        encoded = json.dumps(index, separators=(',', ':')).encode('utf-8')
+        f.write(encoded)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, index_offset, len(encoded)))
+
+    os.replace(tmp_path, output)
+    return {'icons': len(icons), 'skipped': skipped, 'bytes': output.stat().st_size}
+
+
+class IconPack:
+    """Read-only access to a packed icon file; lookups are dict hits and slices of one mmap"""
+
+    def __init__(self, path=DEFAULT_PACK):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, index_offset, index_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} icon pack")
+        index = json.loads(self._map[index_offset:index_offset + index_length])
+        self.icons = index['icons']  # symbol -> [offset, length, format, (width, height) or None]
+        self.slots = {symbol: slot for slot, symbol in enumerate(self.icons)}  # Sprites follow index order
+
+        self.atlas = None
+        if 'atlas' in index:
+            atlas = index['atlas']
+            size = atlas['size']
+            self.atlas = np.frombuffer(self._map, dtype=np.uint8, count=atlas['count'] * size * size * 4,
+                                       offset=atlas['offset']).reshape(atlas['count'], size, size, 4)
+
+    def close(self):
+        self.atlas = None
+        if not self._map.closed:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # Arrays handed out still view the map; it is released with them
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.icons)
+
+    def __contains__(self, symbol: str) -> bool:
+        return self._key(symbol) is not None
+
+    def symbols(self) -> List[str]:
+        return list(self.icons)
+
+    def _key(self, symbol: str) -> Optional[str]:
+        """Index key for a ticker, trying the share-class spellings Yahoo and the icon names use (BRK-B / BRK.B)"""
+        symbol = symbol.upper()
+        for candidate in (symbol, symbol.replace('-', '.'), symbol.replace('.', '-')):
+            if candidate in self.icons:
+                return candidate
+        return None
+
+    def get_bytes(self, symbol: str) -> Optional[bytes]:
+        """The icon's original file contents, or None if the pack has no icon for the ticker"""
+        key = self._key(symbol)
+        if key is None:
+            return None
+        offset, length = self.icons[key][:2]
+        return self._map[offset:offset + length]
+
+    def get_format(self, symbol: str) -> Optional[str]:
+        key = self._key(symbol)
+        return self.icons[key][2] if key else None
+
+    def get_sprite(self, symbol: str) -> Optional[np.ndarray]:
+        """size x size x 4 RGBA view into the atlas (read-only, no copy), or None without an atlas"""
+        key = self._key(symbol)
+        if key is None or self.atlas is None:
+            return None
+        return self.atlas[self.slots[key]]
+
+    def get_array(self, symbol: str) -> Optional[np.ndarray]:
+        """RGBA array for the ticker: the atlas sprite if built, otherwise the decoded icon (needs Pillow)"""
+        sprite = self.get_sprite(symbol)
+        if sprite is not None:
+            return sprite
+        data = self.get_bytes(symbol)
+        if data is None:
+            return None
+        from PIL import Image
+
+        return np.asarray(Image.open(io.BytesIO(data)).convert('RGBA'))
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Build or inspect the packed ticker icon file')
+    parser.add_argument('tickers', nargs='*', help='Tickers to look up in the pack')
+    parser.add_argument('--build', action='store_true', help='Build the pack from the icon directory')
+    parser.add_argument('--source', default=str(DEFAULT_SOURCE), help=f'Icon directory (default: {DEFAULT_SOURCE})')
+    parser.add_argument('--pack', default=str(DEFAULT_PACK), help=f'Pack file (default: {DEFAULT_PACK})')
+    parser.add_argument('--atlas', type=int, metavar='SIZE',
+                        help='Also pre-render SIZE x SIZE RGBA sprites for charts (needs Pillow)')
+    args = parser.parse_args()
+
+    if args.build:
+        started = time.perf_counter()
+        try:
+            result = build_pack(args.source, args.pack, args.atlas)
+        except ImportError:
+            print("❌ The sprite atlas needs Pillow (pip install pillow); build without --atlas to skip it")
+            return
+        print(f"📦 Packed {result['icons']} icons into {args.pack} ({result['bytes'] / 1e6:.1f} MB) "
+              f"in {time.perf_counter() - started:.1f}s")
+        if result['skipped']:
+            print(f"⚠️  Skipped (not an image, or a duplicate symbol): {', '.join(result['skipped'])}")
+
+    if not os.path.exists(args.pack):
+        print(f"❌ No icon pack at {args.pack}; run with --build first")
+        return
+    with IconPack(args.pack) as pack:
+        atlas = f", {pack.atlas.shape[1]}px atlas" if pack.atlas is not None else ''
+        print(f"🗂  {args.pack}: {len(pack)} icons{atlas}")
+        for ticker in args.tickers:
+            data = pack.get_bytes(ticker)
+            if data is None:
+                print(f"  {ticker.upper()}: no icon")
+            else:
+                print(f"  {ticker.upper()}: {pack.get_format(ticker)}, {len(data)} bytes")
+
+
+if __name__ == "__main__":
+    main()
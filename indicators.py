@@ -0,0 +1,185 @@
+"""
+Technical indicators over whole panels: every function takes sessions x tickers frames
+(or single series) and computes all columns at once instead of looping per ticker
+
+Trailing-window statistics come from one cumulative sum per input, so asking for several
+windows (e.g. Parkinson volatility at 10/60/120/180 sessions) costs a subtraction per window.
+"""
+
+from typing import Dict, Iterable
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def _wrap(values: np.ndarray, like):
+    if isinstance(like, pd.DataFrame):
+        return pd.DataFrame(values, index=like.index, columns=like.columns)
+    return pd.Series(values, index=like.index, name=like.name)
+
+
+def _window_sums(values: np.ndarray, windows: Iterable[int]) -> Dict[int, np.ndarray]:
+    """Trailing sums along the first axis; NaN until a window holds `window` valid values"""
+    valid = ~np.isnan(values)
+    zeros = np.zeros((1,) + values.shape[1:])
+    sums = np.concatenate([zeros, np.cumsum(np.where(valid, values, 0.0), axis=0)])
+    counts = np.concatenate([zeros, np.cumsum(valid, axis=0)])
+
+    result = {}
+    for window in windows:
+        out = np.full(values.shape, np.nan)
+        if window <= len(values):
+            total = sums[window:] - sums[:-window]
+            full = counts[window:] - counts[:-window] == window
+            out[window - 1:] = np.where(full, total, np.nan)
+        result[window] = out
+    return result
+
+
+def rolling_sums(values, windows: Iterable[int]) -> Dict[int, pd.DataFrame]:
+    """Trailing sums for several windows from one cumulative sum"""
+    sums = _window_sums(np.asarray(values, dtype=float), windows)
+    return {window: _wrap(total, values) for window, total in sums.items()}
+
+
+def rolling_means(values, windows: Iterable[int]) -> Dict[int, pd.DataFrame]:
+    """Simple moving averages for several windows"""
+    sums = _window_sums(np.asarray(values, dtype=float), windows)
+    return {window: _wrap(total / window, values) for window, total in sums.items()}
+
+
+def rolling_stds(values, windows: Iterable[int], ddof: int = 1) -> Dict[int, pd.DataFrame]:
+    """Sample standard deviations for several windows from running sums of values and squares"""
+    windows = list(windows)
+    array = np.asarray(values, dtype=float)
+    sums = _window_sums(array, windows)
+    squares = _window_sums(array ** 2, windows)
+    result = {}
+    for window in windows:
+        variance = (squares[window] - sums[window] ** 2 / window) / (window - ddof)
+        result[window] = _wrap(np.sqrt(np.maximum(variance, 0.0)), values)
+    return result
+
+
+def sma(values, window: int):
+    """Simple moving average; NaN until a full window is available"""
+    return rolling_means(values, [window])[window]
+
+
+def ema(values, span: int):
+    """Exponential moving average seeded with the first value (ewm adjust=False, as TradingView)"""
+    return values.ewm(span=span, adjust=False).mean()
+
+
+def rma(values, period: int):
+    """Wilder's smoothing, used by RSI and ATR"""
+    return values.ewm(alpha=1 / period, adjust=False).mean()
+
+
+def normalize(values, low: float, high: float):
+    """Scale onto 0-1 between low and high, clipped at both ends"""
+    return ((values - low) / (high - low)).clip(0, 1)
+
+
+def rsi(close, period: int = 14, wilder: bool = True):
+    """Relative Strength Index; wilder=False averages gains and losses over a simple window (Cutler's RSI)"""
+    delta = close.diff()
+    gains, losses = delta.clip(lower=0), -delta.clip(upper=0)
+    if wilder:
+        gain, loss = rma(gains, period), rma(losses, period)
+    else:
+        gain, loss = sma(gains, period), sma(losses, period)
+    rs = gain / loss
+    return (100 - 100 / (1 + rs)).where(loss > 0, 100.0).where(gain.notna())
+
+
+def true_range(high, low, close):
+    """Largest of today's range and the gaps from yesterday's close (the range alone on the first bar)"""
+    previous = close.shift(1)
+    return np.fmax(high - low, np.fmax((high - previous).abs(), (low - previous).abs()))
+
+
+def atr(high, low, close, period: int = 14):
+    """Average True Range"""
+    return rma(true_range(high, low, close), period)
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9):
+    """MACD line, signal line and histogram"""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def performance(close, periods: int):
+    """Fractional change over the last `periods` sessions"""
+    return close / close.shift(periods) - 1
+
+
+def relative_volume(volume, window: int = 30):
+    """Today's volume over the average daily volume of the previous `window` sessions"""
+    return volume / sma(volume.shift(1), window)
+
+
+def vwma(close, volume, window: int = 20):
+    """Volume-weighted moving average of closes"""
+    return vwmas(close, volume, [window])[window]
+
+
+def vwmas(close, volume, windows: Iterable[int]) -> Dict[int, pd.DataFrame]:
+    """Volume-weighted moving averages for several windows"""
+    windows = list(windows)
+    weighted = rolling_sums(close * volume, windows)
+    volumes = rolling_sums(volume, windows)
+    return {window: weighted[window] / volumes[window] for window in windows}
+
+
+def vwap(high, low, close, volume, window: int = 1):
+    """Volume-weighted average of the typical price over the trailing window
+
+    With daily bars and window=1 this is the session-anchored VWAP TradingView shows on a 1D chart.
+    """
+    typical = (high + low + close) / 3
+    if window == 1:
+        return typical.where(volume > 0)
+    return vwmas(typical, volume, [window])[window]
+
+
+def parkinson_volatilities(high, low, windows: Iterable[int],
+                           periods_per_year: int = TRADING_DAYS) -> Dict[int, pd.DataFrame]:
+    """Annualized Parkinson volatility (from high/low ranges) for several windows"""
+    squared = np.log(high / low) ** 2 / (4 * np.log(2))
+    return {window: np.sqrt(mean * periods_per_year) for window, mean in rolling_means(squared, windows).items()}
+
+
+def parkinson_volatility(high, low, window: int, periods_per_year: int = TRADING_DAYS):
+    return parkinson_volatilities(high, low, [window], periods_per_year)[window]
+
+
+def garman_klass_volatilities(open_, high, low, close, windows: Iterable[int],
+                              periods_per_year: int = TRADING_DAYS) -> Dict[int, pd.DataFrame]:
+    """Annualized Garman-Klass volatility (ranges plus open-to-close moves) for several windows"""
+    variance = 0.5 * np.log(high / low) ** 2 - (2 * np.log(2) - 1) * np.log(close / open_) ** 2
+    return {window: np.sqrt(mean.clip(lower=0) * periods_per_year)
+            for window, mean in rolling_means(variance, windows).items()}
+
+
+def garman_klass_volatility(open_, high, low, close, window: int, periods_per_year: int = TRADING_DAYS):
+    return garman_klass_volatilities(open_, high, low, close, [window], periods_per_year)[window]
+
+
+def money_flow_indices(high, low, close, volume, periods: Iterable[int]) -> Dict[int, pd.DataFrame]:
+    """Money Flow Index for several periods: share of raw money flow that came on up days, 0-100"""
+    periods = list(periods)
+    typical = (high + low + close) / 3
+    flow = typical * volume
+    change = typical.diff()
+    # Flow on the first bar has no direction; it stays NaN so windows start one bar later
+    positive = rolling_sums(flow.where(change > 0, 0.0).where(change.notna()), periods)
+    negative = rolling_sums(flow.where(change < 0, 0.0).where(change.notna()), periods)
+    return {period: 100 * positive[period] / (positive[period] + negative[period]) for period in periods}
+
+
+def money_flow_index(high, low, close, volume, period: int = 14):
+    return money_flow_indices(high, low, close, volume, [period])[period]
@@ -8,14 +8,19 @@ import webbrowser
 from pathlib import Path
 from datetime import datetime
 import difflib
-from fear_greed_enhanced import FearGreedEnhanced
 from market_mapping import INDUSTRY_PEERS
+from service_client import service_request
+import profiling
 
 
 class IndustryLookup:
     """Interactive tool for industry-specific fear/greed analysis"""
     
     def __init__(self, period_days=180):
+        # Imported here so service-backed commands skip loading the plotting stack
+        with profiling.span('import.fear_greed_enhanced'):
+            from fear_greed_enhanced import FearGreedEnhanced
+        
         self.analyzer = FearGreedEnhanced(period_days)
         self.industries = list(INDUSTRY_PEERS.keys())
         self.output_dir = Path('industry_charts')
@@ -77,6 +82,7 @@ class IndustryLookup:
         
         return True
     
+    @profiling.timed('industry_lookup.chart')
     def generate_industry_chart(self, industry_name):
         """Generate chart for a specific industry"""
         if industry_name not in INDUSTRY_PEERS:
@@ -225,6 +231,19 @@ class IndustryLookup:
         return chart_path
 
 
+def print_matches(query, matches):
+    """Print search results with their match type and stock count"""
+    if matches:
+        print(f"\n🔍 Found {len(matches)} matches for '{query}':")
+        print("-" * 50)
+        for i, (match_type, industry, score) in enumerate(matches, 1):
+            match_indicator = "🎯" if match_type == 'exact' else "📍" if match_type == 'partial' else "🔍"
+            stock_count = len(INDUSTRY_PEERS[industry])
+            print(f"{i:2d}. {match_indicator} {industry} ({stock_count} stocks)")
+    else:
+        print(f"❌ No industries found matching '{query}'")
+
+
 def main():
     """Main function with CLI support"""
     parser = argparse.ArgumentParser(
@@ -252,8 +271,28 @@ Examples:
                        help='Don\'t open browser automatically')
     parser.add_argument('--output-dir', type=str,
                        help='Custom output directory')
+    profiling.add_arguments(parser)
     
     args = parser.parse_args()
+    profiling.start_from_args(args, 'industry_lookup_tool')
+    
+    # Answer from a running market_service.py when possible
+    if args.search:
+        response = service_request('/industries/search', {'q': args.search})
+        if response is not None:
+            print_matches(args.search, [(m['match'], m['industry'], m['score']) for m in response['matches']])
+            return 0
+    elif args.industry and not args.output_dir:
+        response = service_request('/industries/search', {'q': args.industry, 'limit': 1})
+        if response is not None and response['matches']:
+            industry = response['matches'][0]['industry']
+            chart = service_request(f'/chart/industry/{industry}', {'format': 'json'},
+                                    require={'period_days': args.days})
+            if chart is not None:
+                print(f"✅ Chart from market service: {chart['path']}")
+                if not args.no_browser:
+                    webbrowser.open(f"file://{chart['path']}")
+                return 0
     
     # Initialize lookup tool
     lookup = IndustryLookup(period_days=args.days)
@@ -271,17 +310,7 @@ Examples:
         
         elif args.search:
             # Search for industries
-            matches = lookup.search_industries(args.search)
-            
-            if matches:
-                print(f"\n🔍 Found {len(matches)} matches for '{args.search}':")
-                print("-" * 50)
-                for i, (match_type, industry, score) in enumerate(matches, 1):
-                    match_indicator = "🎯" if match_type == 'exact' else "📍" if match_type == 'partial' else "🔍"
-                    stock_count = len(INDUSTRY_PEERS[industry])
-                    print(f"{i:2d}. {match_indicator} {industry} ({stock_count} stocks)")
-            else:
-                print(f"❌ No industries found matching '{args.search}'")
+            print_matches(args.search, lookup.search_industries(args.search))
         
         elif args.industry:
             # Generate chart for specific industry
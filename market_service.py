@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Long-running local service keeping prices, scores, metadata and the industry index warm behind a JSON API
+"""
+
+import argparse
+import json
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlparse
+
+import matplotlib
+matplotlib.use('Agg')  # Charts are rendered off-screen from worker threads
+
+import pandas as pd
+from market_mapping import SECTOR_ETF_MAP, INDUSTRY_PEERS
+from portfolio_fear_greed import MARKET_CLOSE, MARKET_TZ, SETTLE_DELAY, PortfolioFearGreed, load_holdings
+from stock_info_manager import StockInfoManager
+
+REFRESH_DELAY = SETTLE_DELAY  # Let closing prices settle before refreshing
+
+
+def next_refresh_time(now: datetime = None) -> datetime:
+    """Next weekday market close (plus settle delay), in market time"""
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    candidate = now.replace(hour=MARKET_CLOSE[0], minute=MARKET_CLOSE[1], second=0, microsecond=0) + REFRESH_DELAY
+    while candidate <= now or candidate.weekday() >= 5:
+        candidate = (candidate + timedelta(days=1)).replace(
+            hour=MARKET_CLOSE[0], minute=MARKET_CLOSE[1]) + REFRESH_DELAY
+    return candidate
+
+
+def _clean(value):
+    """JSON-safe scalar (NaN -> None, numpy/pandas types -> Python)"""
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.strftime('%Y-%m-%d')
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float):
+        return None if math.isnan(value) else round(value, 4)
+    return value
+
+
+def series_to_json(series: pd.Series):
+    return [{'date': _clean(d), 'value': _clean(v)} for d, v in series.items()]
+
+
+class MarketService:
+    """Warm state shared by every request; one lock serializes the (matplotlib/pandas) compute paths"""
+
+    def __init__(self, period_days=180, sentiment_weight=0.0, config_file='config.json'):
+        self.period_days = period_days
+        self.sentiment_weight = sentiment_weight
+        self.config_file = config_file
+        self.lock = threading.RLock()
+        self.info_manager = StockInfoManager()
+        self._reset()
+
+    def _reset(self):
+        # A fresh analyzer re-anchors the date window and drops cached histories
+        self.analyzer = PortfolioFearGreed(self.period_days, sentiment_weight=self.sentiment_weight)
+        self.analyzer.output_dir = Path('service_charts')
+        self.analyzer.output_dir.mkdir(exist_ok=True)
+        self.series = {}  # (subject_type, name) -> fear/greed series
+        self.charts = {}  # (kind, name) -> chart path
+        self.portfolio_cache = None
+        self.portfolio_mtime = None
+        self.refreshed_at = datetime.now()
+
+    def refresh(self):
+        """Drop price-derived state and reload metadata, then re-warm the portfolio"""
+        print(f"🔄 Refreshing service state ({datetime.now().strftime('%Y-%m-%d %H:%M')})...")
+        with self.lock:
+            self.info_manager.stock_info = self.info_manager.load_cache()
+            self._reset()
+        self.portfolio_summary()
+        print("✅ Refresh complete")
+
+    def schedule_refreshes(self):
+        """Background thread refreshing after each market close"""
+        def loop():
+            while True:
+                due = next_refresh_time()
+                time.sleep(max(1.0, (due - datetime.now(MARKET_TZ)).total_seconds()))
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"⚠️  Scheduled refresh failed: {e}")
+        threading.Thread(target=loop, name='market-close-refresh', daemon=True).start()
+        print(f"⏰ Next refresh: {next_refresh_time().strftime('%a %Y-%m-%d %H:%M %Z')}")
+
+    # --- Data -------------------------------------------------------------------------
+
+    def fear_greed(self, subject_type: str, name: str) -> pd.Series:
+        key = (subject_type, name)
+        if key not in self.series:
+            with self.lock:
+                if subject_type == 'sector':
+                    series = self.analyzer.get_historical_fear_greed(
+                        SECTOR_ETF_MAP[name], sentiment_subject=('sector', name))
+                elif subject_type == 'industry':
+                    series = pd.concat([
+                        self.analyzer.get_historical_fear_greed(s, sentiment_subject=('industry', name))
+                        for s in INDUSTRY_PEERS[name][:3]], axis=1).mean(axis=1)
+                else:
+                    series = self.analyzer.holding_scores(name)
+                    if series is None:
+                        raise KeyError(name)
+                self.series[key] = series
+        return self.series[key]
+
+    def signals(self, subject_type: str, name: str) -> dict:
+        """Current score, smoothed trend, support/resistance and recent inflection points"""
+        series = self.fear_greed(subject_type, name)
+        with self.lock:
+            smoothed = series.rolling(window=self.analyzer.smoothing_window, center=True).mean().bfill().ffill()
+            slopes = self.analyzer.calculate_trend_strength(smoothed)
+            levels = self.analyzer.find_support_resistance_levels(series.values)
+            inflections = self.analyzer.find_inflection_points(smoothed)
+        slope = _clean(slopes.iloc[-1]) or 0
+        return {
+            'subject_type': subject_type, 'name': name,
+            'score': _clean(series.iloc[-1]),
+            'trend': _clean(smoothed.iloc[-1]),
+            'direction': 'rising' if slope > 0 else 'falling' if slope < 0 else 'flat',
+            'levels': [{k: _clean(v) for k, v in level.items()} for level in levels],
+            'inflections': [{k: _clean(v) for k, v in p.items()} for p in inflections[-5:]],
+        }
+
+    def search_industries(self, query: str, limit: int = 10) -> list:
+        if not hasattr(self, 'lookup'):
+            from industry_lookup_tool import IndustryLookup
+            self.lookup = IndustryLookup(self.period_days)
+        return [{'industry': industry, 'match': kind, 'score': round(score, 3), 'stocks': len(INDUSTRY_PEERS[industry])}
+                for kind, industry, score in self.lookup.search_industries(query, limit)]
+
+    def portfolio_summary(self) -> dict:
+        """Holdings with metadata, plus the weighted fear/greed index and contributions"""
+        # Holdings edits (portfolio_manager add/remove) invalidate the summary
+        mtime = Path(self.config_file).stat().st_mtime
+        if self.portfolio_cache is None or self.portfolio_mtime != mtime:
+            self.portfolio_mtime = mtime
+            holdings, weights = load_holdings(self.config_file)
+            with self.lock:
+                # The holdings were edited by another process, which also wrote their metadata
+                self.info_manager.stock_info = self.info_manager.load_cache()
+                computed = self.analyzer.compute(holdings, weights) if holdings else None
+                info = {t: self.info_manager.get_info(t) for t in holdings}
+            summary = {
+                'holdings': [{'ticker': t, 'weight': round(weights[t], 4), 'company': info[t].get('company'),
+                              'sector': info[t].get('sector'), 'industry': info[t].get('industry'),
+                              'peers': info[t].get('peers', []), 'sector_etf': info[t].get('sector_etf')}
+                             for t in holdings],
+                'index': None, 'contributions': [],
+            }
+            if computed is not None:
+                scores, index, contributions = computed
+                for ticker, series in scores.items():
+                    self.series[('ticker', ticker)] = series
+                summary['index'] = _clean(index.iloc[-1])
+                summary['index_series'] = series_to_json(index)
+                summary['contributions'] = [{'ticker': t, **{k: _clean(v) for k, v in row.items()}}
+                                            for t, row in contributions.iterrows()]
+            self.portfolio_cache = summary
+        return self.portfolio_cache
+
+    def chart(self, kind: str, name: str) -> Path:
+        """Chart PNG path, rendered at most once per refresh"""
+        key = (kind, name)
+        if key not in self.charts or not Path(self.charts[key]).exists():
+            with self.lock:
+                if kind == 'sector':
+                    path = self.analyzer.create_sector_chart(name, SECTOR_ETF_MAP[name])
+                elif kind == 'industry':
+                    path = self.analyzer.create_industry_chart(name, INDUSTRY_PEERS[name])
+                elif kind == 'portfolio':
+                    holdings, weights = load_holdings(self.config_file)
+                    path, _ = self.analyzer.create_portfolio_report(holdings, weights)
+                else:
+                    raise KeyError(kind)
+                self.charts[key] = path
+        return Path(self.charts[key])
+
+    def stock_info(self, ticker: str) -> dict:
+        with self.lock:
+            return self.info_manager.get_info(ticker)
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """Routes: /health /info /scores /signals /industries/search /portfolio /chart/<kind>[/<name>] /refresh"""
+
+    service = None  # Set by serve()
+
+    def log_message(self, format, *args):
+        pass  # Keep the console for refresh/progress output
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_png(self, path: Path):
+        body = path.read_bytes()
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [unquote(p) for p in url.path.strip('/').split('/') if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        service = self.service
+        start = time.perf_counter()
+        try:
+            if parts == ['health']:
+                payload = {'status': 'ok', 'refreshed_at': service.refreshed_at.isoformat(),
+                           'period_days': service.period_days, 'sentiment_weight': service.sentiment_weight}
+            elif parts == ['info']:
+                payload = service.stock_info(query['ticker'])
+            elif parts in (['scores'], ['signals']):
+                subject_type = query.get('type', 'ticker')
+                name = query['name'] if 'name' in query else query['ticker'].upper()
+                if parts == ['scores']:
+                    payload = {'subject_type': subject_type, 'name': name,
+                               'scores': series_to_json(service.fear_greed(subject_type, name))}
+                else:
+                    payload = service.signals(subject_type, name)
+            elif parts == ['industries', 'search']:
+                payload = {'query': query.get('q', ''),
+                           'matches': service.search_industries(query.get('q', ''), int(query.get('limit', 10)))}
+            elif parts == ['portfolio']:
+                payload = service.portfolio_summary()
+            elif parts and parts[0] == 'chart' and len(parts) in (2, 3):
+                path = service.chart(parts[1], parts[2] if len(parts) == 3 else 'portfolio')
+                if query.get('format') == 'json':
+                    payload = {'path': str(path.absolute())}
+                else:
+                    return self._send_png(path)
+            else:
+                return self._send_json({'error': f'unknown endpoint {url.path}'}, 404)
+        except KeyError as e:
+            return self._send_json({'error': f'not found or missing parameter: {e}'}, 404)
+        except Exception as e:
+            return self._send_json({'error': str(e)}, 500)
+
+        if isinstance(payload, dict):
+            payload.setdefault('elapsed_ms', round((time.perf_counter() - start) * 1000, 1))
+        self._send_json(payload)
+
+    def do_POST(self):
+        if urlparse(self.path).path.strip('/') == 'refresh':
+            threading.Thread(target=self.service.refresh, daemon=True).start()
+            return self._send_json({'status': 'refreshing'}, 202)
+        self._send_json({'error': 'unknown endpoint'}, 404)
+
+
+def serve(host='127.0.0.1', port=8765, period_days=180, sentiment_weight=0.0, warm=True):
+    service = MarketService(period_days, sentiment_weight)
+    ServiceHandler.service = service
+    server = ThreadingHTTPServer((host, port), ServiceHandler)
+    print(f"🚀 Market service listening on http://{host}:{port} ({period_days}-day window)")
+
+    if warm:
+        # Warm in the background so the API is reachable immediately
+        threading.Thread(target=service.portfolio_summary, daemon=True).start()
+    service.schedule_refreshes()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Service stopped")
+    finally:
+        server.server_close()
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Local market data service with a JSON API')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port (default: 8765)')
+    parser.add_argument('--days', type=int, default=180, help='Fear/greed window in days (default: 180)')
+    parser.add_argument('--sentiment-weight', type=float, default=0.0,
+                        help='Weight of stored news sentiment in scores, 0-1 (default: 0)')
+    parser.add_argument('--no-warm', action='store_true', help="Don't pre-compute the portfolio on startup")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.days, args.sentiment_weight, warm=not args.no_warm)
+
+
+if __name__ == "__main__":
+    main()
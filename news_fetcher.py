@@ -0,0 +1,130 @@
+import asyncio
+import time
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+import aiohttp
+import profiling
+
+# Status codes that mean "slow down" rather than "this URL is broken"
+THROTTLE_STATUSES = {429, 503}
+
+
+class AdaptiveRateLimiter:
+    """Per-host request pacing that backs off when throttled and speeds up on success"""
+
+    def __init__(self, min_interval: float = 0.0, max_interval: float = 10.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.next_slot = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        """Wait for this host's next request slot"""
+        loop = asyncio.get_running_loop()
+        async with self.lock:
+            now = loop.time()
+            delay = max(0.0, self.next_slot - now)
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_success(self):
+        # Additive decrease: creep back towards full speed
+        self.interval = max(self.min_interval, self.interval * 0.9 - 0.01)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        # Multiplicative increase: back off quickly when the host pushes back
+        self.interval = min(self.max_interval, max(self.interval * 2, 0.5, retry_after or 0))
+
+
+class AsyncNewsFetcher:
+    """Fetches many news pages/feeds concurrently with per-host limits and a global timeout"""
+
+    def __init__(self, headers: Optional[Dict] = None, per_host_limit: int = 4,
+                 timeout: float = 60.0, request_timeout: float = 15.0, retries: int = 2,
+                 cache=None):
+        self.headers = headers or {}
+        self.cache = cache  # Optional http_cache.ResponseCache shared with blocking clients
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout  # Budget for the whole batch
+        self.request_timeout = request_timeout
+        self.retries = retries
+
+    async def _fetch(self, session, url, entry, writes, semaphores, limiters) -> Optional[bytes]:
+        """Fetch one URL, retrying throttled responses with the host's adaptive backoff
+
+        entry is the URL's cached response (read before the batch); cache writes are queued in
+        `writes` and applied after it, so no coroutine blocks the event loop on SQLite.
+        """
+        host = urlparse(url).netloc
+        semaphore = semaphores.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        limiter = limiters.setdefault(host, AdaptiveRateLimiter())
+
+        # Reuse fresh cached bodies outright; otherwise revalidate with ETag/Last-Modified
+        start = time.monotonic()
+        if entry and self.cache.is_fresh(entry):
+            self.cache.stats.record('hits', len(entry['body']), time.monotonic() - start)
+            return entry['body']
+        headers = self.cache.conditional_headers(entry) if self.cache else {}
+
+        for attempt in range(self.retries + 1):
+            async with semaphore:
+                await limiter.wait()
+                try:
+                    async with session.get(url, headers=headers) as response:
+                        if response.status != 200:
+                            profiling.record_request(url, response.content_length or 0, failed=response.status != 304)
+                        if response.status in THROTTLE_STATUSES:
+                            retry_after = response.headers.get('Retry-After')
+                            limiter.on_throttle(float(retry_after) if retry_after and retry_after.isdigit() else None)
+                            continue
+                        if response.status == 304 and entry:
+                            limiter.on_success()
+                            writes['revalidated'].append(url)
+                            self.cache.stats.record('revalidated', len(entry['body']), time.monotonic() - start)
+                            return entry['body']
+                        if response.status != 200:
+                            return None
+                        body = await response.read()
+                        profiling.record_request(url, len(body))
+                        limiter.on_success()
+                        if self.cache:
+                            writes['responses'].append((url, body, response.headers.get('ETag'),
+                                                        response.headers.get('Last-Modified')))
+                            self.cache.stats.record('miss', len(body), time.monotonic() - start)
+                        return body
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    profiling.record_request(url, 0, failed=True)
+                    limiter.on_throttle()
+        return None
+
+    async def _fetch_all(self, urls) -> Dict[str, Optional[bytes]]:
+        if not urls:
+            return {}
+        semaphores, limiters = {}, {}
+        writes = {'responses': [], 'revalidated': []}
+        # The cache is read and written in one batch each, off the event loop
+        entries = await asyncio.to_thread(self.cache.get_many, urls) if self.cache else {}
+        client_timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        async with aiohttp.ClientSession(headers=self.headers, timeout=client_timeout) as session:
+            tasks = {asyncio.ensure_future(
+                self._fetch(session, url, entries.get(url), writes, semaphores, limiters)): url for url in urls}
+            done, pending = await asyncio.wait(tasks, timeout=self.timeout)
+
+            # Anything still running when the budget expires is abandoned
+            for task in pending:
+                task.cancel()
+            if pending:
+                print(f"⚠️  News fetch timed out after {self.timeout:.0f}s; {len(pending)} requests dropped")
+
+            results = {tasks[t]: (t.result() if t in done and not t.exception() else None) for t in tasks}
+        if self.cache and (writes['responses'] or writes['revalidated']):
+            await asyncio.to_thread(self.cache.store_many, writes['responses'], writes['revalidated'])
+        return results
+
+    def fetch_all(self, urls: Iterable[str]) -> Dict[str, Optional[bytes]]:
+        """Fetch all URLs concurrently; failed or timed-out URLs map to None"""
+        urls = list(dict.fromkeys(urls))
+        with profiling.span('news.fetch_all', urls=len(urls)):
+            return asyncio.run(self._fetch_all(urls))
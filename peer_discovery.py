@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Peer discovery from return correlations: each ticker's most correlated names across the whole universe,
+computed in row blocks so the all-pairs matrix never has to exist in memory
+"""
+
+import argparse
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional
+import numpy as np
+import pandas as pd
+from market_mapping import INDUSTRY_PEERS, MARKET_INDICES, SECTOR_ETF_MAP
+from price_store import PriceStore
+from stock_info_store import make_cache_backend
+
+# Funds correlate with everything in their basket, so they are never offered as peers
+FUNDS = set(SECTOR_ETF_MAP.values()) | set(MARKET_INDICES.values())
+
+
+def correlation_block(x: np.ndarray, m: np.ndarray, rows):
+    """Pairwise-complete correlations (and overlaps) of the rows' columns against every column
+
+    x holds returns with missing values zeroed and m marks which values exist, so each pair
+    only uses the sessions both tickers traded.
+    """
+    xb, mb = x[:, rows], m[:, rows]
+    overlap = mb.T @ m
+    sum_x = xb.T @ m
+    sum_y = mb.T @ x
+    sum_xx = (xb * xb).T @ m
+    sum_yy = mb.T @ (x * x)
+    sum_xy = xb.T @ x
+    covariance = overlap * sum_xy - sum_x * sum_y
+    variance = (overlap * sum_xx - sum_x ** 2) * (overlap * sum_yy - sum_y ** 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = covariance / np.sqrt(variance)
+    return np.where(variance > 0, np.clip(corr, -1, 1), np.nan), overlap
+
+
+class PeerIndex:
+    """Top-k most correlated tickers per symbol, stored in SQLite and rebuilt when older than a week"""
+
+    def __init__(self, db_path: str = 'peer_index.db', price_store=None, info_cache: str = 'stock_info_cache.db',
+                 k: int = 10, history_days: int = 365, min_overlap: int = 120, max_age_days: float = 7,
+                 block_size: int = 256, market: Optional[str] = 'SPY'):
+        self.db_path = db_path
+        self.price_store = price_store or PriceStore()
+        self.info_cache = info_cache
+        self.k = k
+        self.history_days = history_days
+        self.min_overlap = min_overlap  # Sessions two tickers must share before their correlation counts
+        self.max_age_seconds = max_age_days * 86400
+        self.block_size = block_size  # Rows per matrix product; memory is about 6 x block x universe floats
+        self.market = market  # Market moves are regressed out so peers share more than beta (None keeps raw returns)
+        self._lock = threading.Lock()
+        self._returns = None  # Universe returns, loaded once per process for on-demand lookups
+
+        conn = self._connect()
+        with conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS peer_index (
+                    ticker TEXT NOT NULL,
+                    rank INTEGER NOT NULL,
+                    peer TEXT NOT NULL,
+                    correlation REAL NOT NULL,
+                    overlap INTEGER NOT NULL,
+                    PRIMARY KEY (ticker, rank)
+                );
+                CREATE TABLE IF NOT EXISTS peer_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+        conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def universe(self, extra: Iterable[str] = ()) -> List[str]:
+        """INDUSTRY_PEERS, every cached ticker and its cached peers, plus any extra symbols"""
+        info = make_cache_backend(self.info_cache).load_all()
+        symbols = [t for peers in INDUSTRY_PEERS.values() for t in peers]
+        symbols += list(info) + [p for record in info.values() for p in record.get('peers', [])]
+        symbols += list(extra) + ([self.market] if self.market else [])
+        return list(dict.fromkeys(symbols))
+
+    def returns(self, symbols: List[str]) -> pd.DataFrame:
+        """Daily log returns with the market component removed (columns with too little history dropped)"""
+        closes = self.price_store.load_panel(symbols, self.history_days)['close'].dropna(how='all')
+        returns = np.log(closes).diff().iloc[1:]
+        returns = returns.loc[:, returns.notna().sum() >= self.min_overlap]
+        if self.market and self.market in returns.columns:
+            market = returns[self.market]
+            valid = returns.notna() & market.notna().to_numpy()[:, None]
+            x = returns.where(valid)
+            y = valid.mul(market, axis=0).where(valid)
+            beta = ((x - x.mean()) * (y - y.mean())).sum() / ((y - y.mean()) ** 2).sum()
+            returns = returns - np.outer(market.fillna(0.0), beta.fillna(0.0))
+        return returns
+
+    def built_at(self) -> Optional[float]:
+        conn = self._connect()
+        row = conn.execute("SELECT value FROM peer_meta WHERE key = 'built_at'").fetchone()
+        conn.close()
+        return float(row[0]) if row else None
+
+    def is_stale(self) -> bool:
+        built = self.built_at()
+        return built is None or time.time() - built > self.max_age_seconds
+
+    def _top_peers(self, returns: pd.DataFrame, tickers: List[str]) -> List[tuple]:
+        """(ticker, rank, peer, correlation, overlap) rows for the given tickers, block by block"""
+        symbols = list(returns.columns)
+        values = returns.to_numpy()
+        m = (~np.isnan(values)).astype(float)
+        x = np.where(m > 0, values, 0.0)
+        offerable = np.array([s not in FUNDS and s != self.market for s in symbols])
+
+        positions = [symbols.index(t) for t in tickers if t in symbols]
+        k = min(self.k, len(symbols) - 1)
+        rows = []
+        if k <= 0:
+            return rows
+        for start in range(0, len(positions), self.block_size):
+            block = positions[start:start + self.block_size]
+            corr, overlap = correlation_block(x, m, block)
+            corr[(overlap < self.min_overlap) | ~offerable] = np.nan
+            corr[np.arange(len(block)), block] = np.nan  # A ticker is not its own peer
+            scores = np.where(np.isnan(corr), -np.inf, corr)
+
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            for row, column in enumerate(block):
+                for rank, peer in enumerate(top[row]):
+                    if np.isfinite(scores[row, peer]):
+                        rows.append((symbols[column], rank, symbols[peer], float(corr[row, peer]),
+                                     int(overlap[row, peer])))
+        return rows
+
+    def _store(self, rows: List[tuple], tickers: List[str], rebuilt: bool = False):
+        conn = self._connect()
+        with conn:
+            if rebuilt:
+                conn.execute("DELETE FROM peer_index")
+            else:
+                conn.executemany("DELETE FROM peer_index WHERE ticker = ?", [(t,) for t in tickers])
+            conn.executemany("INSERT INTO peer_index VALUES (?, ?, ?, ?, ?)", rows)
+            if rebuilt:
+                conn.execute("INSERT OR REPLACE INTO peer_meta VALUES ('built_at', ?)", (str(time.time()),))
+                conn.execute("INSERT OR REPLACE INTO peer_meta VALUES ('universe', ?)", (str(len(tickers)),))
+        conn.close()
+
+    def rebuild(self, extra: Iterable[str] = ()) -> int:
+        """Recompute every ticker's peers over the whole universe; returns tickers indexed"""
+        with self._lock:
+            print("🧭 Building the correlation peer index...")
+            started = time.perf_counter()
+            self._returns = self.returns(self.universe(extra))
+            tickers = [t for t in self._returns.columns if t not in FUNDS and t != self.market]
+            rows = self._top_peers(self._returns, tickers)
+            self._store(rows, tickers, rebuilt=True)
+            print(f"  ✅ {len(tickers)} tickers x {self._returns.shape[1]} candidates "
+                  f"in {time.perf_counter() - started:.1f}s")
+            return len(tickers)
+
+    def refresh_if_stale(self, extra: Iterable[str] = ()) -> bool:
+        if not self.is_stale():
+            return False
+        self.rebuild(extra)
+        return True
+
+    def peers(self, ticker: str, k: Optional[int] = None, compute_missing: bool = True) -> List[str]:
+        """Most correlated tickers, best first; tickers new to the index are scored against the universe on demand"""
+        conn = self._connect()
+        rows = conn.execute("SELECT peer FROM peer_index WHERE ticker = ? ORDER BY rank LIMIT ?",
+                            (ticker, k or self.k)).fetchall()
+        conn.close()
+        if rows or not compute_missing:
+            return [peer for peer, in rows]
+
+        with self._lock:
+            if self._returns is None:
+                self._returns = self.returns(self.universe())
+            returns = self._returns
+            if ticker not in returns.columns:
+                own = self.returns([ticker] + ([self.market] if self.market else []))
+                if ticker not in own.columns:
+                    return []
+                returns = returns.join(own[[ticker]], how='left')
+            self._store(self._top_peers(returns, [ticker]), [ticker])
+        return self.peers(ticker, k, compute_missing=False)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Correlation-based peer index')
+    parser.add_argument('tickers', nargs='*', help='Tickers to show peers for')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild now instead of only when a week old')
+    parser.add_argument('-k', type=int, default=10, help='Peers kept per ticker (default: 10)')
+    args = parser.parse_args()
+
+    index = PeerIndex(k=args.k)
+    tickers = [t.upper() for t in args.tickers]
+    if args.rebuild:
+        index.rebuild(tickers)
+    else:
+        index.refresh_if_stale(tickers)
+
+    for ticker in tickers:
+        peers = index.peers(ticker)
+        print(f"{ticker}: {', '.join(peers) if peers else 'no peers (not enough price history)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Portfolio-weighted Fear & Greed index built from every holding in config.json
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+import pandas as pd
+import profiling
+from fear_greed_enhanced import FearGreedEnhanced
+
+MARKET_TZ = ZoneInfo('America/New_York')
+MARKET_CLOSE = (16, 0)
+SETTLE_DELAY = timedelta(minutes=20)  # Let closing prices settle before a day's scores count as final
+
+
+def session_final_at(day: str) -> float:
+    """Epoch time after which a score for `day` was computed from that day's settled close"""
+    close = datetime.strptime(day, '%Y-%m-%d').replace(hour=MARKET_CLOSE[0], minute=MARKET_CLOSE[1], tzinfo=MARKET_TZ)
+    return (close + SETTLE_DELAY).timestamp()
+
+
+def load_holdings(config_file: str = 'config.json'):
+    """Holdings and their normalized weights from config.json
+
+    Weights come from portfolio.weights ({"GME": 3, "INTC": 1, ...}); holdings without
+    an entry count as 1, so an absent weights block means equal weighting.
+    """
+    with open(config_file, 'r') as f:
+        config = json.load(f)
+    holdings = list(dict.fromkeys(config['portfolio']['stocks']))
+    raw = {t.upper(): float(w) for t, w in config['portfolio'].get('weights', {}).items()}
+    weights = {t: max(0.0, raw.get(t.upper(), 1.0)) for t in holdings}
+    total = sum(weights.values())
+    if total <= 0:
+        return holdings, {t: 1 / len(holdings) for t in holdings} if holdings else {}
+    return holdings, {t: w / total for t, w in weights.items()}
+
+
+class ScoreCache:
+    """Daily fear/greed scores per ticker and scoring parameters
+
+    A score computed after its day's close is final; one computed earlier (from a partial bar)
+    expires after the live TTL like today's.
+    """
+
+    def __init__(self, db_path: str = 'fear_greed_scores.db', live_ttl_minutes: float = 60):
+        self.db_path = db_path
+        self.live_ttl_seconds = live_ttl_minutes * 60
+        conn = self._connect()
+        with conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scores (
+                    ticker TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    computed_at REAL NOT NULL,
+                    PRIMARY KEY (ticker, date, params)
+                )""")
+        conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def load(self, ticker: str, days: List[str], params: str = '') -> Dict[str, float]:
+        """Cached scores for the requested days that are still valid"""
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT date, score, computed_at FROM scores WHERE ticker = ? AND params = ? AND date >= ?",
+            (ticker, params, min(days))).fetchall()
+        conn.close()
+        now = time.time()
+        wanted = set(days)
+        return {d: s for d, s, computed_at in rows
+                if d in wanted and (computed_at >= session_final_at(d) or now - computed_at < self.live_ttl_seconds)}
+
+    def store(self, ticker: str, scores: Dict[str, float], params: str = ''):
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?)",
+                             [(ticker, d, params, float(s), now) for d, s in scores.items()])
+        conn.close()
+
+
+class PortfolioFearGreed(FearGreedEnhanced):
+    """Weighted roll-up of per-holding fear/greed scores"""
+
+    def __init__(self, period_days=180, sentiment_weight=0.0, score_cache=None):
+        super().__init__(period_days, sentiment_weight=sentiment_weight)
+        self.score_cache = score_cache or ScoreCache()
+
+    def score_params(self) -> str:
+        """Cache key for the settings a stored score depends on"""
+        return (f"weight={self.sentiment_weight:g};window={self.sentiment_window};"
+                f"lookback={self.lookback_days};min_sessions={self.min_sessions}")
+
+    def holding_scores(self, ticker: str) -> Optional[pd.Series]:
+        """Daily scores for one holding, computing only the days missing from the cache (None if no prices)"""
+        dates = pd.date_range(start=self.start_date, end=self.end_date, freq='D')
+        days = [d.strftime('%Y-%m-%d') for d in dates]
+        params = self.score_params()
+        cached = self.score_cache.load(ticker, days, params)
+
+        missing = [(d, day) for d, day in zip(dates, days) if day not in cached]
+        profiling.record_cache('fear_greed_scores', 'hit', len(days) - len(missing))
+        profiling.record_cache('fear_greed_scores', 'miss', len(missing))
+        if missing:
+            hist = self.get_price_history(ticker)
+            if hist is None or hist.empty:
+                return None
+            print(f"  Scoring {ticker} ({len(missing)} of {len(days)} days)...")
+            sentiment = self.get_sentiment(ticker) if self.sentiment_weight > 0 else None
+            missing_dates = pd.DatetimeIndex([d for d, _ in missing])
+            scored = self.fear_greed_scores(
+                ticker, missing_dates, sentiment.reindex(missing_dates) if sentiment is not None else None)
+            computed = {day: score for (_, day), score in zip(missing, scored)}
+            self.score_cache.store(ticker, computed, params)
+            cached.update(computed)
+        return pd.Series([cached[day] for day in days], index=dates, name=ticker)
+
+    @profiling.timed('portfolio.compute')
+    def compute(self, holdings: List[str], weights: Dict[str, float]):
+        """Per-holding score frame, the weighted index, and each holding's contribution"""
+        series = {t: self.holding_scores(t) for t in holdings}
+        skipped = [t for t, s in series.items() if s is None]
+        if skipped:
+            print(f"⚠️  No price history, left out of the index: {', '.join(skipped)}")
+        if len(skipped) == len(series):
+            return None
+        scores = pd.concat([s for s in series.values() if s is not None], axis=1)
+
+        # Weights are renormalized over the holdings that could be scored
+        weight_row = pd.Series(weights).reindex(scores.columns).fillna(0.0)
+        weight_row = weight_row / weight_row.sum() if weight_row.sum() > 0 else weight_row
+        index = scores.mul(weight_row, axis=1).sum(axis=1)
+
+        latest = scores.iloc[-1]
+        contributions = pd.DataFrame({
+            'weight': weight_row,
+            'score': latest,
+            'contribution': latest * weight_row,  # Points of the index this holding supplies
+            'vs_neutral': (latest - 50) * weight_row,  # Pull towards greed (+) or fear (-)
+            'change_5d': (scores.iloc[-1] - scores.iloc[-6]) * weight_row if len(scores) > 5 else 0.0,
+        }).sort_values('vs_neutral')
+        return scores, index.rename('portfolio'), contributions
+
+    def create_portfolio_report(self, holdings: List[str], weights: Dict[str, float]):
+        """Render the index chart and contribution table"""
+        print(f"📊 Building portfolio index from {len(holdings)} holdings...")
+        computed = self.compute(holdings, weights)
+        if computed is None:
+            print("❌ None of the holdings could be scored")
+            return None, None
+        scores, index, contributions = computed
+
+        title = f'Portfolio - Weighted Fear & Greed Index ({self.period_days} Days, {len(holdings)} Holdings)'
+        chart = self.create_enhanced_chart(title, index, self.output_dir / 'portfolio_enhanced.png')
+
+        table_file = self.output_dir / 'portfolio_contributions.csv'
+        contributions.round(4).to_csv(table_file, index_label='ticker')
+        scores.round(2).to_csv(self.output_dir / 'portfolio_holding_scores.csv', index_label='date')
+
+        print(f"\n{'Ticker':<8}{'Weight':>8}{'Score':>8}{'Contrib':>9}{'vs 50':>8}{'5d chg':>8}")
+        print("-" * 49)
+        for ticker, row in contributions.iterrows():
+            print(f"{ticker:<8}{row['weight'] * 100:>7.1f}%{row['score']:>8.1f}{row['contribution']:>9.2f}"
+                  f"{row['vs_neutral']:>+8.2f}{row['change_5d']:>+8.2f}")
+        print("-" * 49)
+        print(f"{'Index':<8}{100:>7.1f}%{index.iloc[-1]:>8.1f}")
+        print(f"  ✅ Saved: {table_file}")
+        return chart, table_file
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Portfolio-weighted Fear & Greed index')
+    parser.add_argument('--days', type=int, default=180, help='Number of days to analyze (default: 180)')
+    parser.add_argument('--config', default='config.json', help='Portfolio config (default: config.json)')
+    parser.add_argument('--sentiment-weight', type=float, default=0.0,
+                        help='Weight of stored news sentiment in each score, 0-1 (default: 0)')
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start_from_args(args, 'portfolio_fear_greed')
+
+    holdings, weights = load_holdings(args.config)
+    if not holdings:
+        print("❌ No stocks found in portfolio")
+        return
+
+    analyzer = PortfolioFearGreed(period_days=args.days, sentiment_weight=args.sentiment_weight)
+    analyzer.create_portfolio_report(holdings, weights)
+
+
+if __name__ == "__main__":
+    main()
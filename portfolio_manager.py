@@ -1,12 +1,20 @@
 import json
 import os
-from stock_info_manager import StockInfoManager
+import re
+import sys
+import tempfile
+from service_client import service_request
 
 class PortfolioManager:
-    def __init__(self, config_file='config.json'):
+    def __init__(self, config_file='config.json', background_refresh=True):
         self.config_file = config_file
         self.config = self.load_config()
-        self.info_manager = StockInfoManager()
+        
+        # Imported here so service-backed commands skip loading yfinance/pandas
+        from stock_info_manager import StockInfoManager
+        self.info_manager = StockInfoManager(
+            peer_source=self.config.get('scraper', {}).get('peer_source', 'static'),
+            background_refresh=background_refresh)
     
     def load_config(self):
         """Load configuration file"""
@@ -22,40 +30,102 @@ class PortfolioManager:
             }
     
     def save_config(self):
-        """Save configuration file"""
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        """Save configuration file atomically (a crash never leaves a half-written config)"""
+        directory = os.path.dirname(os.path.abspath(self.config_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.config, f, indent=2)
+            os.replace(tmp_path, self.config_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
         print(f"✅ Configuration saved to {self.config_file}")
     
-    def add_ticker(self, ticker):
-        """Add a ticker to the portfolio"""
-        ticker = ticker.upper()
-        if ticker not in self.config['portfolio']['stocks']:
-            # Update stock info
-            info = self.info_manager.update_ticker(ticker)
-            
-            # Add to portfolio
-            self.config['portfolio']['stocks'].append(ticker)
-            self.save_config()
-            
+    def add_tickers(self, tickers):
+        """Validate and resolve several tickers at once, then save the config once"""
+        stocks = self.config['portfolio']['stocks']
+        requested = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+        for ticker in requested:
+            if ticker in stocks:
+                print(f"❌ {ticker} is already in portfolio")
+        new = [t for t in requested if t not in stocks]
+        if not new:
+            return []
+        
+        # One batched probe catches typos (e.g. APPL) before any info or peer lookups
+        validity = self.info_manager.symbol_cache.validate(new)
+        invalid = [t for t in new if not validity[t] and self.info_manager.symbol_cache.lookup(t) is False]
+        if invalid:
+            print(f"❌ Not valid symbols, skipped: {', '.join(invalid)}")
+        
+        # Symbols the probe couldn't answer still get a chance via the info lookup, which must
+        # succeed: failed fetches are left out, and placeholder records left by older runs don't count
+        candidates = [t for t in new if t not in invalid]
+        resolved = self.info_manager.update_portfolio(candidates) if candidates else {}
+        resolved = {t: info for t, info in resolved.items()
+                    if not (info.get('company') == t and info.get('industry') == 'Unknown'
+                            and info.get('sector') == 'Unknown')}
+        
+        added = [t for t in candidates if t in resolved]
+        failed = [t for t in candidates if t not in resolved]
+        if failed:
+            print(f"❌ Could not resolve: {', '.join(failed)}")
+        if not added:
+            return []
+        
+        stocks.extend(added)
+        self.save_config()
+        
+        for ticker in added:
+            info = resolved[ticker]
             print(f"\n✅ Added {ticker} to portfolio")
             print(f"   Company: {info['company']}")
             print(f"   Industry: {info['industry']}")
             print(f"   Sector: {info['sector']}")
             print(f"   Peers: {', '.join(info['peers'])}")
             print(f"   ETF: {info['sector_etf']}")
-        else:
-            print(f"❌ {ticker} is already in portfolio")
+        if len(added) > 1:
+            print(f"\n✅ Added {len(added)} tickers")
+        return added
+    
+    def add_ticker(self, ticker):
+        """Add a ticker to the portfolio"""
+        return self.add_tickers([ticker])
+    
+    def remove_tickers(self, tickers):
+        """Remove several tickers, saving the config once"""
+        stocks = self.config['portfolio']['stocks']
+        removed = []
+        for ticker in dict.fromkeys(t.strip().upper() for t in tickers if t.strip()):
+            if ticker in stocks:
+                stocks.remove(ticker)
+                removed.append(ticker)
+                print(f"✅ Removed {ticker} from portfolio")
+            else:
+                print(f"❌ {ticker} not found in portfolio")
+        if removed:
+            self.save_config()
+        return removed
     
     def remove_ticker(self, ticker):
         """Remove a ticker from the portfolio"""
-        ticker = ticker.upper()
-        if ticker in self.config['portfolio']['stocks']:
-            self.config['portfolio']['stocks'].remove(ticker)
-            self.save_config()
-            print(f"✅ Removed {ticker} from portfolio")
+        return self.remove_tickers([ticker])
+    
+    def check_portfolio(self):
+        """Report portfolio symbols that no longer resolve (typos, delistings)"""
+        stocks = self.config['portfolio']['stocks']
+        if not stocks:
+            print("📭 Portfolio is empty")
+            return []
+        validity = self.info_manager.symbol_cache.validate(stocks)
+        invalid = [t for t in stocks if not validity[t.upper()]]
+        if invalid:
+            print(f"⚠️  Invalid symbols in portfolio: {', '.join(invalid)}")
+            print(f"   Remove with: python portfolio_manager.py remove {' '.join(invalid)}")
         else:
-            print(f"❌ {ticker} not found in portfolio")
+            print(f"✅ All {len(stocks)} symbols are valid")
+        return invalid
     
     def list_portfolio(self):
         """List all tickers in portfolio with details"""
@@ -83,7 +153,11 @@ class PortfolioManager:
             return
         
         print(f"\n🔄 Updating {len(stocks)} stocks...")
-        self.info_manager.update_portfolio(stocks, force_update=True)
+        updated = self.info_manager.update_portfolio(stocks, force_update=True)
+        
+        failed = [t for t in stocks if t.upper() not in updated]
+        if failed:
+            print(f"⚠️  Could not update: {', '.join(failed)}")
         print("✅ All stock information updated")
     
     def interactive_menu(self):
@@ -105,14 +179,14 @@ class PortfolioManager:
                 self.list_portfolio()
             
             elif choice == '2':
-                ticker = input("Enter ticker to add: ").strip().upper()
-                if ticker:
-                    self.add_ticker(ticker)
+                tickers = input("Enter ticker(s) to add: ").strip().upper()
+                if tickers:
+                    self.add_tickers(re.split(r'[\s,]+', tickers))
             
             elif choice == '3':
-                ticker = input("Enter ticker to remove: ").strip().upper()
-                if ticker:
-                    self.remove_ticker(ticker)
+                tickers = input("Enter ticker(s) to remove: ").strip().upper()
+                if tickers:
+                    self.remove_tickers(re.split(r'[\s,]+', tickers))
             
             elif choice == '4':
                 self.update_all()
@@ -129,22 +203,76 @@ class PortfolioManager:
                 print("❌ Invalid option")
 
 
+def read_ticker_list(source):
+    """Tickers from a watchlist file, or stdin for '-' (comma/whitespace separated, '#' comments)"""
+    if source == '-':
+        text = sys.stdin.read()
+    else:
+        with open(source, 'r') as f:
+            text = f.read()
+    tickers = []
+    for line in text.splitlines():
+        line = line.split('#', 1)[0]
+        tickers.extend(t for t in re.split(r'[\s,;]+', line) if t)
+    return tickers
+
+
+def parse_ticker_args(args):
+    """Expand '--file PATH' and '-' (stdin) in command line ticker arguments"""
+    tickers = []
+    args = iter(args)
+    for arg in args:
+        if arg in ('--file', '-f'):
+            tickers.extend(read_ticker_list(next(args, '-')))
+        elif arg == '-':
+            tickers.extend(read_ticker_list('-'))
+        else:
+            tickers.append(arg)
+    return tickers
+
+
+def list_from_service():
+    """Print the portfolio from a running market_service.py; False if it isn't running"""
+    summary = service_request('/portfolio')
+    if summary is None:
+        return False
+    if not summary['holdings']:
+        print("📭 Portfolio is empty")
+        return True
+    
+    print("\n📊 Current Portfolio:")
+    print("-" * 80)
+    for holding in summary['holdings']:
+        print(f"\n{holding['ticker']}: {holding['company']}")
+        print(f"  Industry: {holding['industry']}")
+        print(f"  Sector: {holding['sector']}")
+        print(f"  Peers: {', '.join(holding['peers'][:5])}")
+        print(f"  ETF: {holding['sector_etf']}")
+    if summary.get('index') is not None:
+        print(f"\n📈 Portfolio Fear & Greed: {summary['index']:.1f}")
+    return True
+
+
 def main():
     """Main function with command line support"""
-    import sys
+    # Read-only listing can be answered by the market service without loading anything
+    if sys.argv[1:2] == ['list'] and list_from_service():
+        return
     
-    manager = PortfolioManager()
+    # A listing exits as soon as it prints, so it shows cached data without starting refreshes
+    manager = PortfolioManager(background_refresh=sys.argv[1:2] != ['list'])
     
     if len(sys.argv) > 1:
         command = sys.argv[1].lower()
         
         if command == 'add' and len(sys.argv) > 2:
-            for ticker in sys.argv[2:]:
-                manager.add_ticker(ticker)
+            manager.add_tickers(parse_ticker_args(sys.argv[2:]))
         
         elif command == 'remove' and len(sys.argv) > 2:
-            for ticker in sys.argv[2:]:
-                manager.remove_ticker(ticker)
+            manager.remove_tickers(parse_ticker_args(sys.argv[2:]))
+        
+        elif command == 'check':
+            manager.check_portfolio()
         
         elif command == 'list':
             manager.list_portfolio()
@@ -152,13 +280,22 @@ def main():
         elif command == 'update':
             manager.update_all()
         
+        elif command == 'import' and len(sys.argv) > 2:
+            from reference_import import ReferenceImporter
+            importer = ReferenceImporter(manager.info_manager)
+            for path in sys.argv[2:]:
+                importer.import_file(path)
+        
         else:
             print("Usage:")
             print("  python portfolio_manager.py          # Interactive menu")
             print("  python portfolio_manager.py add AAPL MSFT")
+            print("  python portfolio_manager.py add --file watchlist.txt   # or '-' for stdin")
             print("  python portfolio_manager.py remove GME")
-            print("  python portfolio_manager.py list")
+            print("  python portfolio_manager.py check                     # Flag invalid symbols")
+            print("  python portfolio_manager.py list                      # Cached data; 'update' refreshes it")
             print("  python portfolio_manager.py update")
+            print("  python portfolio_manager.py import screener_export.csv")
     else:
         # Interactive mode
         manager.interactive_menu()
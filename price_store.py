@@ -0,0 +1,210 @@
+import sqlite3
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+import pandas as pd
+import yfinance as yf
+import profiling
+from rate_limiter import YAHOO_RATE_LIMITER
+
+
+def _float(value) -> Optional[float]:
+    return None if pd.isna(value) else float(value)
+
+
+class PriceStore:
+    """Local store of daily OHLCV bars, topped up with one batched download for all stale symbols"""
+
+    def __init__(self, db_path: str = 'prices.db', ttl_minutes: float = 15, history_days: int = 30,
+                 rate_limiter=None):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_minutes * 60  # How long a symbol's latest close is trusted intraday
+        self.history_days = history_days  # Lookback for symbols seen for the first time
+        self.rate_limiter = rate_limiter or YAHOO_RATE_LIMITER
+        self.closes = {}  # symbol -> pd.Series of closes, loaded once per process
+
+        conn = self._connect()
+        with conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS prices (
+                    symbol TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    close REAL NOT NULL,
+                    open REAL,
+                    high REAL,
+                    low REAL,
+                    volume REAL,
+                    dividend REAL,
+                    PRIMARY KEY (symbol, date)
+                );
+                CREATE TABLE IF NOT EXISTS price_meta (
+                    symbol TEXT PRIMARY KEY,
+                    fetched_at REAL NOT NULL,
+                    history_start TEXT
+                );
+            """)
+            # Stores created with fewer fields gain the new ones; their history is refetched to fill them
+            self._add_columns(conn, 'price_meta', ['history_start'], 'TEXT')
+            if self._add_columns(conn, 'prices', ['open', 'high', 'low', 'volume', 'dividend'], 'REAL'):
+                conn.execute("UPDATE price_meta SET history_start = NULL")
+        conn.close()
+
+    @staticmethod
+    def _add_columns(conn, table: str, columns: List[str], kind: str) -> bool:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column in columns:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+        return any(column not in existing for column in columns)
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _last_dates(self, conn, symbols: List[str]) -> Dict[str, tuple]:
+        """Latest stored date, fetch time and start of the stored history per symbol"""
+        placeholders = ','.join('?' * len(symbols))
+        rows = conn.execute(
+            f"""SELECT m.symbol, MAX(p.date), m.fetched_at, m.history_start
+                FROM price_meta m LEFT JOIN prices p ON p.symbol = m.symbol
+                WHERE m.symbol IN ({placeholders}) GROUP BY m.symbol""", symbols).fetchall()
+        return {s: (d, f, h) for s, d, f, h in rows}
+
+    def update(self, symbols: Iterable[str], history_days: Optional[int] = None):
+        """Download missing days for every stale symbol in a single request
+
+        history_days widens the lookback for this call; symbols whose stored history starts
+        later than that are backfilled in the same download.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return
+
+        conn = self._connect()
+        known = self._last_dates(conn, symbols)
+        conn.close()
+
+        now = time.time()
+        required_start = (date.today() - timedelta(days=history_days or self.history_days)).isoformat()
+        short = {s for s in symbols if s not in known or not known[s][2] or known[s][2] > required_start}
+        stale = [s for s in symbols if s in short or now - known[s][1] > self.ttl_seconds]
+        profiling.record_cache('prices', 'hit', len(symbols) - len(stale))
+        profiling.record_cache('prices', 'miss', len(stale))
+        if not stale:
+            return
+
+        # Start from the oldest last-stored day so one download covers every stale symbol; a symbol
+        # fetched before with no bars (delisted, empty) only needs the days since that fetch
+        start = min(required_start if s in short else known[s][0] or date.fromtimestamp(known[s][1]).isoformat()
+                    for s in stale)
+
+        print(f"💹 Downloading prices for {len(stale)} symbols since {start}...")
+        self.rate_limiter.acquire()
+        try:
+            with profiling.span('yfinance.download', symbols=len(stale)):
+                data = yf.download(stale, start=start, progress=False, threads=True, auto_adjust=False, actions=True)
+        except Exception as e:
+            profiling.record_request(profiling.YFINANCE_HOST, None, failed=True)
+            print(f"⚠️  Price download failed: {e}")
+            return
+        profiling.record_request(profiling.YFINANCE_HOST, None)
+        if data is None or data.empty:
+            return
+
+        fields = {}
+        for field in ('Close', 'Open', 'High', 'Low', 'Volume', 'Dividends'):
+            if field not in data.columns.get_level_values(0):
+                fields[field] = pd.DataFrame(index=data.index, columns=stale, dtype=float)
+                continue
+            frame = data[field]
+            fields[field] = frame.to_frame(stale[0]) if isinstance(frame, pd.Series) else frame
+
+        closes = fields['Close']
+        rows = []
+        for symbol in stale:
+            if symbol not in closes.columns:
+                continue
+            bars = pd.DataFrame({f: fields[f].get(symbol) for f in fields}, index=closes.index)
+            bars = bars.dropna(subset=['Close'])
+            for day, close, open_, high, low, volume, dividend in bars.itertuples():
+                rows.append((symbol, day.strftime('%Y-%m-%d'), float(close), _float(open_), _float(high),
+                             _float(low), _float(volume), _float(dividend) or 0.0))
+
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO prices (symbol, date, close, open, high, low, volume, dividend) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            # The stored history is contiguous from the earlier of its old start and this download's start
+            conn.executemany(
+                """INSERT INTO price_meta (symbol, fetched_at, history_start) VALUES (?, ?, ?)
+                   ON CONFLICT(symbol) DO UPDATE SET
+                       fetched_at = excluded.fetched_at,
+                       history_start = MIN(COALESCE(history_start, excluded.history_start),
+                                           excluded.history_start)""",
+                [(s, now, start) for s in stale])
+        conn.close()
+        for symbol in stale:
+            self.closes.pop(symbol, None)
+
+    def get_closes(self, symbol: str) -> Optional[pd.Series]:
+        """Stored daily closes for a symbol, oldest first"""
+        if symbol not in self.closes:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT date, close FROM prices WHERE symbol = ? ORDER BY date", (symbol,)).fetchall()
+            conn.close()
+            self.closes[symbol] = (pd.Series([c for _, c in rows], index=pd.to_datetime([d for d, _ in rows]),
+                                             name=symbol) if rows else None)
+        return self.closes[symbol]
+
+    def latest_dates(self, symbols: Iterable[str]) -> Dict[str, str]:
+        """Most recent stored session per symbol (symbols without prices are left out)"""
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        placeholders = ','.join('?' * len(symbols))
+        conn = self._connect()
+        rows = conn.execute(
+            f"SELECT symbol, MAX(date) FROM prices WHERE symbol IN ({placeholders}) GROUP BY symbol",
+            symbols).fetchall()
+        conn.close()
+        return dict(rows)
+
+    def load_panel(self, symbols: Iterable[str], history_days: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+        """Sessions x symbols frames of open/high/low/close/volume/dividend, refreshing stale symbols first"""
+        symbols = list(dict.fromkeys(symbols))
+        history_days = history_days or self.history_days
+        self.update(symbols, history_days)
+
+        start = (date.today() - timedelta(days=history_days)).isoformat()
+        placeholders = ','.join('?' * len(symbols))
+        conn = self._connect()
+        bars = pd.read_sql_query(
+            f"""SELECT symbol, date, open, high, low, close, volume, dividend FROM prices
+                WHERE date >= ? AND symbol IN ({placeholders})""",
+            conn, params=[start] + symbols, parse_dates=['date'])
+        conn.close()
+
+        panel = {}
+        for field in ('open', 'high', 'low', 'close', 'volume', 'dividend'):
+            frame = bars.pivot(index='date', columns='symbol', values=field) if not bars.empty else pd.DataFrame()
+            panel[field] = frame.reindex(columns=symbols).sort_index().astype(float)
+        return panel
+
+    def returns(self, symbol: str) -> Dict[str, Optional[float]]:
+        """1-day and 5-day close-to-close returns (5-day spans the last five sessions, as history(period='5d'))"""
+        closes = self.get_closes(symbol)
+        result = {'1d': None, '5d': None}
+        if closes is None or len(closes) < 2:
+            return result
+        result['1d'] = closes.iloc[-1] / closes.iloc[-2] - 1
+        window = closes.iloc[-5:]
+        result['5d'] = window.iloc[-1] / window.iloc[0] - 1
+        return result
+
+    def returns_for(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Optional[float]]]:
+        """Refresh stale symbols with one download, then answer every lookup from the store"""
+        symbols = list(dict.fromkeys(symbols))
+        self.update(symbols)
+        return {s: self.returns(s) for s in symbols}
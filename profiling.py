@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Run instrumentation behind --profile: nested timed spans, network requests and bytes per host,
+cache hits and misses, and peak memory
+
+The trace is Chrome trace-event JSON (chrome://tracing, ui.perfetto.dev) with a summary block;
+--profile-stacks adds collapsed stacks for flamegraph.pl or speedscope. Every hook checks one
+module global first, so with profiling off a span is a function call and nothing more.
+"""
+
+import atexit
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_DIR = Path('profiles')
+
+# yfinance hides its HTTP layer, so its calls are counted under one host with unknown sizes
+YFINANCE_HOST = 'finance.yahoo.com (yfinance)'
+
+_active = None  # The running Profiler, or None when profiling is off
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident memory of the process in bytes (None where the platform doesn't report it)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class _NullSpan:
+    """Shared stand-in returned by span() while profiling is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'args', 'start', 'children')
+
+    def __init__(self, profiler, name: str, args: Optional[Dict]):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+        self.start = 0.0
+        self.children = 0.0  # Time spent in nested spans, subtracted for the flamegraph's self time
+
+    def __enter__(self):
+        self.profiler._stack().append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._close(self, time.perf_counter())
+        return False
+
+
+class Profiler:
+    """Spans and counters for one run; each thread keeps its own span stack"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.now()
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self.events = []
+        self.threads = {}  # tid -> thread name, for the trace viewer's lane labels
+        self.folded = defaultdict(float)  # 'outer;inner' -> self seconds
+        self.totals = defaultdict(lambda: [0, 0.0])  # span name -> [calls, seconds]
+        self.hosts = defaultdict(lambda: {'requests': 0, 'bytes': 0, 'unmetered': 0, 'failed': 0})
+        self.caches = defaultdict(lambda: defaultdict(int))
+        self.lock = threading.Lock()
+        self._local = threading.local()
+        self.root = _Span(self, name, None)
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def span(self, name: str, args: Optional[Dict] = None) -> _Span:
+        return _Span(self, name, args)
+
+    def _close(self, span: _Span, end: float):
+        stack = self._stack()
+        if span in stack:
+            del stack[stack.index(span):]  # Also drops inner spans left open by a generator or an error
+        elapsed = end - span.start
+        if stack:
+            stack[-1].children += elapsed
+
+        thread = threading.current_thread()
+        frames = [s.name for s in stack] + [span.name]
+        if thread is not threading.main_thread():
+            # Pool workers share one flamegraph root instead of one per numbered thread
+            frames.insert(0, re.sub(r'_\d+$', '', thread.name))
+        event = {'name': span.name, 'ph': 'X', 'ts': round((span.start - self.origin) * 1e6, 1),
+                 'dur': round(elapsed * 1e6, 1), 'pid': self.pid, 'tid': thread.ident}
+        args = dict(span.args or {})
+        rss = peak_rss()
+        if rss is not None:
+            args['peak_rss_mb'] = round(rss / 1e6, 1)
+        event['args'] = args
+
+        with self.lock:
+            self.threads.setdefault(thread.ident, thread.name)
+            self.events.append(event)
+            self.folded[';'.join(f.replace(';', ',') for f in frames)] += elapsed - span.children
+            total = self.totals[span.name]
+            total[0] += 1
+            total[1] += elapsed
+
+    def record_request(self, url: str, nbytes: Optional[int], failed: bool):
+        host = urlparse(url).netloc or url
+        with self.lock:
+            counts = self.hosts[host]
+            counts['requests'] += 1
+            if nbytes is None:
+                counts['unmetered'] += 1
+            else:
+                counts['bytes'] += nbytes
+            if failed:
+                counts['failed'] += 1
+
+    def record_cache(self, cache: str, outcome: str, count: int):
+        with self.lock:
+            self.caches[cache][outcome] += count
+
+    def summary(self) -> Dict:
+        wall = time.perf_counter() - self.origin
+        return {
+            'name': self.name,
+            'started': self.started_at.isoformat(timespec='seconds'),
+            'argv': sys.argv,
+            'wall_seconds': round(wall, 3),
+            'peak_rss_bytes': peak_rss(),
+            'spans': {name: {'calls': calls, 'seconds': round(seconds, 4)}
+                      for name, (calls, seconds) in sorted(self.totals.items(), key=lambda item: -item[1][1])},
+            'network': {host: dict(counts) for host, counts in sorted(self.hosts.items())},
+            'caches': {cache: dict(outcomes) for cache, outcomes in sorted(self.caches.items())},
+        }
+
+    def write(self, trace_path, stacks_path=None) -> Dict:
+        """Close the root span and write the trace (and collapsed stacks); returns the summary"""
+        if self.root in self._stack():
+            self._close(self.root, time.perf_counter())
+        summary = self.summary()
+        names = [{'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid, 'args': {'name': name}}
+                 for tid, name in self.threads.items()]
+
+        trace_path = Path(trace_path)
+        trace_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(trace_path, 'w') as f:
+            json.dump({'traceEvents': names + self.events, 'displayTimeUnit': 'ms', 'summary': summary}, f)
+        if stacks_path:
+            # flamegraph.pl wants integer sample counts; microseconds of self time
+            with open(stacks_path, 'w') as f:
+                for stack, seconds in sorted(self.folded.items()):
+                    if seconds * 1e6 >= 1:
+                        f.write(f"{stack} {int(seconds * 1e6)}\n")
+        return summary
+
+
+def enabled() -> bool:
+    return _active is not None
+
+
+def span(name: str, **args):
+    """Context manager timing a stage (keyword args are attached to the trace event)"""
+    profiler = _active
+    if profiler is None:
+        return _NULL_SPAN
+    return profiler.span(name, args)
+
+
+def timed(name: Optional[str] = None):
+    """Decorator recording each call of a function as a span"""
+    def decorate(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def record_request(url: str, nbytes: Optional[int] = 0, failed: bool = False):
+    """Count one network request against the URL's host (nbytes=None when the size is unknown)"""
+    profiler = _active
+    if profiler is not None:
+        profiler.record_request(url, nbytes, failed)
+
+
+def record_cache(cache: str, outcome: str, count: int = 1):
+    """Count cache lookups by outcome ('hit', 'miss', 'revalidated', ...)"""
+    profiler = _active
+    if profiler is not None and count:
+        profiler.record_cache(cache, outcome, count)
+
+
+def print_summary(summary: Dict, trace_path, stacks_path=None, top: int = 12):
+    print(f"\n⏱️  Profile of {summary['name']}: {summary['wall_seconds']:.2f}s wall", end='')
+    if summary['peak_rss_bytes']:
+        print(f", peak memory {summary['peak_rss_bytes'] / 1e6:.0f} MB", end='')
+    print()
+    for name, span_totals in list(summary['spans'].items())[:top]:
+        print(f"  {name:<36}{span_totals['calls']:>7}x{span_totals['seconds']:>10.2f}s")
+    for host, counts in summary['network'].items():
+        size = f"{counts['bytes'] / 1024:.0f} KB" if counts['requests'] > counts['unmetered'] else 'size unknown'
+        failed = f", {counts['failed']} failed" if counts['failed'] else ''
+        print(f"  🌐 {host}: {counts['requests']} requests, {size}{failed}")
+    for cache, outcomes in summary['caches'].items():
+        print(f"  💾 {cache}: " + ', '.join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items())))
+    print(f"  📄 Trace: {trace_path}" + (f" | stacks: {stacks_path}" if stacks_path else ''))
+
+
+def start(name: str, trace_path=None, stacks_path=None) -> Profiler:
+    """Turn profiling on for the rest of the process; the trace is written when it exits"""
+    global _active
+    if trace_path is None:
+        trace_path = DEFAULT_DIR / f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    profiler = Profiler(name)
+    profiler.root.__enter__()
+    _active = profiler
+
+    def finish():
+        global _active
+        _active = None
+        print_summary(profiler.write(trace_path, stacks_path), trace_path, stacks_path)
+
+    atexit.register(finish)
+    return profiler
+
+
+def add_arguments(parser):
+    """--profile / --profile-stacks options shared by the command line tools"""
+    group = parser.add_argument_group('profiling')
+    group.add_argument('--profile', nargs='?', const='', metavar='TRACE_JSON',
+                       help=f'Record stage timings, network calls, cache hits and peak memory to a JSON trace '
+                            f'(default: {DEFAULT_DIR}/<tool>_<timestamp>.json)')
+    group.add_argument('--profile-stacks', metavar='FOLDED',
+                       help='Also write collapsed stacks for flamegraph.pl / speedscope (implies --profile)')
+
+
+def start_from_args(args, name: str) -> Optional[Profiler]:
+    """Start profiling if --profile or --profile-stacks was given"""
+    if args.profile is None and not args.profile_stacks:
+        return None
+    return start(name, args.profile or None, args.profile_stacks)
@@ -0,0 +1,36 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by workers hitting the same host"""
+
+    def __init__(self, rate: float = 2.0, capacity: float = 4.0):
+        self.rate = rate  # Tokens added per second
+        self.capacity = capacity  # Maximum burst size
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens now and return how long the caller must wait before using them"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+
+            # Tokens may go negative; the debt is paid off by waiting
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until the requested tokens are available"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Shared limiter for every yfinance .info / history call in the process
+YAHOO_RATE_LIMITER = TokenBucket(rate=2.0, capacity=4.0)
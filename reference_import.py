@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Bulk import of ticker metadata from local exchange reference files
+"""
+
+import csv
+import math
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from market_mapping import SECTOR_ETF_MAP, INDUSTRY_PEERS
+
+# Header spellings used by the screener exports we keep on disk
+COLUMN_ALIASES = {
+    'ticker': ('symbol', 'ticker'),
+    'company': ('name', 'company', 'company name', 'security name'),
+    'sector': ('sector',),
+    'industry': ('industry',),
+    'market_cap': ('market cap', 'market_cap', 'marketcap'),
+    'exchange': ('exchange',),
+}
+
+# Exchange sector labels that don't match a SECTOR_ETF_MAP key by name
+SECTOR_ALIASES = {
+    'finance': 'Financial Services',
+    'financial': 'Financial Services',
+    'telecommunications': 'Communication Services',
+    'information technology': 'Technology',
+    'consumer non-durables': 'Consumer Defensive',
+    'consumer durables': 'Consumer Cyclical',
+    'capital goods': 'Industrials',
+    'public utilities': 'Utilities',
+    'health technology': 'Healthcare',
+}
+
+MARKET_CAP_SUFFIXES = {'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12}
+
+
+def normalize_label(label: str) -> str:
+    """Lower-case a sector/industry label and unify dashes and ampersands
+
+    Dashes count as word breaks, so Yahoo's 'Software - Application' and 'Banks - Regional'
+    match the mapping's 'Software Application' and 'Banks—Regional'.
+    """
+    label = label.lower().replace('—', '-').replace('–', '-').replace('&', 'and')
+    label = label.replace('-', ' ')
+    return ' '.join(label.split())
+
+
+_SECTOR_KEYS = {normalize_label(k): k for k in SECTOR_ETF_MAP}
+_SECTOR_ALIASES = {normalize_label(k): v for k, v in SECTOR_ALIASES.items()}
+_INDUSTRY_KEYS = {normalize_label(k): k for k in INDUSTRY_PEERS}
+
+
+def match_sector(label: str) -> Optional[str]:
+    """Map a reference-file sector onto a SECTOR_ETF_MAP key"""
+    norm = normalize_label(label)
+    if norm in _SECTOR_KEYS:
+        return _SECTOR_KEYS[norm]
+    return _SECTOR_ALIASES.get(norm)
+
+
+def match_industry(label: str) -> Optional[str]:
+    """Map a reference-file industry onto an INDUSTRY_PEERS key
+
+    Exact match first, then the one key containing all of the label's words ('Regional Banks').
+    A label whose words fit several keys ('Retail', 'Oil & Gas') is left unmatched.
+    """
+    norm = normalize_label(label)
+    if norm in _INDUSTRY_KEYS:
+        return _INDUSTRY_KEYS[norm]
+    words = set(norm.split())
+    if not words:
+        return None
+    matches = [key for key_norm, key in _INDUSTRY_KEYS.items() if words <= set(key_norm.split())]
+    return matches[0] if len(matches) == 1 else None
+
+
+def parse_market_cap(value: str) -> int:
+    """Parse '1234567', '$1,234', '2.5B' or '350M' into an integer (0 if unknown)"""
+    value = (value or '').strip().replace('$', '').replace(',', '')
+    if not value:
+        return 0
+    multiplier = MARKET_CAP_SUFFIXES.get(value[-1].upper())
+    if multiplier:
+        value = value[:-1]
+    try:
+        return int(float(value) * (multiplier or 1))
+    except ValueError:
+        return 0
+
+
+class ReferenceImporter:
+    """Loads a reference CSV into a StockInfoManager cache in one streaming pass"""
+
+    def __init__(self, info_manager, min_peers: int = 5):
+        self.info_manager = info_manager
+        self.min_peers = min_peers
+
+    def iter_records(self, path: str) -> Iterator[Dict]:
+        """Yield normalized records row by row without loading the whole file"""
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            headers = {h.strip().lower(): h for h in reader.fieldnames or []}
+            columns = {}
+            for field, aliases in COLUMN_ALIASES.items():
+                for alias in aliases:
+                    if alias in headers:
+                        columns[field] = headers[alias]
+                        break
+            if 'ticker' not in columns:
+                raise ValueError(f"{path} has no symbol/ticker column")
+
+            for row in reader:
+                ticker = (row.get(columns['ticker']) or '').strip().upper()
+                if not ticker:
+                    continue
+                raw = {field: (row.get(col) or '').strip() for field, col in columns.items()}
+                sector = match_sector(raw['sector']) if raw.get('sector') else None
+                industry = raw.get('industry', '')
+                yield {
+                    'ticker': ticker,
+                    'company': raw.get('company', ''),
+                    'sector': sector,
+                    'industry': (match_industry(industry) or industry) if industry else None,
+                    'market_cap': parse_market_cap(raw.get('market_cap', '')),
+                    'exchange': raw.get('exchange') or 'Unknown',
+                }
+
+    def _local_peers(self, ticker: str, record: Dict, by_industry: Dict[str, List]) -> List[str]:
+        """Pick peers from the same industry in the file, closest in market cap first"""
+        own_cap = math.log10(record['market_cap']) if record['market_cap'] > 0 else None
+        candidates = [(cap, t) for cap, t in by_industry.get(record['industry'], []) if t != ticker]
+        if own_cap is not None:
+            candidates.sort(key=lambda c: abs(math.log10(c[0]) - own_cap) if c[0] > 0 else float('inf'))
+        else:
+            candidates.sort(key=lambda c: -c[0])
+        peers = [t for _, t in candidates[:self.min_peers]]
+
+        # Top up from the static mappings, skipping symbols already known to be invalid
+        if len(peers) < self.min_peers:
+            for peer in self.info_manager._peer_candidates(ticker, record['industry'], record['sector']):
+                if peer not in peers and self.info_manager.symbol_cache.lookup(peer) is not False:
+                    peers.append(peer)
+                if len(peers) >= self.min_peers:
+                    break
+        return peers
+
+    def _conflicts(self, cached: Optional[Dict], record: Dict) -> bool:
+        """True if the cache already classifies this ticker differently"""
+        if not cached:
+            return False
+        for field in ('sector', 'industry'):
+            old = cached.get(field)
+            if old and old != 'Unknown' and normalize_label(old) != normalize_label(record[field]):
+                return True
+        return False
+
+    def import_file(self, path: str, fallback: bool = True) -> Dict:
+        """Import a reference file; missing or conflicting records are resolved via yfinance"""
+        print(f"📥 Importing reference data from {path}...")
+
+        records = {}
+        by_industry = defaultdict(list)
+        needs_fallback = []
+        for record in self.iter_records(path):
+            ticker = record.pop('ticker')
+            if not record['company'] or not record['sector'] or not record['industry']:
+                needs_fallback.append(ticker)
+                continue
+            if self._conflicts(self.info_manager.stock_info.get(ticker), record):
+                needs_fallback.append(ticker)
+                continue
+            records[ticker] = record
+            by_industry[record['industry']].append((record['market_cap'], ticker))
+
+        now = datetime.now().isoformat()
+        entries = {}
+        for ticker, record in records.items():
+            entries[ticker] = {
+                **record,
+                'peers': self._local_peers(ticker, record, by_industry),
+                'sector_etf': self.info_manager.get_sector_etf(record['sector']),
+                'last_updated': now,
+                'field_updated': {field: now for field in self.info_manager.field_ttls},
+            }
+
+        # One batched write for the whole file
+        if entries:
+            self.info_manager.stock_info.update(entries)
+            self.info_manager.save_cache(list(entries))
+        print(f"✅ Imported {len(entries)} tickers from {path}")
+
+        needs_fallback = list(dict.fromkeys(needs_fallback))
+        if needs_fallback and fallback:
+            print(f"🔄 Resolving {len(needs_fallback)} incomplete or conflicting records via yfinance...")
+            self.info_manager.update_portfolio(needs_fallback, force_update=True)
+
+        return {'imported': len(entries), 'fallback': needs_fallback}
+
+
+def main():
+    """Command line entry point"""
+    import argparse
+    from stock_info_manager import StockInfoManager
+
+    parser = argparse.ArgumentParser(description='Bulk import ticker metadata from reference CSVs')
+    parser.add_argument('files', nargs='+', help='Reference CSV files (symbol, name, sector, industry, market cap)')
+    parser.add_argument('--no-fallback', action='store_true',
+                        help='Skip yfinance lookups for missing or conflicting records')
+    args = parser.parse_args()
+
+    importer = ReferenceImporter(StockInfoManager())
+    for path in args.files:
+        importer.import_file(path, fallback=not args.no_fallback)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Render stock context reports (CSV, HTML, PDF) from stored run checkpoints, without scraping
+"""
+
+import csv
+import html
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+FORMATS = ('csv', 'pdf', 'html')
+
+COLUMNS = ['ticker', 'positive', 'neutral', 'negative', 'industry', 'industry_sentiment',
+           'sector', 'sector_sentiment']
+HEADERS = ['Ticker', 'Positive', 'Neutral', 'Negative', 'Industry', 'Industry\nSentiment',
+           'Sector', 'Sector\nSentiment']
+
+# Sentiment columns in the table and the threshold that colours them
+SENTIMENT_COLUMNS = (5, 7)
+SENTIMENT_THRESHOLD = 0.1
+
+
+def sentiment_class(value: float) -> Optional[str]:
+    """'positive'/'negative' beyond the threshold, else None"""
+    if value > SENTIMENT_THRESHOLD:
+        return 'positive'
+    if value < -SENTIMENT_THRESHOLD:
+        return 'negative'
+    return None
+
+
+@lru_cache(maxsize=None)
+def pdf_styles() -> Dict:
+    """Paragraph styles and base table commands, built once per process"""
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    styles = getSampleStyleSheet()
+    return {
+        'title': ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=20,
+                                textColor=colors.HexColor('#1f77b4'), spaceAfter=10, alignment=TA_CENTER),
+        'freshness': ParagraphStyle('FreshnessStyle', parent=styles['Normal'], fontSize=8,
+                                    alignment=TA_CENTER, spaceAfter=15, textColor=colors.grey),
+        'table': (
+            # Header
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+
+            # Data
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')]),
+        ),
+        'colors': {'positive': colors.green, 'negative': colors.red},
+    }
+
+
+def colour_commands(results: List[Dict]) -> List[tuple]:
+    """TEXTCOLOR commands for the sentiment columns, one per run of consecutive same-coloured rows"""
+    palette = pdf_styles()['colors']
+    commands = []
+    for col in SENTIMENT_COLUMNS:
+        key = COLUMNS[col]
+        run_start, run_class = None, None
+        for row, result in enumerate(results + [None], 1):
+            cls = sentiment_class(result[key]) if result else None
+            if cls != run_class:
+                if run_class:
+                    commands.append(('TEXTCOLOR', (col, run_start), (col, row - 1), palette[run_class]))
+                run_start, run_class = row, cls
+    return commands
+
+
+def table_rows(results: List[Dict]) -> List[List[str]]:
+    return [[r['ticker'], str(r['positive']), str(r['neutral']), str(r['negative']), r['industry'],
+             f"{r['industry_sentiment']:+.2f}", r['sector'], f"{r['sector_sentiment']:+.2f}"]
+            for r in results]
+
+
+def render_csv(results: List[Dict], filename: str, generated: Optional[datetime] = None) -> str:
+    """Write results as CSV, one row per ticker"""
+    fieldnames = list(dict.fromkeys(COLUMNS + [k for r in results for k in r]))
+    with open(filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(results)
+    return filename
+
+
+def render_html(results: List[Dict], filename: str, generated: Optional[datetime] = None) -> str:
+    """Write results as a standalone HTML table"""
+    generated = generated or datetime.now()
+    rows = []
+    for result, cells in zip(results, table_rows(results)):
+        classes = {col: sentiment_class(result[COLUMNS[col]]) for col in SENTIMENT_COLUMNS}
+        rows.append('<tr>' + ''.join(
+            f'<td class="{classes[i]}">{html.escape(c)}</td>' if classes.get(i) else f'<td>{html.escape(c)}</td>'
+            for i, c in enumerate(cells)) + '</tr>')
+    header = ''.join(f'<th>{html.escape(h).replace(chr(10), "<br>")}</th>' for h in HEADERS)
+    Path(filename).write_text(f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Stock Portfolio Context Analysis</title>
+<style>
+body {{ font-family: Helvetica, Arial, sans-serif; margin: 2em; }}
+h1 {{ color: #1f77b4; text-align: center; }}
+p {{ color: grey; text-align: center; font-size: 0.8em; }}
+table {{ border-collapse: collapse; margin: auto; }}
+th {{ background: #1f77b4; color: whitesmoke; position: sticky; top: 0; }}
+th, td {{ border: 1px solid black; padding: 4px 10px; text-align: center; }}
+tr:nth-child(even) td {{ background: #f0f0f0; }}
+.positive {{ color: green; }}
+.negative {{ color: red; }}
+</style></head><body>
+<h1>Stock Portfolio Context Analysis</h1>
+<p>Generated {generated.strftime('%Y-%m-%d %H:%M')} | {len(results)} tickers</p>
+<table><thead><tr>{header}</tr></thead><tbody>
+{chr(10).join(rows)}
+</tbody></table></body></html>
+""", encoding='utf-8')
+    return filename
+
+
+def render_pdf(results: List[Dict], filename: str, generated: Optional[datetime] = None) -> str:
+    """Write a landscape PDF whose table flows over as many pages as needed, header repeated on each"""
+    from reportlab.lib.pagesizes import letter, landscape
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+
+    styles = pdf_styles()
+    generated = generated or datetime.now()
+    doc = SimpleDocTemplate(str(filename), pagesize=landscape(letter))
+    story = [
+        Paragraph("Stock Portfolio Context Analysis", styles['title']),
+        Paragraph(f"News data: Live from web | ETF prices: As of last market close | "
+                  f"Generated: {generated.strftime('%A %Y-%m-%d %H:%M')}", styles['freshness']),
+    ]
+
+    table = Table([HEADERS] + table_rows(results), repeatRows=1,
+                  colWidths=[1*inch, 0.8*inch, 0.8*inch, 0.8*inch, 2*inch, 1*inch, 2*inch, 1*inch])
+    table.setStyle(TableStyle(list(styles['table']) + colour_commands(results)))
+    story.append(table)
+
+    doc.build(story)
+    return filename
+
+
+RENDERERS = {'csv': render_csv, 'pdf': render_pdf, 'html': render_html}
+
+
+def output_names(stamp: str, output_dir: str = '.') -> Dict[str, Path]:
+    """Report filenames for a run, matching the scraper's historical naming"""
+    return {
+        'csv': Path(output_dir) / f"stock_context_analysis_{stamp}.csv",
+        'pdf': Path(output_dir) / f"stock_context_report_{stamp}.pdf",
+        'html': Path(output_dir) / f"stock_context_report_{stamp}.html",
+    }
+
+
+def render_results(results: List[Dict], formats: Iterable[str] = ('csv', 'pdf'), output_dir: str = '.',
+                   stamp: Optional[str] = None, generated: Optional[datetime] = None) -> Dict[str, str]:
+    """Render results into each requested format; returns {format: filename}"""
+    generated = generated or datetime.now()
+    names = output_names(stamp or generated.strftime('%Y%m%d_%H%M%S'), output_dir)
+    files = {}
+    for fmt in formats:
+        files[fmt] = RENDERERS[fmt](results, str(names[fmt]), generated)
+    return files
+
+
+def render_run(checkpoint_path: str, formats: Iterable[str] = ('csv', 'pdf'), output_dir: str = '.') -> Dict[str, str]:
+    """Render one stored run; files are named after the run, so re-rendering overwrites them"""
+    from run_checkpoint import RunCheckpoint
+
+    checkpoint = RunCheckpoint(checkpoint_path)
+    results = checkpoint.results()
+    if not results:
+        return {}
+    started = checkpoint.header().get('started')
+    generated = datetime.fromisoformat(started) if started else None
+    stamp = Path(checkpoint_path).stem.replace('run_', '', 1)
+    return render_results(results, formats, output_dir, stamp, generated)
+
+
+def render_runs(checkpoint_paths: List[str], formats: Iterable[str] = ('csv', 'pdf'), output_dir: str = '.',
+                workers: Optional[int] = None) -> Dict[str, Dict[str, str]]:
+    """Render several stored runs in parallel processes (ReportLab layout is CPU-bound)"""
+    formats = tuple(formats)
+    if len(checkpoint_paths) <= 1 or workers == 1:
+        return {str(p): render_run(str(p), formats, output_dir) for p in checkpoint_paths}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {str(p): pool.submit(render_run, str(p), formats, output_dir) for p in checkpoint_paths}
+        return {p: f.result() for p, f in futures.items()}
+
+
+def _synthetic_results(rows: int) -> List[Dict]:
+    import random
+
+    rng = random.Random(0)
+    sectors = ['Technology', 'Healthcare', 'Financial Services', 'Energy', 'Industrials']
+    return [{
+        'ticker': f"T{n:04d}",
+        'positive': rng.randint(0, 10), 'neutral': rng.randint(0, 10), 'negative': rng.randint(0, 10),
+        'industry': f"Industry {n % 40}",
+        'industry_sentiment': round(rng.uniform(-0.6, 0.6), 2),
+        'sector': sectors[n % len(sectors)],
+        'sector_sentiment': round(rng.uniform(-0.6, 0.6), 2),
+    } for n in range(rows)]
+
+
+def benchmark(rows: int = 500, output_dir: str = '.'):
+    """Time each renderer on a synthetic portfolio"""
+    results = _synthetic_results(rows)
+    names = output_names('benchmark', output_dir)
+    for fmt in FORMATS:
+        start = time.perf_counter()
+        render_results(results, [fmt], output_dir, 'benchmark')
+        print(f"  {fmt:<5} {(time.perf_counter() - start) * 1000:>8.1f} ms  ({rows} rows) -> {names[fmt]}")
+
+
+def main():
+    """Command line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Render stock context reports from stored runs')
+    parser.add_argument('checkpoints', nargs='*', help='Run checkpoints (default: the latest in runs/)')
+    parser.add_argument('--all', action='store_true', help='Render every run in runs/')
+    parser.add_argument('--formats', nargs='+', default=['csv', 'pdf'], choices=FORMATS,
+                        help='Output formats (default: csv pdf)')
+    parser.add_argument('--output-dir', default='.', help='Directory for the reports (default: .)')
+    parser.add_argument('--workers', type=int, help='Parallel render processes (default: CPU count)')
+    parser.add_argument('--benchmark', type=int, metavar='ROWS', help='Time rendering a synthetic portfolio')
+    args = parser.parse_args()
+
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    if args.benchmark:
+        print(f"⏱️  Rendering {args.benchmark} synthetic rows...")
+        benchmark(args.benchmark, args.output_dir)
+        return
+
+    paths = args.checkpoints
+    if args.all:
+        paths = sorted(str(p) for p in Path('runs').glob('run_*.jsonl'))
+    elif paths:
+        missing = [p for p in paths if not Path(p).is_file()]
+        for path in missing:
+            print(f"❌ No checkpoint at {path}")
+        paths = [p for p in paths if p not in missing]
+        if not paths:
+            return
+    else:
+        from run_checkpoint import RunCheckpoint
+        latest = RunCheckpoint.latest()
+        paths = [str(latest.path)] if latest else []
+    if not paths:
+        print("❌ No checkpoints found in runs/")
+        return
+
+    print(f"🖨️  Rendering {len(paths)} run(s) as {', '.join(args.formats)}...")
+    for path, files in render_runs(paths, args.formats, args.output_dir, args.workers).items():
+        if not files:
+            print(f"  ⚠️  {path}: no finished tickers")
+        for filename in files.values():
+            print(f"  📁 {filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class RunCheckpoint:
+    """Append-only JSONL record of a scraper run: one header line, then one line per finished ticker"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    @classmethod
+    def create(cls, portfolio: List[str], directory: str = 'runs') -> 'RunCheckpoint':
+        """Start a new checkpoint file for a run over the given portfolio"""
+        Path(directory).mkdir(exist_ok=True)
+        started = datetime.now()
+        checkpoint = cls(Path(directory) / f"run_{started.strftime('%Y%m%d_%H%M%S')}.jsonl")
+        checkpoint._append({'type': 'run', 'started': started.isoformat(), 'portfolio': list(portfolio)})
+        return checkpoint
+
+    @classmethod
+    def existing(cls, path: str) -> Optional['RunCheckpoint']:
+        """Checkpoint at a user-supplied path, or None (with a message) if there is no such file"""
+        if not Path(path).is_file():
+            print(f"❌ No checkpoint at {path}")
+            return None
+        return cls(path)
+
+    @classmethod
+    def latest(cls, directory: str = 'runs') -> Optional['RunCheckpoint']:
+        """Most recent checkpoint in the directory, if any"""
+        runs = sorted(Path(directory).glob('run_*.jsonl')) if Path(directory).is_dir() else []
+        return cls(runs[-1]) if runs else None
+
+    def _append(self, record: Dict):
+        # One line per write, flushed to disk so an interrupted run keeps everything before it
+        with open(self.path, 'a+b') as f:
+            # Start on a fresh line if a previous run was killed mid-write
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+            f.write((json.dumps(record) + '\n').encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _records(self) -> List[Dict]:
+        records = []
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # Torn line from a kill mid-write
+        return records
+
+    def header(self) -> Dict:
+        records = self._records()
+        return records[0] if records and records[0].get('type') == 'run' else {}
+
+    def add_result(self, result: Dict):
+        """Record one finished ticker"""
+        self._append({'type': 'result', 'finished': datetime.now().isoformat(), **result})
+
+    def results(self) -> List[Dict]:
+        """Finished results in portfolio order, latest record winning for repeated tickers"""
+        by_ticker = {}
+        for record in self._records():
+            if record.get('type') == 'result':
+                record = {k: v for k, v in record.items() if k not in ('type', 'finished')}
+                by_ticker[record['ticker']] = record
+        order = self.header().get('portfolio', [])
+        ordered = [by_ticker.pop(t) for t in order if t in by_ticker]
+        return ordered + list(by_ticker.values())
+
+    def completed(self) -> set:
+        """Tickers already finished in this run"""
+        return {r['ticker'] for r in self.results()}
+
+    def is_complete(self) -> bool:
+        return set(self.header().get('portfolio', [])) <= self.completed()
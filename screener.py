@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Breakout screener: the Query_Logic.txt rules as composable filters over a tickers x sessions price panel
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+import pandas as pd
+import indicators as ind
+from market_mapping import INDUSTRY_PEERS
+from price_store import PriceStore
+
+
+class IndicatorPanel:
+    """OHLCV frames (sessions x tickers) with indicators computed on first use and shared between rules"""
+
+    INDICATORS: Dict[str, Callable] = {
+        'ema10': lambda p: ind.ema(p['close'], 10),
+        'ema20': lambda p: ind.ema(p['close'], 20),
+        'ema50': lambda p: ind.ema(p['close'], 50),
+        'atr14': lambda p: ind.atr(p['high'], p['low'], p['close'], 14),
+        'atr14_sma14': lambda p: ind.sma(p['atr14'], 14),
+        'perf_5d': lambda p: ind.performance(p['close'], 5),
+        'rsi14': lambda p: ind.rsi(p['close'], 14),
+        'macd': lambda p: ind.macd(p['close'])[0],
+        'rel_volume': lambda p: ind.relative_volume(p['volume'], 30),
+        'vwap': lambda p: ind.vwap(p['high'], p['low'], p['close'], p['volume']),
+        'vwma20': lambda p: ind.vwma(p['close'], p['volume'], 20),
+    }
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]):
+        self.frames = dict(frames)
+
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        if name not in self.frames:
+            self.frames[name] = self.INDICATORS[name](self)
+        return self.frames[name]
+
+    @property
+    def sessions(self) -> pd.DatetimeIndex:
+        return self.frames['close'].index
+
+    @property
+    def tickers(self) -> List[str]:
+        return list(self.frames['close'].columns)
+
+
+class Rule:
+    """Named boolean test over an IndicatorPanel; combine rules with &, | and ~"""
+
+    def __init__(self, name: str, test: Callable[[IndicatorPanel], pd.DataFrame], description: str = ''):
+        self.name = name
+        self.test = test
+        self.description = description
+
+    def __call__(self, panel: IndicatorPanel) -> pd.DataFrame:
+        """Sessions x tickers frame of booleans (False wherever an indicator is still warming up)"""
+        return self.test(panel).fillna(False).astype(bool)
+
+    def __and__(self, other: 'Rule') -> 'Rule':
+        return Rule(f"{self.name} & {other.name}", lambda p: self(p) & other(p))
+
+    def __or__(self, other: 'Rule') -> 'Rule':
+        return Rule(f"({self.name} | {other.name})", lambda p: self(p) | other(p))
+
+    def __invert__(self) -> 'Rule':
+        return Rule(f"~{self.name}", lambda p: ~self(p))
+
+    def __repr__(self):
+        return f"Rule({self.name})"
+
+
+RULES = {rule.name: rule for rule in [
+    Rule('stacked_emas', lambda p: (p['ema10'] > p['ema20']) & (p['ema20'] > p['ema50']),
+         'EMA10 > EMA20 > EMA50'),
+    Rule('below_ema50', lambda p: p['close'] < p['ema50'], 'Price < EMA50'),
+    Rule('above_ema50', lambda p: p['close'] > p['ema50'], 'Price > EMA50'),
+    Rule('atr_squeeze', lambda p: p['atr14'] < p['atr14_sma14'], 'ATR(14) < SMA(ATR(14), 14)'),
+    Rule('range_contraction', lambda p: p['perf_5d'].abs() <= 0.01, 'Perf. 5D between -1% and 1%'),
+    Rule('rsi_midband', lambda p: (p['rsi14'] > 40) & (p['rsi14'] < 60), '40 < RSI(14) < 60'),
+    Rule('macd_rising', lambda p: (p['macd'] < 0) & (p['macd'] > p['macd'].shift(1)), 'MACD < 0 and rising'),
+    Rule('quiet_volume', lambda p: p['rel_volume'] < 1, 'Relative volume (30 sessions) < 1'),
+    Rule('above_vwap', lambda p: p['close'] > p['vwap'], 'Price > VWAP'),
+    Rule('above_vwma20', lambda p: p['close'] > p['vwma20'], 'Price > VWMA(20)'),
+]}
+
+BREAKOUT_SCREEN = (RULES['stacked_emas'] & RULES['above_ema50'] & RULES['atr_squeeze'] &
+                   RULES['range_contraction'] & RULES['rsi_midband'] & RULES['macd_rising'] &
+                   RULES['quiet_volume'] & RULES['above_vwap'])
+
+REPORT_COLUMNS = ['close', 'ema10', 'ema20', 'ema50', 'atr14', 'perf_5d', 'rsi14', 'macd', 'rel_volume',
+                  'vwap', 'vwma20']
+
+
+def parse_rule(expression: str) -> Rule:
+    """Build a rule from an expression over RULES names, e.g. "stacked_emas & ~below_ema50" """
+    code = compile(expression, '<screen>', 'eval')
+    unknown = [name for name in code.co_names if name not in RULES]
+    if unknown:
+        raise ValueError(f"Unknown rule(s): {', '.join(unknown)}")
+    rule = eval(code, {'__builtins__': {}}, dict(RULES))
+    if not isinstance(rule, Rule):
+        raise ValueError(f"Not a rule expression: {expression}")
+    return rule
+
+
+def universe(industries: Optional[Iterable[str]] = None) -> List[str]:
+    """Unique tickers of the given industries (all of INDUSTRY_PEERS by default)"""
+    names = list(industries) if industries else list(INDUSTRY_PEERS)
+    return list(dict.fromkeys(t for name in names for t in INDUSTRY_PEERS.get(name, [])))
+
+
+class Screener:
+    """Loads one panel for a whole universe and evaluates rules on it"""
+
+    def __init__(self, price_store=None, history_days: int = 250):
+        self.price_store = price_store or PriceStore()
+        self.history_days = history_days  # Calendar days loaded; EMA50 needs a few months to settle
+
+    def load(self, tickers: Iterable[str]) -> IndicatorPanel:
+        frames = self.price_store.load_panel(tickers, self.history_days)
+        sessions = frames['close'].dropna(how='all').index
+        return IndicatorPanel({f: frame.reindex(sessions) for f, frame in frames.items()})
+
+    @staticmethod
+    def matches(panel: IndicatorPanel, rule: Rule, session: int = -1) -> pd.DataFrame:
+        """Tickers passing the rule on one session, with the indicators behind the screen"""
+        passed = rule(panel).iloc[session]
+        tickers = passed[passed].index
+        day = panel.sessions[session]
+        return pd.DataFrame({column: panel[column].loc[day, tickers] for column in REPORT_COLUMNS},
+                            index=tickers)
+
+    def screen(self, rule: Rule = BREAKOUT_SCREEN, tickers: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Latest-session matches for the rule across the universe"""
+        panel = self.load(tickers or universe())
+        if panel['close'].empty:
+            return pd.DataFrame(columns=REPORT_COLUMNS)
+        return self.matches(panel, rule)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Screen the industry universe with the Query_Logic.txt rules')
+    parser.add_argument('tickers', nargs='*', help='Tickers to screen (default: every INDUSTRY_PEERS ticker)')
+    parser.add_argument('--industry', action='append', help='Limit the universe to an industry (repeatable)')
+    parser.add_argument('--expr', help='Rule expression, e.g. "stacked_emas & atr_squeeze & ~below_ema50" '
+                                       '(default: the breakout screen)')
+    parser.add_argument('--with-vwma', action='store_true', help='Also require Price > VWMA(20)')
+    parser.add_argument('--days', type=int, default=250, help='Calendar days of history to load (default: 250)')
+    parser.add_argument('--list-rules', action='store_true', help='Show the available rules and exit')
+    args = parser.parse_args()
+
+    if args.list_rules:
+        for name, rule in RULES.items():
+            print(f"  {name:<20} {rule.description}")
+        return
+
+    try:
+        rule = parse_rule(args.expr) if args.expr else BREAKOUT_SCREEN
+    except (SyntaxError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+    if args.with_vwma:
+        rule = rule & RULES['above_vwma20']
+
+    tickers = [t.upper() for t in args.tickers] or universe(args.industry)
+    if not tickers:
+        print("❌ No tickers to screen")
+        return
+
+    screener = Screener(history_days=args.days)
+    panel = screener.load(tickers)
+    if panel['close'].empty:
+        print("❌ No price data")
+        return
+
+    started = time.perf_counter()
+    results = screener.matches(panel, rule)
+    elapsed = time.perf_counter() - started
+
+    print(f"🔎 {rule.name}")
+    print(f"   {len(panel.tickers)} tickers x {len(panel.sessions)} sessions, "
+          f"screened in {elapsed * 1000:.0f} ms (as of {panel.sessions[-1]:%Y-%m-%d})")
+    if results.empty:
+        print("No matches")
+        return
+    print(f"\n✅ {len(results)} matches:")
+    print(results.round(2).to_string())
+
+
+if __name__ == "__main__":
+    main()
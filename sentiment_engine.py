@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Batch sentiment scoring with a fast compiled-lexicon backend and a TextBlob compatibility backend
+"""
+
+import importlib.util
+import re
+import time
+import xml.etree.ElementTree as ElementTree
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Sequence
+import numpy as np
+
+# Same negation words and modifier rule TextBlob's PatternAnalyzer uses
+NEGATIONS = frozenset(('no', 'not', "n't", 'never'))
+
+# Words (keeping inner hyphens/dots) and single punctuation marks, as TextBlob's tokenizer splits them
+TOKEN_RE = re.compile(r"\w+(?:[-.]\w+)*|[^\w\s]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word/punctuation tokens approximating TextBlob's tokenizer"""
+    return TOKEN_RE.findall(text.lower())
+
+
+def find_textblob_lexicon() -> Optional[Path]:
+    """Locate en-sentiment.xml inside the installed textblob package without importing it"""
+    spec = importlib.util.find_spec('textblob')
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    path = Path(list(spec.submodule_search_locations)[0]) / 'en' / 'en-sentiment.xml'
+    return path if path.exists() else None
+
+
+class CompiledLexicon:
+    """Sentiment lexicon flattened into id-indexed numpy arrays"""
+
+    def __init__(self, path: Path):
+        senses = {}
+        for node in ElementTree.parse(path).getroot().findall('word'):
+            form = node.attrib.get('form')
+            if not form:
+                continue
+            psi = (float(node.attrib.get('polarity', 0.0)),
+                   float(node.attrib.get('intensity', 1.0)))
+            senses.setdefault(form, {}).setdefault(node.attrib.get('pos'), []).append(psi)
+
+        # Average senses per part of speech, then across parts of speech (TextBlob's pos=None entry)
+        entries = {}
+        for form, by_pos in senses.items():
+            per_pos = {pos: tuple(np.mean(values, axis=0)) for pos, values in by_pos.items()}
+            entries[form] = (tuple(np.mean(list(per_pos.values()), axis=0)), 'RB' in per_pos, per_pos.get('JJ'))
+
+        # TextBlob also derives adverbs from adjectives ("terrible" -> "terribly"), overriding the XML
+        for form, (_, _, adjective) in list(entries.items()):
+            if adjective is None:
+                continue
+            if form.endswith('y'):
+                form = form[:-1] + 'i'
+            if form.endswith('le'):
+                form = form[:-2]
+            entries[form + 'ly'] = (adjective, True, entries.get(form + 'ly', (None, None, None))[2])
+
+        self.vocab = {}
+        polarity, intensity, modifier = [], [], []
+        for form, ((p, i), is_adverb, _) in entries.items():
+            self.vocab[form] = len(polarity)
+            polarity.append(p)
+            intensity.append(i)
+            modifier.append(is_adverb)  # Adverbs modify the next known word
+
+        self.polarity = np.array(polarity, dtype=np.float64)
+        self.intensity = np.array(intensity, dtype=np.float64)
+        self.is_modifier = np.array(modifier, dtype=bool)
+
+        # Any text containing one of these needs the sequential modifier/negation rules
+        self.special_words = frozenset(
+            [w for w, idx in self.vocab.items() if self.is_modifier[idx]]) | NEGATIONS | {'!'}
+
+
+@lru_cache(maxsize=None)
+def load_lexicon(path: Optional[str] = None) -> CompiledLexicon:
+    """Compile the lexicon once per process"""
+    path = Path(path) if path else find_textblob_lexicon()
+    if path is None:
+        raise FileNotFoundError("TextBlob's en-sentiment.xml was not found; pass a lexicon path")
+    return CompiledLexicon(path)
+
+
+class LexiconBackend:
+    """Vectorized lexicon scorer reproducing TextBlob's PatternAnalyzer polarity"""
+
+    name = 'lexicon'
+
+    def __init__(self, lexicon_path: Optional[str] = None):
+        self.lexicon = load_lexicon(lexicon_path)
+
+    def _score_sequential(self, tokens: List[str]) -> float:
+        """Port of PatternAnalyzer's assessment rules for texts with modifiers, negations or '!'"""
+        lex = self.lexicon
+        assessments = []  # [polarity, intensity, negated]
+        modifier = None
+        negation = None
+        for word in tokens:
+            idx = lex.vocab.get(word)
+            if idx is not None:
+                p, i = lex.polarity[idx], lex.intensity[idx]
+                if modifier is None:
+                    assessments.append([p, i, False])
+                else:
+                    # "really good": scale by the modifier's intensity
+                    prev = assessments[-1]
+                    prev[0] = max(-1.0, min(p * prev[1], 1.0))
+                    prev[1] = i
+                if negation is not None:
+                    assessments[-1][1] = 1.0 / assessments[-1][1] if assessments[-1][1] else 1.0
+                    assessments[-1][2] = True
+                modifier = word if lex.is_modifier[idx] else None
+                negation = word if word in NEGATIONS else None
+            else:
+                if word in NEGATIONS:
+                    negation = word
+                elif negation and len(word.strip("'")) > 1:
+                    negation = None
+                if negation is not None and modifier is not None and modifier.endswith('ly'):
+                    # "really not good"
+                    assessments[-1][2] = True
+                    negation = None
+                elif modifier and len(word) > 2:
+                    modifier = None
+                if word == '!' and assessments:
+                    assessments[-1][0] = max(-1.0, min(assessments[-1][0] * 1.25, 1.0))
+
+        if not assessments:
+            return 0.0
+        # "not good" is slightly bad, "not bad" slightly good
+        return sum(p * -0.5 if negated else p for p, _, negated in assessments) / len(assessments)
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        """Polarity for every text in the batch"""
+        lex = self.lexicon
+        scores = np.zeros(len(texts), dtype=np.float64)
+
+        # Plain texts (no modifiers/negations/'!') are just the mean polarity of known words,
+        # so gather them into one flat id array and reduce with bincount
+        flat_ids, owners = [], []
+        vocab_get = lex.vocab.get
+        for n, text in enumerate(texts):
+            tokens = tokenize(text)
+            if lex.special_words.isdisjoint(tokens):
+                ids = [idx for idx in map(vocab_get, tokens) if idx is not None]
+                flat_ids.extend(ids)
+                owners.extend([n] * len(ids))
+            else:
+                scores[n] = self._score_sequential(tokens)
+
+        if flat_ids:
+            owners = np.asarray(owners, dtype=np.int64)
+            totals = np.bincount(owners, weights=lex.polarity[np.asarray(flat_ids)], minlength=len(texts))
+            counts = np.bincount(owners, minlength=len(texts))
+            plain = counts > 0
+            scores[plain] = totals[plain] / counts[plain]
+        return scores
+
+
+class TextBlobBackend:
+    """Reference backend: one TextBlob per text"""
+
+    name = 'textblob'
+
+    def __init__(self):
+        from textblob import TextBlob
+        self.TextBlob = TextBlob
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        scores = np.zeros(len(texts), dtype=np.float64)
+        for n, text in enumerate(texts):
+            try:
+                scores[n] = self.TextBlob(text).sentiment.polarity
+            except Exception:
+                scores[n] = 0.0
+        return scores
+
+
+BACKENDS = {'lexicon': LexiconBackend, 'textblob': TextBlobBackend}
+
+
+def get_backend(name: str = 'lexicon'):
+    """Create a scoring backend, falling back to TextBlob if the lexicon can't be loaded"""
+    if name == 'lexicon':
+        try:
+            return LexiconBackend()
+        except FileNotFoundError as e:
+            print(f"⚠️  {e}; using TextBlob backend")
+            return TextBlobBackend()
+    return BACKENDS[name]()
+
+
+def score_batch(texts: Sequence[str], backend: str = 'lexicon') -> np.ndarray:
+    """Score a batch of texts in one call"""
+    return get_backend(backend).score(texts)
+
+
+def benchmark(texts: Sequence[str], repeat: int = 3):
+    """Compare throughput and agreement of the two backends"""
+    results = {}
+    for name, cls in BACKENDS.items():
+        backend = cls()
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            scores = backend.score(texts)
+            best = min(best, time.perf_counter() - start)
+        results[name] = scores
+        print(f"  {name:<9} {len(texts) / best:>12,.0f} texts/sec  ({best * 1000:.1f} ms for {len(texts):,})")
+
+    diff = np.abs(results['lexicon'] - results['textblob'])
+    print(f"  Agreement: max |diff| {diff.max():.4f}, mean |diff| {diff.mean():.5f}, "
+          f"{(diff < 0.01).mean() * 100:.1f}% within 0.01")
+    return results
+
+
+def _benchmark_corpus(size: int) -> List[str]:
+    """Headlines from the article store if available, padded with synthetic ones"""
+    texts = []
+    if Path('articles.db').exists():
+        import sqlite3
+        conn = sqlite3.connect('articles.db')
+        texts = [t + ' ' + (s or '') for t, s in conn.execute("SELECT title, summary FROM articles LIMIT ?", (size,))]
+        conn.close()
+    samples = [
+        "Intel shares surge after strong earnings beat expectations",
+        "Semiconductor stocks fall sharply as demand worries grow",
+        "Analysts say the outlook is not bad despite weak guidance",
+        "GameStop rallies again! Retail traders pile in",
+        "Regional banks face very difficult quarter amid rising defaults",
+        "Tech sector steady as investors await Fed decision",
+    ]
+    while len(texts) < size:
+        texts.append(samples[len(texts) % len(samples)])
+    return texts[:size]
+
+
+def main():
+    """Command line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Batch sentiment scoring engine')
+    parser.add_argument('--benchmark', action='store_true', help='Compare lexicon and TextBlob backends')
+    parser.add_argument('--size', type=int, default=20000, help='Benchmark batch size (default: 20000)')
+    parser.add_argument('texts', nargs='*', help='Texts to score')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(f"⏱️  Benchmarking sentiment backends on {args.size:,} texts...")
+        benchmark(_benchmark_corpus(args.size))
+    else:
+        for text, score in zip(args.texts, score_batch(args.texts)):
+            print(f"{score:+.3f}  {text}")
+
+
+if __name__ == "__main__":
+    main()
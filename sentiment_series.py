@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Daily news-sentiment series per ticker, industry and sector, aggregated incrementally from the article store
+"""
+
+import sqlite3
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+
+
+class SentimentSeries:
+    """Per-day polarity sums and article counts, kept next to the articles they summarize"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sentiment_daily (
+            subject_type TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            date TEXT NOT NULL,
+            polarity_sum REAL NOT NULL,
+            articles INTEGER NOT NULL,
+            PRIMARY KEY (subject_type, subject, date)
+        );
+        CREATE TABLE IF NOT EXISTS sentiment_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, db_path: str = 'articles.db'):
+        self.db_path = db_path
+        self.frames = {}  # subject_type -> long DataFrame of daily rows, reloaded after updates
+        conn = self._connect()
+        with conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(self.SCHEMA)
+        conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def update(self) -> int:
+        """Fold mentions recorded since the last update into the daily totals; returns rows folded"""
+        conn = self._connect()
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'article_mentions'").fetchone():
+            conn.close()
+            return 0
+        row = conn.execute("SELECT value FROM sentiment_meta WHERE key = 'last_mention_rowid'").fetchone()
+        last_rowid = int(row[0]) if row else 0
+
+        # Mentions are append-only, so the rowid is a watermark for what has been aggregated
+        new = pd.read_sql_query(
+            """SELECT m.rowid AS rowid, m.subject_type, m.subject, m.seen_date AS date, a.polarity
+               FROM article_mentions m JOIN articles a ON a.key = m.key
+               WHERE m.rowid > ?""", conn, params=(last_rowid,))
+        if new.empty:
+            conn.close()
+            return 0
+
+        totals = new.groupby(['subject_type', 'subject', 'date'])['polarity'].agg(['sum', 'count']).reset_index()
+        with conn:
+            conn.executemany(
+                """INSERT INTO sentiment_daily VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(subject_type, subject, date) DO UPDATE SET
+                       polarity_sum = polarity_sum + excluded.polarity_sum,
+                       articles = articles + excluded.articles""",
+                [(t, s, d, float(p), int(n)) for t, s, d, p, n in totals.itertuples(index=False)])
+            conn.execute("INSERT OR REPLACE INTO sentiment_meta VALUES ('last_mention_rowid', ?)",
+                         (str(int(new['rowid'].max())),))
+        conn.close()
+        self.frames.clear()
+        return len(new)
+
+    def _frame(self, subject_type: str) -> pd.DataFrame:
+        if subject_type not in self.frames:
+            conn = self._connect()
+            frame = pd.read_sql_query(
+                "SELECT subject, date, polarity_sum, articles FROM sentiment_daily WHERE subject_type = ?",
+                conn, params=(subject_type,), parse_dates=['date'])
+            conn.close()
+            self.frames[subject_type] = frame
+        return self.frames[subject_type]
+
+    @staticmethod
+    def align_to_sessions(dates: pd.DatetimeIndex, sessions: pd.DatetimeIndex) -> pd.DatetimeIndex:
+        """Map each news day onto the first trading session on or after it (weekend news counts for Monday)"""
+        sessions = pd.DatetimeIndex(sessions).normalize().unique().sort_values()
+        positions = np.searchsorted(sessions.values, pd.DatetimeIndex(dates).normalize().values, side='left')
+        valid = positions < len(sessions)
+        aligned = np.full(len(dates), np.datetime64('NaT'), dtype='datetime64[ns]')
+        aligned[valid] = sessions.values[positions[valid]]
+        return pd.DatetimeIndex(aligned)
+
+    def panel(self, subject_type: str = 'ticker', subjects: Optional[Iterable[str]] = None,
+              sessions: Optional[pd.DatetimeIndex] = None, window: int = 1) -> pd.DataFrame:
+        """Sessions x subjects frame of article-weighted mean polarity over the trailing window (NaN without news)"""
+        self.update()
+        frame = self._frame(subject_type)
+        if subjects is not None:
+            subjects = list(dict.fromkeys(subjects))
+            frame = frame[frame['subject'].isin(subjects)]
+
+        if sessions is None:
+            start = frame['date'].min() if not frame.empty else pd.Timestamp.today().normalize()
+            sessions = pd.bdate_range(start, pd.Timestamp.today().normalize() + pd.offsets.BDay(1))
+        sessions = pd.DatetimeIndex(sessions).normalize().unique().sort_values()
+
+        frame = frame.assign(session=self.align_to_sessions(frame['date'], sessions)).dropna(subset=['session'])
+        if frame.empty:
+            return pd.DataFrame(np.nan, index=sessions, columns=subjects or [])
+        sums = frame.pivot_table(index='session', columns='subject', values='polarity_sum', aggfunc='sum')
+        counts = frame.pivot_table(index='session', columns='subject', values='articles', aggfunc='sum')
+        columns = subjects if subjects is not None else sorted(frame['subject'].unique())
+        sums = sums.reindex(index=sessions, columns=columns).fillna(0.0)
+        counts = counts.reindex(index=sessions, columns=columns).fillna(0)
+
+        if window > 1:
+            sums = sums.rolling(window, min_periods=1).sum()
+            counts = counts.rolling(window, min_periods=1).sum()
+        return sums / counts.where(counts > 0)
+
+    def series(self, subject: str, subject_type: str = 'ticker',
+               sessions: Optional[pd.DatetimeIndex] = None, window: int = 1) -> pd.Series:
+        """Daily mean polarity for one subject"""
+        return self.panel(subject_type, [subject], sessions, window)[subject]
+
+
+def main():
+    """Command line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Daily news sentiment series from stored articles')
+    parser.add_argument('subjects', nargs='*', help='Tickers, industries or sectors (default: all)')
+    parser.add_argument('--type', default='ticker', choices=['ticker', 'industry', 'sector'],
+                        help='What the subjects are (default: ticker)')
+    parser.add_argument('--window', type=int, default=1, help='Trailing sessions to average over (default: 1)')
+    parser.add_argument('--days', type=int, default=30, help='Sessions to show (default: 30)')
+    args = parser.parse_args()
+
+    series = SentimentSeries()
+    print(f"🔄 Aggregated {series.update()} new article mentions")
+    panel = series.panel(args.type, args.subjects or None, window=args.window)
+    if panel.empty:
+        print("❌ No stored sentiment")
+        return
+    print(panel.tail(args.days).round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
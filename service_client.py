@@ -0,0 +1,54 @@
+"""
+Minimal client for market_service.py; deliberately imports nothing heavy so CLIs can try it first
+"""
+
+import json
+import os
+from typing import Dict, Optional
+from urllib.error import URLError
+from urllib.parse import urlencode, quote
+from urllib.request import urlopen
+import profiling
+
+DEFAULT_URL = 'http://127.0.0.1:8765'
+
+
+def service_url() -> str:
+    return os.environ.get('MARKET_SERVICE_URL', DEFAULT_URL).rstrip('/')
+
+
+def _get(path: str, params: Optional[Dict], timeout: float) -> Optional[Dict]:
+    url = service_url() + quote(path)
+    if params:
+        url += '?' + urlencode({k: v for k, v in params.items() if v is not None})
+    try:
+        with urlopen(url, timeout=timeout) as response:
+            body = response.read()
+    except (URLError, OSError):
+        profiling.record_request(url, 0, failed=True)
+        return None
+    profiling.record_request(url, len(body))
+    try:
+        return json.loads(body.decode('utf-8'))
+    except ValueError:
+        return None
+
+
+def service_status(timeout: float = 0.5) -> Optional[Dict]:
+    """Health info if the service is running (short timeout, so a missing service costs milliseconds)"""
+    if os.environ.get('MARKET_SERVICE') == 'off':
+        return None
+    return _get('/health', None, timeout)
+
+
+def service_request(path: str, params: Optional[Dict] = None, require: Optional[Dict] = None,
+                    timeout: float = 120.0) -> Optional[Dict]:
+    """GET a JSON endpoint; None if the service isn't running or its settings differ from `require`
+    (e.g. {'period_days': 90}), in which case callers do the work locally"""
+    status = service_status()
+    if status is None or any(status.get(k) != v for k, v in (require or {}).items()):
+        return None
+    payload = _get(path, params, timeout)
+    if payload is None or 'error' in payload:
+        return None
+    return payload
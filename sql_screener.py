@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Local `data` table for stock_query_00.sql-style screens, materialized from the price store and metadata cache
+"""
+
+import argparse
+import re
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+import indicators as ind
+from price_store import PriceStore
+from screener import universe
+from stock_info_store import make_cache_backend
+
+# Columns of the `data` table, named as on the screening site the saved queries were written for
+COLUMNS = [
+    ('ticker', 'TEXT'), ('date', 'TEXT'), ('name', 'TEXT'), ('sector', 'TEXT'), ('industry', 'TEXT'),
+    ('exchange', 'TEXT'), ('market_cap', 'REAL'),
+    ('open_price', 'REAL'), ('high_price', 'REAL'), ('low_price', 'REAL'), ('close_price', 'REAL'),
+    ('previous_close', 'REAL'), ('volume', 'REAL'), ('previous_volume', 'REAL'), ('relative_volume', 'REAL'),
+    ('change_1d', 'REAL'), ('perf_5d', 'REAL'),
+    ('sma_10', 'REAL'), ('sma_20', 'REAL'), ('sma_50', 'REAL'), ('sma_100', 'REAL'), ('sma_200', 'REAL'),
+    ('ema_10', 'REAL'), ('ema_20', 'REAL'), ('ema_50', 'REAL'),
+    ('rsi_14', 'REAL'), ('atr_14', 'REAL'),
+    ('macd_12_26', 'REAL'), ('macd_signal_12_26_9', 'REAL'),
+    ('money_flow_2_week', 'REAL'),
+    ('parkinson_historical_volatility_10', 'REAL'), ('parkinson_historical_volatility_60', 'REAL'),
+    ('parkinson_historical_volatility_120', 'REAL'), ('parkinson_historical_volatility_180', 'REAL'),
+    ('vwap', 'REAL'), ('vwma_20', 'REAL'),
+    ('last_dividend_date', 'TEXT'),
+]
+
+INFO_COLUMNS = {'name': 'company', 'sector': 'sector', 'industry': 'industry', 'exchange': 'exchange',
+                'market_cap': 'market_cap'}
+
+
+def indicator_frames(frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """Every price-derived column of the table as a sessions x tickers frame"""
+    o, h, l, c, v = (frames[f] for f in ('open', 'high', 'low', 'close', 'volume'))
+    line, signal, _ = ind.macd(c)
+    columns = {
+        'open_price': o, 'high_price': h, 'low_price': l, 'close_price': c,
+        'previous_close': c.shift(1), 'volume': v, 'previous_volume': v.shift(1),
+        'relative_volume': ind.relative_volume(v, 30),
+        'change_1d': ind.performance(c, 1), 'perf_5d': ind.performance(c, 5),
+        'rsi_14': ind.rsi(c, 14), 'atr_14': ind.atr(h, l, c, 14),
+        'macd_12_26': line, 'macd_signal_12_26_9': signal,
+        'money_flow_2_week': ind.money_flow_index(h, l, c, v, 14),
+        'vwap': ind.vwap(h, l, c, v), 'vwma_20': ind.vwma(c, v, 20),
+    }
+    for window, frame in ind.rolling_means(c, (10, 20, 50, 100, 200)).items():
+        columns[f'sma_{window}'] = frame
+    for span in (10, 20, 50):
+        columns[f'ema_{span}'] = ind.ema(c, span)
+    for window, frame in ind.parkinson_volatilities(h, l, (10, 60, 120, 180)).items():
+        columns[f'parkinson_historical_volatility_{window}'] = frame
+
+    # Date of the most recent dividend paid on or before each session
+    paid = frames['dividend'] > 0
+    sessions = np.broadcast_to(c.index.values[:, None], c.shape)
+    columns['last_dividend_date'] = pd.DataFrame(sessions, index=c.index, columns=c.columns).where(paid).ffill()
+    return columns
+
+
+def float_division(sql: str) -> str:
+    """Make integer-literal division real, as on the site the queries come from (SQLite gives 2/11 = 0)"""
+    parts = re.split(r"('(?:[^']|'')*')", sql)
+    for i in range(0, len(parts), 2):  # Odd parts are string literals
+        parts[i] = re.sub(r"(?<![\w.])(\d+)(?=\s*/\s*\d)", r"\1.0", parts[i])
+    return ''.join(parts)
+
+
+class ScreeningTable:
+    """The `data` table (latest session per ticker), optionally with every session in `data_history`"""
+
+    def __init__(self, db_path: str = 'screening.db', price_store=None, info_cache: str = 'stock_info_cache.db',
+                 history_days: int = 400, keep_history: bool = False):
+        self.db_path = db_path
+        self.price_store = price_store or PriceStore()
+        self.info_backend = make_cache_backend(info_cache)
+        self.history_days = history_days  # Calendar days loaded; SMA200 needs about 290
+        self.keep_history = keep_history
+
+        definition = ', '.join(f"{name} {kind}" for name, kind in COLUMNS)
+        conn = self._connect()
+        with conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(f"""
+                CREATE TABLE IF NOT EXISTS data ({definition}, PRIMARY KEY (ticker));
+                CREATE TABLE IF NOT EXISTS data_history ({definition}, PRIMARY KEY (ticker, date));
+                CREATE TABLE IF NOT EXISTS data_meta (
+                    ticker TEXT PRIMARY KEY,
+                    date TEXT NOT NULL,
+                    info_updated TEXT
+                );
+            """)
+        conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def default_universe(self) -> List[str]:
+        """INDUSTRY_PEERS plus every ticker in the metadata cache"""
+        return list(dict.fromkeys(universe() + sorted(self.info_backend.load_all())))
+
+    def refresh(self, tickers: Optional[Iterable[str]] = None, force: bool = False) -> int:
+        """Rematerialize tickers with a new session or new metadata since the last refresh; returns tickers written"""
+        tickers = list(dict.fromkeys(tickers or self.default_universe()))
+        self.price_store.update(tickers, self.history_days)
+        latest = self.price_store.latest_dates(tickers)
+        info = self.info_backend.load_all()
+
+        conn = self._connect()
+        done = {t: (d, u) for t, d, u in conn.execute("SELECT ticker, date, info_updated FROM data_meta")}
+        conn.close()
+        changed = [t for t in tickers if t in latest and
+                   (force or done.get(t) != (latest[t], info.get(t, {}).get('last_updated')))]
+        if not changed:
+            return 0
+
+        frames = self.price_store.load_panel(changed, self.history_days)
+        sessions = frames['close'].dropna(how='all').index
+        columns = indicator_frames({f: frame.reindex(sessions) for f, frame in frames.items()})
+        rows = self._long_rows(columns, info)
+
+        # Each ticker's latest row is the one at its own last close
+        last = rows.groupby('ticker')['date'].transform('max') == rows['date']
+        names = [name for name, _ in COLUMNS]
+        insert = f"INSERT OR REPLACE INTO {{}} VALUES ({', '.join('?' * len(names))})"
+        conn = self._connect()
+        with conn:
+            conn.executemany(insert.format('data'), rows.loc[last, names].itertuples(index=False))
+            if self.keep_history:
+                since = rows['ticker'].map({t: d for t, (d, _) in done.items()}).fillna('')
+                new = rows['date'] > since if not force else slice(None)
+                conn.executemany(insert.format('data_history'), rows.loc[new, names].itertuples(index=False))
+            conn.executemany(
+                "INSERT OR REPLACE INTO data_meta VALUES (?, ?, ?)",
+                [(t, d, info.get(t, {}).get('last_updated')) for t, d in rows.loc[last, ['ticker', 'date']].values])
+        conn.close()
+        return int(last.sum())
+
+    @staticmethod
+    def _long_rows(columns: Dict[str, pd.DataFrame], info: Dict) -> pd.DataFrame:
+        """One row per (ticker, session) with a close, metadata joined in"""
+        close = columns['close_price']
+        n_sessions, n_tickers = close.shape
+        long = pd.DataFrame({
+            'ticker': np.tile(close.columns.values, n_sessions),
+            'date': np.repeat(close.index.strftime('%Y-%m-%d').values, n_tickers),
+        })
+        for name, frame in columns.items():
+            long[name] = frame.to_numpy().ravel()
+        long = long[long['close_price'].notna()].copy()
+        paid = long['last_dividend_date'].notna()
+        long['last_dividend_date'] = pd.to_datetime(long['last_dividend_date']).dt.strftime('%Y-%m-%d').where(paid)
+
+        for column, field in INFO_COLUMNS.items():
+            long[column] = long['ticker'].map({t: record.get(field) for t, record in info.items()})
+        long = long.astype(object).where(long.notna(), None)
+        return long
+
+    def query(self, sql: str, params: Iterable = ()) -> pd.DataFrame:
+        """Run a saved query against the table (integer literals divide as reals)"""
+        conn = self._connect()
+        try:
+            return pd.read_sql_query(float_division(sql), conn, params=list(params))
+        finally:
+            conn.close()
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Run stock_query_00.sql-style screens against a local data table')
+    parser.add_argument('queries', nargs='*', help='.sql files to run')
+    parser.add_argument('--sql', help='Query text to run instead of a file')
+    parser.add_argument('--tickers', nargs='+', help='Tickers to materialize (default: industry universe '
+                                                     'plus the metadata cache)')
+    parser.add_argument('--no-refresh', action='store_true', help='Query the table as it is')
+    parser.add_argument('--force', action='store_true', help='Rematerialize every ticker')
+    parser.add_argument('--history', action='store_true', help='Also keep every session in data_history')
+    parser.add_argument('--db', default='screening.db', help='Table database (default: screening.db)')
+    args = parser.parse_args()
+
+    table = ScreeningTable(args.db, keep_history=args.history)
+    if not args.no_refresh:
+        started = time.perf_counter()
+        written = table.refresh([t.upper() for t in args.tickers] if args.tickers else None, force=args.force)
+        print(f"🔄 Materialized {written} tickers in {time.perf_counter() - started:.1f}s")
+
+    queries = [(path, open(path, 'r').read()) for path in args.queries]
+    if args.sql:
+        queries.append(('--sql', args.sql))
+    for label, sql in queries:
+        started = time.perf_counter()
+        try:
+            results = table.query(sql)
+        except Exception as e:
+            print(f"❌ {label}: {e}")
+            continue
+        print(f"\n🔎 {label}: {len(results)} rows in {(time.perf_counter() - started) * 1000:.1f} ms")
+        if not results.empty:
+            print(results.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,108 @@
 import json
 import os
-from datetime import datetime
-import requests
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from functools import partial
 from typing import Dict, List, Optional
 import yfinance as yf
+import profiling
 from market_mapping import SECTOR_ETF_MAP, INDUSTRY_PEERS, SECTOR_LEADERS
+from rate_limiter import YAHOO_RATE_LIMITER
+from stock_info_store import make_cache_backend
+from symbol_cache import SymbolValidityCache
+
+# How long each cached field stays fresh before it is refreshed in the background
+FIELD_TTLS = {
+    'company': timedelta(days=180),
+    'sector': timedelta(days=180),
+    'industry': timedelta(days=180),
+    'exchange': timedelta(days=180),
+    'sector_etf': timedelta(days=180),
+    'peers': timedelta(days=30),
+    'market_cap': timedelta(days=1),
+}
+
+# Fields that come straight from a single .info call
+DETAIL_FIELDS = ('company', 'industry', 'sector', 'market_cap', 'exchange')
+
+PEER_SOURCES = ('static', 'correlation', 'both')
 
 class StockInfoManager:
     """Manages stock information including company details, peers, and sector ETFs"""
     
-    def __init__(self, cache_file='stock_info_cache.json'):
+    def __init__(self, cache_file='stock_info_cache.db', max_workers: int = 8,
+                 max_retries: int = 3, rate_limiter=None, backend=None, peer_source: str = 'static',
+                 background_refresh: bool = True):
         self.cache_file = cache_file
+        # SQLite by default; pass a .json cache_file to keep the legacy single-file format
+        self.backend = backend or make_cache_backend(cache_file)
         self.stock_info = self.load_cache()
         
+        # Concurrency settings for update_portfolio
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter or YAHOO_RATE_LIMITER
+        
+        # Peer validity lives next to the SQLite cache (or beside the legacy JSON file)
+        symbol_db = os.path.splitext(cache_file)[0] + '.db'
+        self.symbol_cache = SymbolValidityCache(symbol_db, rate_limiter=self.rate_limiter)
+        
+        # Background stale-while-revalidate workers; short-lived callers that exit straight away
+        # turn them off, since daemon threads are killed before they can write anything back
+        self.background_refresh = background_refresh
+        self.field_ttls = dict(FIELD_TTLS)
+        self._refresh_queue = queue.Queue()
+        self._refreshing = set()
+        self._refresh_cond = threading.Condition()
+        self._refresh_workers = []
+        
         # Import from market_mappings.py
         self.sector_etf_map = SECTOR_ETF_MAP
         self.industry_peers = INDUSTRY_PEERS
         self.sector_leaders = SECTOR_LEADERS
+        
+        # Where peers come from: 'static' mappings, 'correlation' (the peer index), or 'both'
+        if peer_source not in PEER_SOURCES:
+            raise ValueError(f"peer_source must be one of {', '.join(PEER_SOURCES)}")
+        self.peer_source = peer_source
+        self._peer_index = None
+        self._peer_index_lock = threading.Lock()
     
     def load_cache(self) -> Dict:
         """Load cached stock information"""
-        if os.path.exists(self.cache_file):
+        return self.backend.load_all()
+    
+    def save_cache(self, tickers: Optional[List[str]] = None):
+        """Save stock information to cache (only the given tickers, if provided)"""
+        if tickers is None:
+            tickers = list(self.stock_info)
+        self.backend.upsert_many({t: self.stock_info[t] for t in tickers if t in self.stock_info})
+    
+    def _fetch_info(self, ticker: str, retries: Optional[int] = None) -> Dict:
+        """Fetch yfinance .info through the shared rate limiter, retrying with backoff"""
+        retries = retries or self.max_retries
+        for attempt in range(retries):
+            self.rate_limiter.acquire()
             try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-    
-    def save_cache(self):
-        """Save stock information to cache"""
-        with open(self.cache_file, 'w') as f:
-            json.dump(self.stock_info, f, indent=2)
-    
-    def get_stock_details(self, ticker: str) -> Dict:
-        """Fetch stock details from yfinance"""
+                with profiling.span('yfinance.info', ticker=ticker):
+                    info = yf.Ticker(ticker).info
+                profiling.record_request(profiling.YFINANCE_HOST, None)
+                return info
+            except Exception:
+                profiling.record_request(profiling.YFINANCE_HOST, None, failed=True)
+                if attempt == retries - 1:
+                    raise
+                # Exponential backoff with jitter so workers don't retry in lockstep
+                time.sleep((2 ** attempt) + random.uniform(0, 0.5))
+    
+    def get_stock_details(self, ticker: str, strict: bool = False) -> Dict:
+        """Fetch stock details from yfinance (strict re-raises instead of returning placeholders)"""
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self._fetch_info(ticker)
             
             return {
                 'company': info.get('longName', info.get('shortName', ticker)),
@@ -47,6 +112,8 @@ class StockInfoManager:
                 'exchange': info.get('exchange', 'Unknown')
             }
         except Exception as e:
+            if strict:
+                raise
             print(f"Error fetching {ticker} details: {e}")
             return {
                 'company': ticker,
@@ -56,8 +123,8 @@ class StockInfoManager:
                 'exchange': 'Unknown'
             }
     
-    def find_peers(self, ticker: str, industry: str, sector: str, min_peers: int = 5) -> List[str]:
-        """Find peer companies based on industry and sector"""
+    def _peer_candidates(self, ticker: str, industry: str, sector: str, min_peers: int = 5) -> List[str]:
+        """List unvalidated peer candidates from the industry and sector mappings"""
         peers = []
         
         # Use the imported industry peers from market_mappings.py
@@ -73,18 +140,40 @@ class StockInfoManager:
             peers.extend(additional_peers)
         
         # Remove duplicates and limit to requested number
-        peers = list(dict.fromkeys(peers))[:min_peers * 2]  # Get extra in case some are invalid
+        return list(dict.fromkeys(peers))[:min_peers * 2]  # Get extra in case some are invalid
+    
+    def peer_index(self):
+        """Correlation peer index, opened (and rebuilt if a week old) on first use"""
+        with self._peer_index_lock:
+            if self._peer_index is None:
+                from peer_discovery import PeerIndex
+                index = PeerIndex(info_cache=self.cache_file)
+                index.refresh_if_stale()
+                self._peer_index = index
+            return self._peer_index
+    
+    def _correlated_candidates(self, ticker: str, min_peers: int = 5) -> List[str]:
+        """Most correlated tickers from the peer index ([] if it can't be built here)"""
+        try:
+            return self.peer_index().peers(ticker, k=min_peers * 2)
+        except Exception as e:
+            print(f"⚠️  Correlation peers unavailable for {ticker}: {e}")
+            return []
+    
+    @profiling.timed('stock_info.find_peers')
+    def find_peers(self, ticker: str, industry: str, sector: str, min_peers: int = 5) -> List[str]:
+        """Find peer companies based on industry and sector, or on return correlation (see peer_source)"""
+        if self.peer_source == 'static':
+            peers = self._peer_candidates(ticker, industry, sector, min_peers)
+        else:
+            peers = self._correlated_candidates(ticker, min_peers)
+            # 'both' fills up with the mapping; 'correlation' falls back to it for tickers without history
+            if self.peer_source == 'both' or not peers:
+                peers = list(dict.fromkeys(peers + self._peer_candidates(ticker, industry, sector, min_peers)))
         
-        # Validate peers (check if they exist)
-        valid_peers = []
-        for peer in peers:
-            try:
-                yf.Ticker(peer).info
-                valid_peers.append(peer)
-                if len(valid_peers) >= min_peers:
-                    break
-            except:
-                continue
+        # Validate peers against the shared symbol cache (network only for unknown symbols)
+        validity = self.symbol_cache.validate(peers)
+        valid_peers = [p for p in peers if validity.get(p)]
         
         return valid_peers[:min_peers]
     
@@ -92,23 +181,29 @@ class StockInfoManager:
         """Get the appropriate sector ETF"""
         return self.sector_etf_map.get(sector, 'SPY')  # Default to SPY if sector not found
     
-    def update_ticker(self, ticker: str, force_update: bool = False) -> Dict:
-        """Update or add a ticker's information"""
-        ticker = ticker.upper()
-        
-        # Check if we have recent data
-        if not force_update and ticker in self.stock_info:
-            cached_data = self.stock_info[ticker]
-            if 'last_updated' in cached_data:
-                last_update = datetime.fromisoformat(cached_data['last_updated'])
-                if (datetime.now() - last_update).days < 7:  # Cache for 7 days
-                    print(f"Using cached data for {ticker}")
-                    return cached_data
+    def _stale_fields(self, ticker: str) -> List[str]:
+        """List cached fields older than their freshness policy (all fields if not cached)"""
+        cached_data = self.stock_info.get(ticker)
+        if not cached_data:
+            return list(self.field_ttls)
         
-        print(f"Fetching fresh data for {ticker}...")
+        # Entries written before per-field timestamps fall back to last_updated
+        field_updated = cached_data.get('field_updated', {})
+        fallback = cached_data.get('last_updated')
+        now = datetime.now()
         
+        stale = []
+        for field, ttl in self.field_ttls.items():
+            stamp = field_updated.get(field, fallback)
+            if field not in cached_data or not stamp or now - datetime.fromisoformat(stamp) > ttl:
+                stale.append(field)
+        return stale
+    
+    def _build_stock_data(self, ticker: str, details: Optional[Dict] = None) -> Dict:
+        """Fetch details, peers and sector ETF for a ticker without touching the cache"""
         # Get stock details
-        details = self.get_stock_details(ticker)
+        if details is None:
+            details = self.get_stock_details(ticker)
         
         # Find peers
         peers = self.find_peers(ticker, details['industry'], details['sector'])
@@ -117,7 +212,8 @@ class StockInfoManager:
         sector_etf = self.get_sector_etf(details['sector'])
         
         # Compile all information
-        stock_data = {
+        now = datetime.now().isoformat()
+        return {
             'company': details['company'],
             'industry': details['industry'],
             'sector': details['sector'],
@@ -125,28 +221,183 @@ class StockInfoManager:
             'sector_etf': sector_etf,
             'market_cap': details['market_cap'],
             'exchange': details['exchange'],
-            'last_updated': datetime.now().isoformat()
+            'last_updated': now,
+            'field_updated': {field: now for field in self.field_ttls}
         }
+    
+    @profiling.timed('stock_info.refresh_fields')
+    def _refresh_fields(self, ticker: str, fields: List[str]) -> Dict:
+        """Refetch only the stale fields of a cached ticker and merge them into the entry"""
+        cached_data = self.stock_info[ticker]
+        record = dict(cached_data)
+        field_updated = dict(cached_data.get('field_updated', {}))
+        now = datetime.now().isoformat()
+        
+        if any(f in DETAIL_FIELDS for f in fields):
+            details = self.get_stock_details(ticker, strict=True)
+            record.update({f: details[f] for f in DETAIL_FIELDS})
+            field_updated.update({f: now for f in DETAIL_FIELDS})
+            record['sector_etf'] = self.get_sector_etf(details['sector'])
+            field_updated['sector_etf'] = now
+        
+        # Peers depend on industry/sector, so recompute them if either moved
+        classification_changed = (record['industry'] != cached_data.get('industry') or
+                                  record['sector'] != cached_data.get('sector'))
+        if 'peers' in fields or classification_changed:
+            record['peers'] = self.find_peers(ticker, record['industry'], record['sector'])
+            field_updated['peers'] = now
+        
+        record['field_updated'] = field_updated
+        record['last_updated'] = now
+        return record
+    
+    def _ensure_refresh_workers(self):
+        """Start background refresh threads on first use"""
+        if self._refresh_workers:
+            return
+        for i in range(min(self.max_workers, 4)):
+            worker = threading.Thread(target=self._refresh_worker, name=f"info-refresh-{i}", daemon=True)
+            worker.start()
+            self._refresh_workers.append(worker)
+    
+    def _schedule_refresh(self, ticker: str, fields: List[str]):
+        """Queue a background refresh of stale fields, at most once per ticker at a time"""
+        if not self.background_refresh:
+            return
+        with self._refresh_cond:
+            if ticker in self._refreshing:
+                return
+            self._refreshing.add(ticker)
+            self._ensure_refresh_workers()
+        self._refresh_queue.put((ticker, fields))
+    
+    def _refresh_worker(self):
+        """Drain the refresh queue, writing each refreshed entry back to the cache"""
+        while True:
+            ticker, fields = self._refresh_queue.get()
+            try:
+                self.stock_info[ticker] = self._refresh_fields(ticker, fields)
+                self.save_cache([ticker])
+            except Exception as e:
+                # Keep serving the cached entry; it will be retried on next access
+                print(f"⚠️  Background refresh failed for {ticker}: {e}")
+            finally:
+                with self._refresh_cond:
+                    self._refreshing.discard(ticker)
+                    self._refresh_cond.notify_all()
+    
+    def wait_for_refreshes(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued background refreshes; returns False if the timeout expired first"""
+        with self._refresh_cond:
+            return self._refresh_cond.wait_for(lambda: not self._refreshing, timeout)
+    
+    def update_ticker(self, ticker: str, force_update: bool = False) -> Dict:
+        """Update or add a ticker's information"""
+        ticker = ticker.upper()
+        
+        # Serve cached data immediately, refreshing stale fields in the background
+        if not force_update and ticker in self.stock_info:
+            profiling.record_cache('stock_info', 'hit')
+            stale = self._stale_fields(ticker)
+            if stale and self.background_refresh:
+                print(f"Using cached data for {ticker} (refreshing {', '.join(stale)} in background)")
+                self._schedule_refresh(ticker, stale)
+            else:
+                print(f"Using cached data for {ticker}")
+            return self.stock_info[ticker]
+        
+        print(f"Fetching fresh data for {ticker}...")
+        profiling.record_cache('stock_info', 'miss')
+        stock_data = self._build_stock_data(ticker)
         
         # Update cache
         self.stock_info[ticker] = stock_data
-        self.save_cache()
+        self.save_cache([ticker])
         
-        print(f"✅ Updated {ticker}: {details['company']} - {details['industry']}")
+        print(f"✅ Updated {ticker}: {stock_data['company']} - {stock_data['industry']}")
         return stock_data
     
-    def update_portfolio(self, tickers: List[str], force_update: bool = False):
-        """Update information for a list of tickers"""
+    @profiling.timed('stock_info.update_portfolio')
+    def update_portfolio(self, tickers: List[str], force_update: bool = False) -> Dict[str, Dict]:
+        """Update information for a list of tickers concurrently and save once"""
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        
+        # Only uncached (or forced) tickers block; stale ones revalidate in the background
+        pending = []
         for ticker in tickers:
-            self.update_ticker(ticker, force_update)
+            if force_update or ticker not in self.stock_info:
+                pending.append(ticker)
+                continue
+            stale = self._stale_fields(ticker)
+            if stale:
+                self._schedule_refresh(ticker, stale)
+            print(f"Using cached data for {ticker}")
+        profiling.record_cache('stock_info', 'hit', len(tickers) - len(pending))
+        profiling.record_cache('stock_info', 'miss', len(pending))
+        
+        if pending:
+            workers = max(1, min(self.max_workers, len(pending)))
+            print(f"Fetching fresh data for {len(pending)} tickers ({workers} workers)...")
+            
+            # Fetch company details concurrently; a failed fetch raises so it never replaces good metadata
+            details = {}
+            fetch = partial(self.get_stock_details, strict=True)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(fetch, t): t for t in pending}
+                for future in as_completed(futures):
+                    ticker = futures[future]
+                    try:
+                        details[ticker] = future.result()
+                    except Exception as e:
+                        kept = " (keeping cached data)" if ticker in self.stock_info else ""
+                        print(f"❌ Failed to update {ticker}{kept}: {e}")
+            
+            # Validate every distinct peer candidate in one bulk probe
+            candidates = []
+            for ticker, d in details.items():
+                candidates.extend(self._peer_candidates(ticker, d['industry'], d['sector']))
+            self.symbol_cache.validate(candidates)
+            
+            # Peers now resolve from the symbol cache without further network calls
+            updated = {}
+            for ticker in pending:
+                if ticker not in details:
+                    continue
+                stock_data = self._build_stock_data(ticker, details[ticker])
+                updated[ticker] = stock_data
+                print(f"✅ Updated {ticker}: {stock_data['company']} - {stock_data['industry']}")
+            
+            # Write all results as one batch
+            if updated:
+                self.stock_info.update(updated)
+                self.save_cache(list(updated))
+        
+        return {t: self.stock_info[t] for t in tickers if t in self.stock_info}
     
     def get_info(self, ticker: str) -> Dict:
-        """Get information for a ticker (from cache or fetch if needed)"""
+        """Get information for a ticker (never waits on the network if any cached value exists)"""
         ticker = ticker.upper()
         if ticker not in self.stock_info:
-            return self.update_ticker(ticker)
+            # Another process may have cached it since we loaded
+            cached = self.backend.get(ticker)
+            if cached is None:
+                return self.update_ticker(ticker)
+            self.stock_info[ticker] = cached
+        profiling.record_cache('stock_info', 'hit')
+        
+        stale = self._stale_fields(ticker)
+        if stale:
+            self._schedule_refresh(ticker, stale)
         return self.stock_info[ticker]
     
+    def get_by_sector(self, sector: str) -> Dict[str, Dict]:
+        """Get all cached tickers in a sector"""
+        return self.backend.find_by_sector(sector)
+    
+    def get_by_industry(self, industry: str) -> Dict[str, Dict]:
+        """Get all cached tickers in an industry"""
+        return self.backend.find_by_industry(industry)
+    
     def export_readable(self, filename: str = 'stock_info_readable.json'):
         """Export stock info in a human-readable format"""
         readable_data = {}
@@ -0,0 +1,181 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class JSONCacheBackend:
+    """Legacy backend that keeps every ticker in a single JSON file"""
+
+    def __init__(self, cache_file: str = 'stock_info_cache.json'):
+        self.cache_file = cache_file
+        self.lock = threading.Lock()
+        self.data = self._read_file()
+
+    def _read_file(self) -> Dict:
+        """Read the JSON file, setting aside a corrupt copy instead of silently dropping it"""
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            backup = f"{self.cache_file}.corrupt-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            os.replace(self.cache_file, backup)
+            print(f"⚠️  {self.cache_file} is corrupt ({e}); moved to {backup}")
+            return {}
+
+    def _write_file(self):
+        """Write to a temp file and rename so a crash never leaves a half-written cache"""
+        directory = os.path.dirname(os.path.abspath(self.cache_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(tmp_path, self.cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load_all(self) -> Dict:
+        return dict(self.data)
+
+    def get(self, ticker: str) -> Optional[Dict]:
+        return self.data.get(ticker)
+
+    def upsert(self, ticker: str, record: Dict):
+        self.upsert_many({ticker: record})
+
+    def upsert_many(self, records: Dict[str, Dict]):
+        with self.lock:
+            self.data.update(records)
+            self._write_file()
+
+    def find_by_sector(self, sector: str) -> Dict:
+        return {t: r for t, r in self.data.items() if r.get('sector') == sector}
+
+    def find_by_industry(self, industry: str) -> Dict:
+        return {t: r for t, r in self.data.items() if r.get('industry') == industry}
+
+
+class SQLiteCacheBackend:
+    """Embedded SQLite backend with per-ticker upserts and WAL-mode readers"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS stock_info (
+            ticker TEXT PRIMARY KEY,
+            company TEXT,
+            sector TEXT,
+            industry TEXT,
+            last_updated TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_stock_info_sector ON stock_info(sector);
+        CREATE INDEX IF NOT EXISTS idx_stock_info_industry ON stock_info(industry);
+        CREATE TABLE IF NOT EXISTS cache_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, db_path: str = 'stock_info_cache.db', legacy_json: Optional[str] = None):
+        self.db_path = db_path
+        # The legacy cache sits beside the database under the same name ('' skips the migration)
+        if legacy_json is None:
+            legacy_json = os.path.splitext(db_path)[0] + '.json'
+        with self._connect() as conn:
+            # WAL lets the scraper and portfolio_manager read while another process writes
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(self.SCHEMA)
+
+        if legacy_json:
+            self.migrate_from_json(legacy_json)
+
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection; commits on success, rolls back on error"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row(ticker: str, record: Dict):
+        return (ticker, record.get('company'), record.get('sector'), record.get('industry'),
+                record.get('last_updated'), json.dumps(record))
+
+    def migrate_from_json(self, json_file: str) -> int:
+        """One-time import of the legacy JSON cache; returns the number of tickers imported"""
+        with self._connect() as conn:
+            done = conn.execute(
+                "SELECT value FROM cache_meta WHERE key = 'migrated_from_json'").fetchone()
+            if done or not os.path.exists(json_file):
+                return 0
+
+            try:
+                with open(json_file, 'r') as f:
+                    legacy = json.load(f)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                print(f"⚠️  Skipping migration, {json_file} is corrupt: {e}")
+                return 0
+
+            # Never overwrite rows that were written after the JSON was abandoned
+            conn.executemany(
+                "INSERT OR IGNORE INTO stock_info VALUES (?, ?, ?, ?, ?, ?)",
+                [self._row(t, r) for t, r in legacy.items()])
+            conn.execute("INSERT INTO cache_meta VALUES ('migrated_from_json', ?)",
+                         (datetime.now().isoformat(),))
+
+        print(f"📦 Migrated {len(legacy)} tickers from {json_file} to {self.db_path}")
+        return len(legacy)
+
+    def load_all(self) -> Dict:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT ticker, data FROM stock_info").fetchall()
+        return {ticker: json.loads(data) for ticker, data in rows}
+
+    def get(self, ticker: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM stock_info WHERE ticker = ?", (ticker,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def upsert(self, ticker: str, record: Dict):
+        self.upsert_many({ticker: record})
+
+    def upsert_many(self, records: Dict[str, Dict]):
+        """Insert or replace several tickers in a single transaction"""
+        with self._connect() as conn:
+            conn.executemany(
+                """INSERT INTO stock_info VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(ticker) DO UPDATE SET
+                       company = excluded.company,
+                       sector = excluded.sector,
+                       industry = excluded.industry,
+                       last_updated = excluded.last_updated,
+                       data = excluded.data""",
+                [self._row(t, r) for t, r in records.items()])
+
+    def find_by_sector(self, sector: str) -> Dict:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT ticker, data FROM stock_info WHERE sector = ?", (sector,)).fetchall()
+        return {ticker: json.loads(data) for ticker, data in rows}
+
+    def find_by_industry(self, industry: str) -> Dict:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT ticker, data FROM stock_info WHERE industry = ?", (industry,)).fetchall()
+        return {ticker: json.loads(data) for ticker, data in rows}
+
+
+def make_cache_backend(cache_file: str):
+    """Pick a backend from the cache file extension (.json keeps the legacy format)"""
+    if cache_file.endswith('.json'):
+        return JSONCacheBackend(cache_file)
+    return SQLiteCacheBackend(cache_file)
@@ -1,116 +1,252 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
-import csv
-import time
 from urllib.parse import quote
 import feedparser
-from textblob import TextBlob
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_CENTER
-import yfinance as yf
 
 from stock_info_manager import StockInfoManager
+from news_fetcher import AsyncNewsFetcher
+from http_cache import ResponseCache, CachedHTTPClient
+from article_store import ArticleStore
+from sentiment_engine import get_backend
+from price_store import PriceStore
+from run_checkpoint import RunCheckpoint
+from fast_parse import yahoo_headlines, summary_text
+from reference_import import match_industry, match_sector
+import profiling
+import report_renderer
+
+class RunPlan:
+    """Distinct requests a run needs, gathered across the whole portfolio before fetching"""
+    
+    def __init__(self, tickers):
+        self.tickers = list(tickers)
+        # Dicts used as ordered sets: each request appears once however many tickers need it
+        self.yahoo_tickers = {}
+        self.rss_queries = {}
+        self.price_symbols = {}
+    
+    def summary(self):
+        """One-line description of the planned request counts"""
+        return (f"{len(self.rss_queries)} RSS feeds, {len(self.yahoo_tickers)} Yahoo pages, "
+                f"{len(self.price_symbols)} price lookups for {len(self.tickers)} tickers")
+
 
 class StockContextAnalyzer:
-    def __init__(self, portfolio_tickers):
+    def __init__(self, portfolio_tickers, fetch_timeout=60.0, cache_ttl_minutes=15, sentiment_backend='lexicon',
+                 fast_parsing=True, peer_source='static'):
         """Initialize analyzer with portfolio and context mappings"""
         self.portfolio = portfolio_tickers
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         }
         
-        self.info_manager = StockInfoManager()
+        # Responses are cached on disk so intraday reruns reuse or revalidate them
+        self.http_cache = ResponseCache(ttl_minutes=cache_ttl_minutes)
+        self.http_client = CachedHTTPClient(self.http_cache, headers=self.headers)
+        
+        # All news requests for a run are fetched up front, concurrently
+        self.fetcher = AsyncNewsFetcher(headers=self.headers, timeout=fetch_timeout, cache=self.http_cache)
+        self.prefetched = {}
+        
+        # Articles and their sentiment persist across runs; each article is scored once
+        self.article_store = ArticleStore()
+        
+        # New articles are scored in one batch per page ('lexicon' or 'textblob')
+        self.sentiment_backend = get_backend(sentiment_backend)
+        
+        # Lightweight parsers for pages/summaries; False uses BeautifulSoup throughout
+        self.fast_parsing = fast_parsing
+        
+        # Shared per-run results, filled once and read by every ticker
+        self.query_articles = {}
+        self.yahoo_articles = {}
+        self.price_returns = {}
+        
+        # Daily closes for peers and sector ETFs, kept locally and topped up in one batch
+        self.price_store = PriceStore(ttl_minutes=cache_ttl_minutes)
+        
+        # Peers from the static mappings, the correlation peer index, or both
+        self.info_manager = StockInfoManager(peer_source=peer_source)
         print("📊 Updating portfolio information...")
-        self.info_manager.update_portfolio(self.portfolio)
         
-        # Get stock info from manager
-        self.stock_info = {}
-        for ticker in self.portfolio:
-            self.stock_info[ticker] = self.info_manager.get_info(ticker)
+        # Resolve all tickers concurrently; results are cached in one write
+        self.stock_info = self.info_manager.update_portfolio(self.portfolio)
+    
+    @staticmethod
+    def yahoo_news_url(ticker):
+        """Yahoo Finance news page for a ticker"""
+        return f"https://finance.yahoo.com/quote/{ticker}/news"
+    
+    @staticmethod
+    def google_news_rss_url(query):
+        """Google News RSS search feed for a query"""
+        return f"https://news.google.com/rss/search?q={quote(query)}&hl=en-US&gl=US&ceid=US:en"
+    
+    @staticmethod
+    def stock_query(ticker, company):
+        return f"{ticker} {company} stock"
+    
+    @staticmethod
+    def peer_query(peer):
+        return f"{peer} stock"
     
+    @staticmethod
+    def industry_query(industry):
+        return f"{industry} industry stocks"
+    
+    @staticmethod
+    def sector_query(sector):
+        return f"{sector} sector stocks market"
+    
+    @profiling.timed('scraper.plan')
+    def plan_run(self, tickers=None):
+        """Collect the distinct feeds, pages and price lookups needed by the whole portfolio"""
+        plan = RunPlan(self.portfolio if tickers is None else tickers)
+        for ticker in plan.tickers:
+            info = self.stock_info.get(ticker, {})
+            plan.yahoo_tickers[ticker] = True
+            # Each query remembers what it is about, for the article store
+            plan.rss_queries[self.stock_query(ticker, info.get('company', ticker))] = ('ticker', ticker)
+            
+            peers = info.get('peers', [])
+            for peer in peers[:2]:
+                plan.rss_queries[self.peer_query(peer)] = ('ticker', peer)
+            for peer in peers[:3]:
+                plan.price_symbols[peer] = True
+            
+            # Mentions are stored under the mapping's labels, which the fear/greed charts look up
+            if info.get('industry'):
+                industry = match_industry(info['industry']) or info['industry']
+                plan.rss_queries[self.industry_query(info['industry'])] = ('industry', industry)
+            if info.get('sector'):
+                sector = match_sector(info['sector']) or info['sector']
+                plan.rss_queries[self.sector_query(info['sector'])] = ('sector', sector)
+            if info.get('sector_etf'):
+                plan.price_symbols[info['sector_etf']] = True
+        return plan
+    
+    def execute_plan(self, plan):
+        """Run each planned request once; per-ticker steps then read the shared results"""
+        print(f"🗺️  Run plan: {plan.summary()}")
+        
+        urls = [self.yahoo_news_url(t) for t in plan.yahoo_tickers]
+        urls += [self.google_news_rss_url(q) for q in plan.rss_queries]
+        print(f"🌐 Fetching {len(urls)} news pages and feeds concurrently...")
+        self.prefetched = self.fetcher.fetch_all(urls)
+        fetched = sum(1 for body in self.prefetched.values() if body is not None)
+        print(f"  ✅ Fetched {fetched}/{len(self.prefetched)}")
+        print(f"  💾 HTTP cache: {self.http_cache.stats.summary()}")
+        
+        # Parse each page/feed once; only articles not already in the store get scored
+        with profiling.span('scraper.parse_and_store'):
+            for ticker in plan.yahoo_tickers:
+                articles = self.scrape_yahoo_finance(ticker)
+                self.article_store.add_articles(articles, 'ticker', ticker, self.score_texts)
+            for query, (subject_type, subject) in plan.rss_queries.items():
+                articles = self.scrape_google_news_rss(query)
+                self.article_store.add_articles(articles, subject_type, subject, self.score_texts)
+        
+        # Every peer and ETF return for the run comes from one batched download
+        print(f"💹 Loading returns for {len(plan.price_symbols)} symbols...")
+        with profiling.span('prices.returns', symbols=len(plan.price_symbols)):
+            self.price_returns.update(self.price_store.returns_for(plan.price_symbols))
+    
+    def get_returns(self, symbol):
+        """1-day and 5-day returns for a symbol, shared by every ticker in the run"""
+        if symbol not in self.price_returns:
+            self.price_returns.update(self.price_store.returns_for([symbol]))
+        return self.price_returns[symbol]
+    
+    def _get_page(self, url):
+        """Return a page body from the prefetch, falling back to a blocking request"""
+        if url in self.prefetched:
+            # Planned but failed or timed out: don't retry synchronously and blow the budget
+            return self.prefetched[url]
+        return self.http_client.get(url)
+    
+    @profiling.timed('parse.yahoo')
     def scrape_yahoo_finance(self, ticker):
         """Scrape news from Yahoo Finance"""
-        url = f"https://finance.yahoo.com/quote/{ticker}/news"
+        if ticker in self.yahoo_articles:
+            return self.yahoo_articles[ticker]
+        
+        url = self.yahoo_news_url(ticker)
         articles = []
         
         try:
-            response = requests.get(url, headers=self.headers)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                news_items = soup.find_all('h3', class_='Mb(5px)')[:10]
-                
-                for item in news_items:
-                    link_tag = item.find('a')
-                    if link_tag:
-                        title = link_tag.text.strip()
-                        link = link_tag.get('href', '')
-                        if not link.startswith('http'):
-                            link = 'https://finance.yahoo.com' + link
-                        
-                        # Try to find timestamp
-                        time_element = item.find_next_sibling('div')
-                        timestamp = time_element.text if time_element else 'Recent'
-                        
-                        articles.append({
-                            'title': title,
-                            'link': link,
-                            'source': 'Yahoo Finance',
-                            'ticker': ticker,
-                            'timestamp': timestamp
-                        })
-            
-            time.sleep(0.5)
+            content = self._get_page(url)
+            if content:
+                # Streams only the headline <h3>s and their timestamps instead of building the whole tree
+                for item in yahoo_headlines(content, limit=10, fast=self.fast_parsing):
+                    link = item['link']
+                    if not link.startswith('http'):
+                        link = 'https://finance.yahoo.com' + link
+                    
+                    articles.append({
+                        'title': item['title'],
+                        'link': link,
+                        'source': 'Yahoo Finance',
+                        'ticker': ticker,
+                        'timestamp': item['timestamp']
+                    })
             
         except Exception as e:
             pass
         
+        self.yahoo_articles[ticker] = articles
         return articles
     
+    @profiling.timed('parse.google_news_rss')
     def scrape_google_news_rss(self, query):
         """Use Google News RSS feed"""
-        rss_url = f"https://news.google.com/rss/search?q={quote(query)}&hl=en-US&gl=US&ceid=US:en"
+        if query in self.query_articles:
+            return self.query_articles[query]
+        
+        rss_url = self.google_news_rss_url(query)
         articles = []
         
         try:
-            feed = feedparser.parse(rss_url)
+            content = self._get_page(rss_url)
+            entries = feedparser.parse(content).entries[:10] if content else []
             
-            for entry in feed.entries[:10]:
+            for entry in entries:
                 articles.append({
                     'title': entry.title,
                     'link': entry.link,
                     'source': entry.source.title if hasattr(entry, 'source') else 'Google News',
-                    'summary': BeautifulSoup(entry.get('summary', ''), 'html.parser').text[:200]
+                    'summary': summary_text(entry.get('summary', ''), fast=self.fast_parsing)[:200]
                 })
             
-            time.sleep(0.5)
-            
         except Exception as e:
             pass
         
+        self.query_articles[query] = articles
         return articles
     
     def analyze_sentiment(self, text):
-        """Analyze sentiment using TextBlob"""
-        try:
-            blob = TextBlob(text)
-            polarity = blob.sentiment.polarity
-            
-            if polarity > 0.1:
-                return 'positive', polarity
-            elif polarity < -0.1:
-                return 'negative', polarity
-            else:
-                return 'neutral', polarity
-        except:
-            return 'neutral', 0.0
+        """Analyze sentiment of a single text"""
+        return self.classify_polarity(self.score_texts([text])[0])
+    
+    def classify_polarity(self, polarity):
+        """Map a polarity score onto a sentiment label"""
+        if polarity > 0.1:
+            return 'positive', polarity
+        elif polarity < -0.1:
+            return 'negative', polarity
+        return 'neutral', polarity
     
+    def score_texts(self, texts):
+        """Polarity for a batch of texts"""
+        with profiling.span('sentiment.score', texts=len(texts)):
+            return self.sentiment_backend.score(texts).tolist()
+    
+    def article_sentiment(self, article):
+        """Sentiment for an article, reusing the stored polarity when it has been seen before"""
+        if 'polarity' not in article:
+            article['polarity'] = self.article_store.polarity_for(article, self.score_texts)
+        return self.classify_polarity(article['polarity'])
+    
+    @profiling.timed('scraper.stock_sentiment')
     def get_stock_news_sentiment(self, ticker):
         """Get news and sentiment for a single stock"""
         all_articles = []
@@ -120,15 +256,14 @@ class StockContextAnalyzer:
         
         # Scrape from multiple sources
         all_articles.extend(self.scrape_yahoo_finance(ticker))
-        all_articles.extend(self.scrape_google_news_rss(f"{ticker} {company} stock"))
+        all_articles.extend(self.scrape_google_news_rss(self.stock_query(ticker, company)))
         
         # Analyze sentiment
         sentiments = {'positive': 0, 'neutral': 0, 'negative': 0}
         sentiment_scores = []
         
         for article in all_articles[:10]:  # Limit to top 10
-            full_text = article['title'] + ' ' + article.get('summary', '')
-            sentiment, score = self.analyze_sentiment(full_text)
+            sentiment, score = self.article_sentiment(article)
             sentiments[sentiment] += 1
             sentiment_scores.append(score)
         
@@ -137,6 +272,7 @@ class StockContextAnalyzer:
         
         return sentiments, avg_sentiment, all_articles
     
+    @profiling.timed('scraper.industry_sentiment')
     def calculate_industry_sentiment(self, ticker):
         """Calculate industry sentiment based on peer companies"""
         info = self.stock_info.get(ticker, {})
@@ -150,15 +286,10 @@ class StockContextAnalyzer:
         
         # Check peer stock performance (50% weight)
         for peer in peers[:3]:
-            try:
-                peer_stock = yf.Ticker(peer)
-                hist = peer_stock.history(period='5d')
-                if len(hist) >= 2:
-                    # 5-day performance
-                    peer_change = (hist['Close'].iloc[-1] - hist['Close'].iloc[0]) / hist['Close'].iloc[0]
-                    peer_price_changes.append(peer_change)
-            except:
-                pass
+            # 5-day performance
+            peer_change = self.get_returns(peer)['5d']
+            if peer_change is not None:
+                peer_price_changes.append(peer_change)
         
         # Convert price changes to sentiment
         if peer_price_changes:
@@ -170,20 +301,18 @@ class StockContextAnalyzer:
         # Check peer news (50% weight)
         for peer in peers[:2]:  # Reduced to save time
             print(f"    Checking peer {peer}...")
-            articles = self.scrape_google_news_rss(f"{peer} stock")
+            articles = self.scrape_google_news_rss(self.peer_query(peer))
             
             for article in articles[:3]:  # Fewer articles
-                text = article['title'] + ' ' + article.get('summary', '')
-                _, score = self.analyze_sentiment(text)
+                _, score = self.article_sentiment(article)
                 peer_sentiments.append(score)
         
         # Get industry-specific news
         industry = info.get('industry', '')
         if industry:
-            industry_articles = self.scrape_google_news_rss(f"{industry} industry stocks")
+            industry_articles = self.scrape_google_news_rss(self.industry_query(industry))
             for article in industry_articles[:3]:
-                text = article['title'] + ' ' + article.get('summary', '')
-                _, score = self.analyze_sentiment(text)
+                _, score = self.article_sentiment(article)
                 peer_sentiments.append(score)
         
         # Calculate weighted average
@@ -191,6 +320,7 @@ class StockContextAnalyzer:
             return round(sum(peer_sentiments) / len(peer_sentiments), 2)
         return 0.0
     
+    @profiling.timed('scraper.sector_sentiment')
     def calculate_sector_sentiment(self, ticker):
         """Calculate sector sentiment using ETF performance and news"""
         info = self.stock_info.get(ticker, {})
@@ -201,36 +331,28 @@ class StockContextAnalyzer:
         
         # Get ETF performance (70% weight) - INCREASED weight and sensitivity
         if sector_etf:
-            try:
-                etf = yf.Ticker(sector_etf)
-                hist = etf.history(period='5d')
-                if len(hist) >= 2:
-                    # Calculate 5-day return
-                    five_day_return = (hist['Close'].iloc[-1] - hist['Close'].iloc[0]) / hist['Close'].iloc[0]
-                    
-                    # More aggressive scaling
-                    # -2% = -0.8, -1% = -0.4, +1% = +0.4, +2% = +0.8
-                    etf_sentiment = max(-1, min(1, five_day_return * 40))
-                    
-                    sentiment_score += etf_sentiment * 0.7  # 70% weight on price action
-                    
-                    # Also check today's move if available
-                    if len(hist) >= 2:
-                        today_return = (hist['Close'].iloc[-1] - hist['Close'].iloc[-2]) / hist['Close'].iloc[-2]
-                        # If today was particularly bad, weight it extra
-                        if today_return < -0.01:  # More than 1% down
-                            sentiment_score -= 0.2  # Additional penalty for red day
-            except:
-                pass
+            returns = self.get_returns(sector_etf)
+            five_day_return = returns['5d']
+            if five_day_return is not None:
+                # More aggressive scaling
+                # -2% = -0.8, -1% = -0.4, +1% = +0.4, +2% = +0.8
+                etf_sentiment = max(-1, min(1, five_day_return * 40))
+                
+                sentiment_score += etf_sentiment * 0.7  # 70% weight on price action
+                
+                # Also check today's move if available
+                today_return = returns['1d']
+                # If today was particularly bad, weight it extra
+                if today_return is not None and today_return < -0.01:  # More than 1% down
+                    sentiment_score -= 0.2  # Additional penalty for red day
         
         # Get sector news sentiment (30% weight) - REDUCED weight
         if sector:
-            sector_articles = self.scrape_google_news_rss(f"{sector} sector stocks market")
+            sector_articles = self.scrape_google_news_rss(self.sector_query(sector))
             sector_sentiments = []
             
             for article in sector_articles[:5]:  # Reduced from 10
-                text = article['title'] + ' ' + article.get('summary', '')
-                _, score = self.analyze_sentiment(text)
+                _, score = self.article_sentiment(article)
                 sector_sentiments.append(score)
             
             if sector_sentiments:
@@ -239,15 +361,25 @@ class StockContextAnalyzer:
         
         return round(sentiment_score, 2)
     
-    def run_analysis(self):
-        """Run complete analysis for all stocks"""
+    def run_analysis(self, checkpoint=None):
+        """Run complete analysis for all stocks, streaming each result to the checkpoint"""
         print(f"\n🚀 Starting Context-Aware Analysis")
         print(f"📊 Portfolio: {', '.join(self.portfolio)}")
         print(f"⏰ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         
+        # Tickers finished before an interruption are not scraped again
+        done = checkpoint.completed() if checkpoint else set()
+        remaining = [t for t in self.portfolio if t not in done]
+        if done:
+            print(f"⏩ Resuming {checkpoint.path}: {len(done)} done, {len(remaining)} remaining")
+        
+        # Plan the whole run, issue each distinct request once, then assemble per ticker
+        if remaining:
+            self.execute_plan(self.plan_run(remaining))
+        
         results = []
         
-        for ticker in self.portfolio:
+        for ticker in remaining:
             print(f"\n📈 Analyzing {ticker}...")
             
             # Get stock info
@@ -265,7 +397,7 @@ class StockContextAnalyzer:
             print(f"  Calculating sector sentiment...")
             sector_sentiment = self.calculate_sector_sentiment(ticker)
             
-            results.append({
+            result = {
                 'ticker': ticker,
                 'positive': sentiments['positive'],
                 'neutral': sentiments['neutral'],
@@ -274,150 +406,34 @@ class StockContextAnalyzer:
                 'industry_sentiment': industry_sentiment,
                 'sector': info.get('sector', 'N/A'),
                 'sector_sentiment': sector_sentiment
-            })
+            }
+            results.append(result)
+            if checkpoint:
+                checkpoint.add_result(result)
             
             print(f"  ✅ Complete - Pos: {sentiments['positive']}, Neut: {sentiments['neutral']}, Neg: {sentiments['negative']}")
         
-        return results
+        return checkpoint.results() if checkpoint else results
     
-    def save_to_csv(self, results, filename=None):
+    @staticmethod
+    def save_to_csv(results, filename=None):
         """Save results to CSV"""
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"stock_context_analysis_{timestamp}.csv"
         
-        # Convert Path object to string if necessary
-        filename = str(filename)
-        
-        df = pd.DataFrame(results)
-        df.to_csv(filename, index=False)
-        
+        filename = report_renderer.render_csv(results, str(filename))
         print(f"\n📊 CSV saved: {filename}")
         return filename
     
-    def save_to_pdf(self, results, filename=None):
-        """Generate 1-page PDF report"""
+    @staticmethod
+    def save_to_pdf(results, filename=None):
+        """Generate PDF report (the table continues over further pages for large portfolios)"""
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"stock_context_report_{timestamp}.pdf"
         
-        # Convert Path object to string if necessary
-        filename = str(filename)
-        
-        # Use landscape orientation for wider table
-        doc = SimpleDocTemplate(filename, pagesize=landscape(letter))
-        story = []
-        styles = getSampleStyleSheet()
-        
-        # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=20,
-            textColor=colors.HexColor('#1f77b4'),
-            spaceAfter=10,
-            alignment=TA_CENTER
-        )
-        
-        title = Paragraph("Stock Portfolio Context Analysis", title_style)
-        story.append(title)
-        
-        # Timestamp
-        date_style = ParagraphStyle(
-            'DateStyle',
-            parent=styles['Normal'],
-            fontSize=10,
-            alignment=TA_CENTER,
-            spaceAfter=20
-        )
-        # Add data freshness note
-        freshness_style = ParagraphStyle(
-            'FreshnessStyle',
-            parent=styles['Normal'],
-            fontSize=8,
-            alignment=TA_CENTER,
-            spaceAfter=15,
-            textColor=colors.grey
-        )
-        
-        # Get current market status
-        now = datetime.now()
-        market_day = now.strftime('%A')
-        
-        freshness_note = Paragraph(
-            f"News data: Live from web | ETF prices: As of last market close | Current: {market_day}",
-            freshness_style
-        )
-        story.append(freshness_note)
-        
-        # Create table data
-        table_data = [['Ticker', 'Positive', 'Neutral', 'Negative', 'Industry', 'Industry\nSentiment', 'Sector', 'Sector\nSentiment']]
-        
-        for result in results:
-            # Color code sentiment scores
-            ind_sentiment = result['industry_sentiment']
-            sec_sentiment = result['sector_sentiment']
-            
-            # Format sentiment scores with color
-            ind_color = 'green' if ind_sentiment > 0.1 else 'red' if ind_sentiment < -0.1 else 'black'
-            sec_color = 'green' if sec_sentiment > 0.1 else 'red' if sec_sentiment < -0.1 else 'black'
-            
-            row = [
-                result['ticker'],
-                str(result['positive']),
-                str(result['neutral']),
-                str(result['negative']),
-                result['industry'],
-                f"{ind_sentiment:+.2f}",
-                result['sector'],
-                f"{sec_sentiment:+.2f}"
-            ]
-            table_data.append(row)
-        
-        # Create table
-        table = Table(table_data, colWidths=[1*inch, 0.8*inch, 0.8*inch, 0.8*inch, 2*inch, 1*inch, 2*inch, 1*inch])
-        
-        # Style the table
-        table_style = TableStyle([
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            
-            # Data
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')]),
-            
-            # Alignment
-            ('ALIGN', (1, 1), (3, -1), 'CENTER'),  # Numbers centered
-            ('ALIGN', (5, 1), (5, -1), 'CENTER'),  # Industry sentiment
-            ('ALIGN', (7, 1), (7, -1), 'CENTER'),  # Sector sentiment
-        ])
-        
-        # Color code sentiment values
-        for i, result in enumerate(results, 1):
-            # Industry sentiment coloring
-            if result['industry_sentiment'] > 0.1:
-                table_style.add('TEXTCOLOR', (5, i), (5, i), colors.green)
-            elif result['industry_sentiment'] < -0.1:
-                table_style.add('TEXTCOLOR', (5, i), (5, i), colors.red)
-            
-            # Sector sentiment coloring
-            if result['sector_sentiment'] > 0.1:
-                table_style.add('TEXTCOLOR', (7, i), (7, i), colors.green)
-            elif result['sector_sentiment'] < -0.1:
-                table_style.add('TEXTCOLOR', (7, i), (7, i), colors.red)
-        
-        table.setStyle(table_style)
-        story.append(table)
-        
-        # Build PDF
-        doc.build(story)
+        filename = report_renderer.render_pdf(results, str(filename))
         print(f"📄 PDF saved: {filename}")
         return filename
 
@@ -431,7 +447,46 @@ def load_config(config_file='config.json'):
         return {'portfolio': {'stocks': []}}
 
 
+@profiling.timed('render')
+def render_checkpoint(checkpoint):
+    """Render the CSV and PDF for a run from its checkpoint, without scraping"""
+    files = report_renderer.render_run(str(checkpoint.path), ['csv', 'pdf'])
+    if not files:
+        print(f"❌ No finished tickers in {checkpoint.path}")
+        return None, None
+    print(f"\n📊 CSV saved: {files['csv']}")
+    print(f"📄 PDF saved: {files['pdf']}")
+    return files['csv'], files['pdf']
+
+
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Context-aware news sentiment report for the portfolio')
+    parser.add_argument('--resume', nargs='?', const='latest', metavar='CHECKPOINT',
+                        help='Continue an interrupted run (default: the latest checkpoint in runs/)')
+    parser.add_argument('--render', nargs='?', const='latest', metavar='CHECKPOINT',
+                        help='Only regenerate the CSV/PDF from a checkpoint (default: the latest)')
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start_from_args(args, 'stock_scraper_upgraded')
+    
+    if args.render:
+        if args.render == 'latest':
+            checkpoint = RunCheckpoint.latest()
+            if checkpoint is None:
+                print("❌ No checkpoints found in runs/")
+        else:
+            checkpoint = RunCheckpoint.existing(args.render)
+        if checkpoint is None:
+            exit(1)
+        csv_file, pdf_file = render_checkpoint(checkpoint)
+        if csv_file:
+            print(f"\n📁 Files generated:")
+            print(f"   - {csv_file}")
+            print(f"   - {pdf_file}")
+        exit(0)
+    
     # Load configuration
     config = load_config()
     PORTFOLIO = config['portfolio']['stocks']
@@ -444,15 +499,41 @@ if __name__ == "__main__":
     # Remove duplicates from portfolio
     PORTFOLIO = list(dict.fromkeys(PORTFOLIO))
     
-    # Initialize analyzer
-    analyzer = StockContextAnalyzer(PORTFOLIO)
+    # Results are appended to runs/run_<timestamp>.jsonl as each ticker finishes
+    checkpoint = None
+    if args.resume:
+        if args.resume != 'latest':
+            checkpoint = RunCheckpoint.existing(args.resume)
+            if checkpoint is None:
+                exit(1)
+        else:
+            checkpoint = RunCheckpoint.latest()
+        if checkpoint is None:
+            print("⚠️  No checkpoint to resume; starting a new run")
+        else:
+            # Resume the portfolio the interrupted run was started with
+            PORTFOLIO = checkpoint.header().get('portfolio', PORTFOLIO)
+    if checkpoint is None:
+        checkpoint = RunCheckpoint.create(PORTFOLIO)
+    
+    # Initialize analyzer (optional "scraper": {"fetch_timeout": ..., "cache_ttl_minutes": ...,
+    # "sentiment_backend": "lexicon" | "textblob", "fast_parsing": true,
+    # "peer_source": "static" | "correlation" | "both"} in config.json)
+    scraper_config = config.get('scraper', {})
+    analyzer = StockContextAnalyzer(
+        PORTFOLIO,
+        fetch_timeout=scraper_config.get('fetch_timeout', 60.0),
+        cache_ttl_minutes=scraper_config.get('cache_ttl_minutes', 15),
+        sentiment_backend=scraper_config.get('sentiment_backend', 'lexicon'),
+        fast_parsing=scraper_config.get('fast_parsing', True),
+        peer_source=scraper_config.get('peer_source', 'static')
+    )
     
     # Run analysis
-    results = analyzer.run_analysis()
+    analyzer.run_analysis(checkpoint)
     
-    # Save results
-    csv_file = analyzer.save_to_csv(results)
-    pdf_file = analyzer.save_to_pdf(results)
+    # Render from the checkpoint (also possible later with --render)
+    csv_file, pdf_file = render_checkpoint(checkpoint)
     
     print(f"\n✅ Analysis complete!")
     print(f"\n📁 Files generated:")
@@ -0,0 +1,98 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+import pandas as pd
+import yfinance as yf
+import profiling
+from rate_limiter import YAHOO_RATE_LIMITER
+
+
+class SymbolValidityCache:
+    """Shared cache of which symbols resolve on Yahoo, with separate TTLs for hits and misses"""
+
+    def __init__(self, db_path: str = 'stock_info_cache.db', positive_ttl_days: int = 30,
+                 negative_ttl_days: int = 1, rate_limiter=None):
+        self.db_path = db_path
+        self.positive_ttl = timedelta(days=positive_ttl_days)
+        self.negative_ttl = timedelta(days=negative_ttl_days)
+        self.rate_limiter = rate_limiter or YAHOO_RATE_LIMITER
+        self.lock = threading.Lock()
+
+        conn = self._connect()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS symbol_validity (
+                    symbol TEXT PRIMARY KEY,
+                    valid INTEGER NOT NULL,
+                    checked_at TEXT NOT NULL
+                )""")
+            rows = conn.execute("SELECT symbol, valid, checked_at FROM symbol_validity").fetchall()
+        conn.close()
+
+        # In-memory mirror so lookups never touch disk or network
+        self.entries = {s: (bool(v), datetime.fromisoformat(c)) for s, v, c in rows}
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def lookup(self, symbol: str) -> Optional[bool]:
+        """Return cached validity, or None if unknown or expired"""
+        entry = self.entries.get(symbol.upper())
+        if entry is None:
+            return None
+        valid, checked_at = entry
+        ttl = self.positive_ttl if valid else self.negative_ttl
+        if datetime.now() - checked_at > ttl:
+            return None
+        return valid
+
+    def validate(self, symbols: Iterable[str]) -> Dict[str, bool]:
+        """Validate symbols, probing only those missing from the cache in one bulk request"""
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        with self.lock:
+            results = {s: self.lookup(s) for s in symbols}
+            unknown = [s for s, valid in results.items() if valid is None]
+            profiling.record_cache('symbols', 'hit', len(symbols) - len(unknown))
+            profiling.record_cache('symbols', 'miss', len(unknown))
+            if unknown:
+                probed = self._probe(unknown)
+                self._store(probed)
+                results.update(probed)
+        # Symbols the probe couldn't answer are treated as invalid for this call only
+        return {s: bool(results.get(s)) for s in symbols}
+
+    def _probe(self, symbols: list) -> Dict[str, bool]:
+        """Check symbols with one batched 5-day history download instead of per-symbol .info"""
+        print(f"🔎 Validating {len(symbols)} symbols...")
+        self.rate_limiter.acquire()
+        try:
+            with profiling.span('yfinance.download', symbols=len(symbols)):
+                data = yf.download(symbols, period='5d', progress=False, threads=True)
+        except Exception as e:
+            profiling.record_request(profiling.YFINANCE_HOST, None, failed=True)
+            print(f"⚠️  Symbol validation failed: {e}")
+            return {}
+        profiling.record_request(profiling.YFINANCE_HOST, None)
+
+        if data is None or data.empty:
+            # Nothing came back at all - more likely a network problem than all-bad symbols
+            return {} if len(symbols) > 1 else {symbols[0]: False}
+
+        closes = data['Close']
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(symbols[0])
+        return {s: s in closes.columns and bool(closes[s].notna().any()) for s in symbols}
+
+    def _store(self, results: Dict[str, bool]):
+        if not results:
+            return
+        now = datetime.now()
+        for symbol, valid in results.items():
+            self.entries[symbol] = (valid, now)
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO symbol_validity VALUES (?, ?, ?)",
+                [(s, int(v), now.isoformat()) for s, v in results.items()])
+        conn.close()